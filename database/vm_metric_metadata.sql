@@ -33,3 +33,45 @@ CREATE INDEX IF NOT EXISTS idx_vm_metric_metadata_labels
 CREATE INDEX IF NOT EXISTS idx_vm_metric_metadata_lookup 
     ON vm_metric_metadata (job_id, metric_name);
 
+-- Unique B-tree index matching the metric_id lookup exactly
+-- (job_idx, job_id, metric_name, metric_labels = CAST(... AS jsonb));
+-- turns each metadata lookup into an index probe and prevents duplicate series.
+-- On an existing, populated database the index build fails if duplicate
+-- series rows are already present (the earlier SELECT-then-INSERT lookup
+-- could create them under concurrent runs). Check first:
+--   SELECT job_idx, job_id, metric_name, metric_labels, count(*) AS copies,
+--          array_agg(metric_id ORDER BY metric_id) AS metric_ids
+--     FROM public.vm_metric_metadata
+--    GROUP BY job_idx, job_id, metric_name, metric_labels
+--   HAVING count(*) > 1;
+-- If any rows come back, keep the lowest metric_id of each series. Move the
+-- data of the other copies onto it (first copy wins per timestamp), then drop
+-- the leftover data and the duplicate metadata, all in one transaction:
+--   BEGIN;
+--   CREATE TEMP TABLE dup_series ON COMMIT DROP AS
+--   SELECT job_idx, metric_id, keep_id FROM (
+--       SELECT job_idx, metric_id,
+--              min(metric_id) OVER (PARTITION BY job_idx, job_id, metric_name, metric_labels) AS keep_id
+--         FROM public.vm_metric_metadata) s
+--    WHERE metric_id <> keep_id;
+--   UPDATE public.vm_metric_data d SET metric_id = s.keep_id
+--     FROM dup_series s
+--    WHERE d.job_idx = s.job_idx AND d.metric_id = s.metric_id
+--      AND NOT EXISTS (SELECT 1 FROM public.vm_metric_data k
+--                       WHERE k.job_idx = s.job_idx AND k.metric_id = s.keep_id
+--                         AND k.metric_timestamp = d.metric_timestamp)
+--      AND NOT EXISTS (SELECT 1 FROM public.vm_metric_data o
+--                        JOIN dup_series os ON os.job_idx = o.job_idx AND os.metric_id = o.metric_id
+--                       WHERE os.job_idx = s.job_idx AND os.keep_id = s.keep_id
+--                         AND o.metric_timestamp = d.metric_timestamp
+--                         AND o.metric_id < d.metric_id);
+--   DELETE FROM public.vm_metric_data d USING dup_series s
+--    WHERE d.job_idx = s.job_idx AND d.metric_id = s.metric_id;
+--   DELETE FROM public.vm_metric_metadata m USING dup_series s
+--    WHERE m.job_idx = s.job_idx AND m.metric_id = s.metric_id;
+--   COMMIT;
+-- Then create the index online:
+--   CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_vm_metric_metadata_series
+--       ON public.vm_metric_metadata (job_idx, job_id, metric_name, metric_labels);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_vm_metric_metadata_series 
+    ON vm_metric_metadata (job_idx, job_id, metric_name, metric_labels);
@@ -57,6 +57,22 @@ def test_lock_id_generation():
     assert different_lock_id > 0, "Lock ID should be positive"
 
 
+@pytest.mark.unit
+def test_lock_id_fits_bigint_when_hash_top_bit_set():
+    """Test that a digest with the top bit set still maps into the bigint range."""
+    import hashlib
+
+    # "job_0" hashes to 0xbde6..., i.e. the sign bit of the 64-bit value is set
+    job_id = "job_0"
+    digest = hashlib.blake2b(job_id.encode('utf-8'), digest_size=8).digest()
+    assert digest[0] & 0x80
+
+    lock_id = DatabaseManager._generate_lock_id(job_id)
+
+    assert 0 <= lock_id <= 2**63 - 1, "Lock ID must fit in a PostgreSQL bigint"
+    assert lock_id == int.from_bytes(digest, 'big') & 0x7FFF_FFFF_FFFF_FFFF
+
+
 @pytest.mark.unit
 def test_lock_id_hash_consistency():
     """Test that lock ID generation produces consistent hashes."""
@@ -307,6 +323,48 @@ def test_advisory_lock_failure(mock_create_engine):
     assert mock_connection.close.called
 
 
+@pytest.mark.unit
+def test_advisory_lock_persistent_connection():
+    """Test that persistent-connection locks reuse one connection and are not re-entrant."""
+    mock_engine = Mock()
+    mock_connection = Mock()
+    mock_result = Mock()
+    mock_result.scalar.return_value = True
+    
+    mock_engine.connect.return_value = mock_connection
+    mock_connection.execution_options.return_value = mock_connection
+    mock_connection.closed = False
+    mock_connection.invalidated = False
+    mock_connection.execute.return_value = mock_result
+    
+    db_config = {
+        'host': 'localhost',
+        'port': 5432,
+        'name': 'test_db',
+        'user': 'test_user',
+        'password': 'test_password'
+    }
+    
+    db_manager = DatabaseManager(db_config, persistent_lock_connection=True)
+    db_manager._engine = mock_engine
+    
+    with db_manager.advisory_lock("test_job") as lock_acquired:
+        assert lock_acquired is True
+        # The session already holds this lock, so a second acquire is refused
+        with db_manager.advisory_lock("test_job") as nested_acquired:
+            assert nested_acquired is False
+    
+    with db_manager.advisory_lock("test_job") as lock_acquired:
+        assert lock_acquired is True
+    
+    # One connection for all locks, kept open until disconnect()
+    mock_engine.connect.assert_called_once()
+    assert not mock_connection.close.called
+    
+    db_manager.disconnect()
+    mock_connection.close.assert_called_once()
+
+
 @pytest.mark.unit
 def test_transaction_methods():
     """Test transaction management methods."""
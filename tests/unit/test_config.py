@@ -203,3 +203,74 @@ def test_load_environment_config():
     finally:
         import shutil
         shutil.rmtree(test_dir)
+
+
+@pytest.mark.unit
+def test_base_loader_cache_returns_independent_copies(tmp_path, monkeypatch):
+    """Cached loads must not share mutable state and must follow env changes."""
+    from victoria_metrics_jobs.scheduler.common import ConfigLoader as BaseConfigLoader
+
+    config_file = tmp_path / "config.yml"
+    config_file.write_text("value: ${oc.env:VM_JOBS_TEST_VALUE,default}\nitems: [1, 2]\n")
+    loader = BaseConfigLoader()
+
+    first = loader.load(str(config_file))
+    first['items'].append(3)
+    second = loader.load(str(config_file))
+    assert second == {'value': 'default', 'items': [1, 2]}
+
+    monkeypatch.setenv('VM_JOBS_TEST_VALUE', 'from-env')
+    assert loader.load(str(config_file))['value'] == 'from-env'
+
+
+@pytest.mark.unit
+def test_disk_cache_reused_across_processes(tmp_path, monkeypatch):
+    """A config validated once is served from VM_JOBS_CONFIG_CACHE_DIR afterwards."""
+    from victoria_metrics_jobs.scheduler import config as config_module
+
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv('VM_JOBS_CONFIG_CACHE_DIR', str(cache_dir))
+    config_file = tmp_path / "scheduler.yml"
+    config_file.write_text("environments:\n  dev:\n    jobs: []\n")
+
+    first = ConfigLoader().load(str(config_file), 'dev')
+    assert len(list(cache_dir.glob('*.json'))) == 1
+
+    # Simulate a new process: empty in-memory cache, no re-validation
+    config_module._ENV_CONFIG_CACHE.clear()
+    monkeypatch.setattr(ConfigLoader, '_load_env_config', lambda *args: pytest.fail("cache miss"))
+    assert ConfigLoader().load(str(config_file), 'dev') == first
+
+
+@pytest.mark.unit
+def test_disk_cache_key_ignores_unreferenced_env_vars(tmp_path, monkeypatch):
+    """Only variables the YAML interpolates change the disk cache entry."""
+    from victoria_metrics_jobs.scheduler import config as config_module
+
+    monkeypatch.setenv('VM_JOBS_CONFIG_CACHE_DIR', str(tmp_path / "cache"))
+    config_file = tmp_path / "scheduler.yml"
+    config_file.write_text("environments:\n  dev:\n    host: ${oc.env:VM_JOBS_TEST_HOST,localhost}\n")
+
+    key = config_module._disk_cache_path(str(config_file), 'dev')
+    monkeypatch.setenv('VM_JOBS_TEST_UNRELATED', 'changed')
+    assert config_module._disk_cache_path(str(config_file), 'dev') == key
+
+    monkeypatch.setenv('VM_JOBS_TEST_HOST', 'db.internal')
+    assert config_module._disk_cache_path(str(config_file), 'dev') != key
+
+
+@pytest.mark.unit
+def test_disk_cache_skipped_for_shared_directory(tmp_path, monkeypatch):
+    """A cache directory writable by others is never read from."""
+    from victoria_metrics_jobs.scheduler import config as config_module
+
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    cache_dir.chmod(0o777)
+    monkeypatch.setenv('VM_JOBS_CONFIG_CACHE_DIR', str(cache_dir))
+    config_file = tmp_path / "scheduler.yml"
+    config_file.write_text("environments:\n  dev:\n    jobs: []\n")
+
+    assert config_module._disk_cache_path(str(config_file), 'dev') is None
+    ConfigLoader().load(str(config_file), 'dev')
+    assert list(cache_dir.iterdir()) == []
@@ -0,0 +1,145 @@
+"""
+Unit tests for the notebook database helpers that do not need a database.
+"""
+
+import json
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from victoria_metrics_jobs.jobs.metrics_forecast_notebooks.notebooks import database_helpers as dh
+
+
+class _Result:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+    def fetchone(self):
+        return self.value
+
+
+class _StubConnection:
+    """Returns queued results from execute and counts commits/rollbacks."""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.executed = 0
+        self.commits = 0
+        self.rollbacks = 0
+
+    def execute(self, statement, params=None):
+        self.executed += 1
+        return _Result(self.results.pop(0))
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def job_idx_cache(monkeypatch):
+    """Plain per-test job_idx cache in place of the event-driven one."""
+    cache = {}
+    monkeypatch.setattr(dh, "_job_idx_cache", lambda conn: cache)
+    monkeypatch.setattr(dh, "_cached_job_idx", lambda conn, job_id: cache.get(job_id))
+    return cache
+
+
+def test_labels_json_with_appends_to_serialized_labels():
+    base = dh.normalize_metric_labels_for_comparison({"env": "dev", "app": "api"})
+
+    extended = dh._labels_json_with(base, "forecast_type", "yhat")
+
+    assert json.loads(extended) == {"app": "api", "env": "dev", "forecast_type": "yhat"}
+    assert dh._labels_json_with("{}", "forecast_type", "ü") == '{"forecast_type":"ü"}'
+
+
+def test_normalize_label_items_is_sorted_and_compact():
+    assert dh.normalize_metric_labels_for_comparison({"b": "2", "a": "1"}) == '{"a":"1","b":"2"}'
+    assert dh._normalize_label_items((("a", "é"),)) == '{"a":"é"}'
+
+
+def test_serializer_dispatch_and_fallbacks():
+    np = pytest.importorskip("numpy")
+    pd = pytest.importorskip("pandas")
+
+    assert dh._json_serializer(np.float32(1.5)) == 1.5
+    assert dh._json_serializer(np.int64(3)) == 3
+    assert dh._json_serializer(np.array([1, 2])) == [1, 2]
+    assert dh._json_serializer(date(2024, 1, 2)) == "2024-01-02"
+    # Subclasses miss the exact-type table and use the isinstance checks
+    assert dh._json_serializer(pd.Timestamp("2024-01-02 03:04")) == "2024-01-02T03:04:00"
+    assert dh._json_serializer(np.int16(4)) == 4
+    with pytest.raises(TypeError):
+        dh._json_serializer(object())
+
+
+def test_dumps_json_fallback(monkeypatch):
+    monkeypatch.setattr(dh, "orjson", None)
+
+    assert json.loads(dh._dumps({"when": datetime(2024, 1, 2, 3, 4)})) == {"when": "2024-01-02T03:04:00"}
+    # Without orjson NaN keeps the stdlib encoding
+    assert dh._dumps({"value": float("nan")}) == '{"value": NaN}'
+
+
+def test_dumps_orjson_writes_nan_as_null():
+    pytest.importorskip("orjson")
+    np = pytest.importorskip("numpy")
+
+    payload = {"value": float("nan"), "n": np.int64(2), "when": date(2024, 1, 2)}
+
+    assert json.loads(dh._dumps(payload)) == {"value": None, "n": 2, "when": "2024-01-02"}
+
+
+def test_job_idx_cache_dropped_on_rollback_and_published_on_commit():
+    engine = create_engine("sqlite://")
+    dh.clear_job_idx_cache()
+    with engine.connect() as conn, engine.connect() as other:
+        conn.execute(text("SELECT 1"))
+        dh._job_idx_cache(conn)["job_a"] = 7
+        conn.rollback()
+        assert dh._cached_job_idx(conn, "job_a") is None
+
+        conn.execute(text("SELECT 1"))
+        dh._job_idx_cache(conn)["job_a"] = 8
+        # Uncommitted values are private to their connection
+        assert dh._cached_job_idx(other, "job_a") is None
+        conn.commit()
+        assert dh._cached_job_idx(other, "job_a") == 8
+    dh.clear_job_idx_cache()
+
+
+def test_find_or_get_metric_id_retries_lost_race():
+    conn = _StubConnection([None, None, 42])
+
+    result = dh.find_or_get_metric_id(conn, 3, "job_forecast", "m", {"a": "1"}, commit=False)
+
+    assert result == (3, 42)
+    assert conn.executed == 3
+    assert conn.commits == 0
+
+
+def test_find_or_get_metric_id_gives_up_and_rolls_back():
+    conn = _StubConnection([None] * dh._METRIC_ID_ALLOCATION_ATTEMPTS)
+
+    with pytest.raises(RuntimeError, match="Could not allocate metric_id"):
+        dh.find_or_get_metric_id(conn, 3, "job_forecast", "m", {"a": "1"})
+
+    assert conn.executed == dh._METRIC_ID_ALLOCATION_ATTEMPTS
+    assert conn.rollbacks == 1
+
+
+def test_find_or_create_metric_series_caches_job_idx(job_idx_cache):
+    conn = _StubConnection([None, (5, 1)])
+
+    assert dh.find_or_create_metric_series(conn, "job_forecast", "m", {"a": "1"}) == (5, 1)
+
+    assert conn.executed == 2
+    assert conn.commits == 2
+    assert job_idx_cache == {"job_forecast": 5}
@@ -0,0 +1,195 @@
+"""
+Unit tests for JobExecutor locking, child output capture and metrics flushing.
+"""
+
+import gzip
+import io
+from contextlib import contextmanager
+from unittest.mock import Mock
+
+import pytest
+
+from victoria_metrics_jobs.scheduler import jobs as jobs_module
+from victoria_metrics_jobs.scheduler.jobs import JobExecutor
+
+
+@pytest.mark.unit
+def test_executor_without_database_requires_opt_in():
+    """Without a database manager the executor refuses to run jobs unlocked by default."""
+    with pytest.raises(ValueError, match="allow_unlocked_jobs"):
+        JobExecutor(None, 'config.yml')
+
+
+@pytest.mark.unit
+def test_unlocked_opt_in_warns_on_every_run(caplog):
+    """With allow_unlocked the executor runs jobs and warns each time."""
+    executor = JobExecutor(None, 'config.yml', allow_unlocked=True)
+    executor._execute_python_job = Mock(return_value=('', '', None))
+
+    with caplog.at_level('WARNING', logger='victoria_metrics_jobs.scheduler.jobs'):
+        executor._run_job({'id': 'job_a'})
+        executor._run_job({'id': 'job_a'})
+
+    assert executor._execute_python_job.call_count == 2
+    assert sum('without advisory locking' in r.getMessage() for r in caplog.records) == 2
+
+
+@pytest.mark.unit
+def test_locked_run_skips_when_lock_is_held():
+    """A job whose advisory lock is held elsewhere is not executed."""
+    db_manager = Mock()
+
+    @contextmanager
+    def advisory_lock(job_id):
+        yield False
+
+    db_manager.advisory_lock = advisory_lock
+    executor = JobExecutor(db_manager, 'config.yml')
+    executor._execute_python_job = Mock()
+
+    assert executor._run_job({'id': 'job_a'}) is None
+    executor._execute_python_job.assert_not_called()
+
+
+class _CountingDecoder:
+    """Wraps the module JSON decoder and counts raw_decode calls."""
+
+    def __init__(self, decoder):
+        self._decoder = decoder
+        self.calls = 0
+
+    def raw_decode(self, s, idx=0):
+        self.calls += 1
+        return self._decoder.raw_decode(s, idx)
+
+
+def _capture(text, **kwargs):
+    capture = jobs_module._OutputCapture(io.StringIO(text), **kwargs)
+    capture.text()
+    return capture
+
+
+@pytest.mark.unit
+def test_output_capture_keeps_early_result_before_trailing_logs():
+    """The first JSON object is kept even when log lines follow it."""
+    capture = _capture(
+        'INFO starting\n{"status": "success", "series_processed": 3}\nINFO done\n{"status": "ignored"}\n',
+        keep_json_result=True,
+    )
+
+    assert capture.json_result == {'status': 'success', 'series_processed': 3}
+
+
+@pytest.mark.unit
+def test_output_capture_decodes_pretty_printed_result():
+    """Nested closing braces do not end a multi-line block early."""
+    capture = _capture(
+        '{\n  "status": "success",\n  "counts": {\n    "ok": 2\n  }\n}\nINFO done\n',
+        keep_json_result=True,
+    )
+
+    assert capture.json_result == {'status': 'success', 'counts': {'ok': 2}}
+
+
+@pytest.mark.unit
+def test_output_capture_drops_non_json_brace_block(monkeypatch):
+    """A '{' line that is not JSON is decoded once, not on every later '}' line."""
+    decoder = _CountingDecoder(jobs_module._JSON_DECODER)
+    monkeypatch.setattr(jobs_module, '_JSON_DECODER', decoder)
+
+    chatty = '{not json}\n' + '  step {i} done}\n' * 500 + '{"status": "success"}\n'
+    capture = _capture(chatty, keep_json_result=True)
+
+    assert capture.json_result == {'status': 'success'}
+    assert decoder.calls == 2
+
+
+@pytest.mark.unit
+def test_output_capture_restores_result_scrolled_out_of_tail(monkeypatch):
+    """A result pushed out of the kept tail is put back in front of it."""
+    monkeypatch.setattr(jobs_module, '_OUTPUT_TAIL_LINES', 2)
+    capture = jobs_module._OutputCapture(
+        io.StringIO('{"status": "success"}\nline 1\nline 2\nline 3\n'), keep_json_result=True
+    )
+
+    assert capture.text() == '{"status": "success"}\nline 2\nline 3\n'
+
+
+@pytest.mark.unit
+def test_execute_python_script_streams_result(tmp_path):
+    """The Popen path returns the kept output and the result seen while streaming."""
+    script = tmp_path / 'job.py'
+    script.write_text(
+        'import json, sys\n'
+        'print("INFO working")\n'
+        'print(json.dumps({"status": "success"}))\n'
+        'print("INFO done")\n'
+        'print("warn", file=sys.stderr)\n'
+    )
+    executor = JobExecutor(None, 'config.yml', allow_unlocked=True)
+
+    stdout, stderr, job_results = executor._execute_python_script(str(script), [])
+
+    assert stdout == 'INFO working\n{"status": "success"}\nINFO done\n'
+    assert stderr == 'warn\n'
+    assert job_results == {'status': 'success'}
+
+
+def _vm_lines(count):
+    return [f'vmj_job_runs_total{{job="vmj",vmj_job="job_{i}"}} 1' for i in range(count)]
+
+
+@pytest.mark.unit
+def test_metrics_flusher_gzips_large_batches_only():
+    """Batches from _GZIP_MIN_LINES lines on are sent gzip-encoded."""
+    flusher = jobs_module._MetricsFlusher()
+    flusher._session = Mock()
+    headers = {'Content-Type': 'text/plain'}
+
+    flusher._send('http://vm/api/v1/import/prometheus', headers, 5, _vm_lines(jobs_module._GZIP_MIN_LINES - 1))
+    small = flusher._session.post.call_args.kwargs
+    assert 'Content-Encoding' not in small['headers']
+    assert small['data'].endswith(b'\n')
+
+    lines = _vm_lines(jobs_module._GZIP_MIN_LINES)
+    flusher._send('http://vm/api/v1/import/prometheus', headers, 5, lines)
+    large = flusher._session.post.call_args.kwargs
+    assert large['headers'] == {'Content-Type': 'text/plain', 'Content-Encoding': 'gzip'}
+    assert gzip.decompress(large['data']) == ('\n'.join(lines) + '\n').encode('utf-8')
+    assert headers == {'Content-Type': 'text/plain'}
+
+
+@pytest.mark.unit
+def test_metrics_flusher_batches_per_target():
+    """Lines queued within the flush interval go out as one POST per target."""
+    flusher = jobs_module._MetricsFlusher(flush_interval=5.0)
+    sent = []
+    flusher._send = lambda url, headers, timeout, lines: sent.append((url, lines))
+
+    flusher.enqueue('http://a', {}, 5, ['a 1'])
+    flusher.enqueue('http://b', {}, 5, ['b 1'])
+    flusher.enqueue('http://a', {}, 5, ['a 2'])
+    assert flusher.flush(timeout=5.0)
+
+    assert sorted(sent) == [('http://a', ['a 1', 'a 2']), ('http://b', ['b 1'])]
+
+
+@pytest.mark.unit
+def test_first_int_skips_booleans():
+    """JSON true/false are not counts even though bool subclasses int."""
+    assert jobs_module._first_int({'processed': True, 'count': 3}, ('processed', 'count')) == 3
+    assert jobs_module._first_int({'processed': False}, ('processed',)) is None
+    assert jobs_module._first_int({'processed': 2.0}, ('processed',)) == 2
+
+
+@pytest.mark.unit
+def test_claim_job_rejects_overlapping_run_in_process():
+    """A job already running in this process cannot be claimed again until released."""
+    executor = JobExecutor(None, 'config.yml', allow_unlocked=True)
+
+    assert executor._claim_job('job_a')
+    assert not executor._claim_job('job_a')
+    assert executor._claim_job('job_b')
+
+    executor._release_job('job_a')
+    assert executor._claim_job('job_a')
@@ -0,0 +1,50 @@
+"""
+Unit tests for parsing job result JSON from script output.
+"""
+
+import pytest
+
+from victoria_metrics_jobs.scheduler import jobs as jobs_module
+from victoria_metrics_jobs.scheduler.jobs import JobExecutor
+
+
+@pytest.fixture
+def executor():
+    return JobExecutor(None, 'config.yml', allow_unlocked=True)
+
+
+@pytest.mark.unit
+def test_parse_job_results_skips_surrounding_log_lines(executor):
+    """The first complete JSON object is found between log lines."""
+    stdout = 'INFO starting {not json}\n{"status": "success", "series_processed": 3}\nINFO done\n'
+
+    assert executor._parse_job_results(stdout, '') == {'status': 'success', 'series_processed': 3}
+
+
+class _CountingDecoder:
+    """Wraps the module JSON decoder and counts decode attempts."""
+
+    def __init__(self, decoder):
+        self._decoder = decoder
+        self.calls = 0
+
+    def decode(self, s):
+        self.calls += 1
+        return self._decoder.decode(s)
+
+    def raw_decode(self, s, idx=0):
+        self.calls += 1
+        return self._decoder.raw_decode(s, idx)
+
+
+@pytest.mark.unit
+def test_parse_job_results_unbalanced_braces(executor, monkeypatch):
+    """Output made of unmatched braces is rejected with one attempt per brace."""
+    decoder = _CountingDecoder(jobs_module._JSON_DECODER)
+    monkeypatch.setattr(jobs_module, '_JSON_DECODER', decoder)
+
+    assert executor._parse_job_results('{' * 200, '') is None
+    assert executor._parse_job_results('{' * 5000 + 'x', '') is None
+
+    # Whole-output decode plus one raw_decode per opening brace
+    assert decoder.calls == (1 + 200) + (1 + 5000)
@@ -86,6 +86,18 @@ def test_future_business_dates_skip_weekends(job):
     assert [ts.date().weekday() for ts in future] == [0, 1, 2]  # Mon, Tue, Wed
 
 
+def test_forecast_timestamps_keep_local_date(job):
+    import pandas as pd
+
+    naive = pd.Series(pd.to_datetime(["2024-01-02 00:00", "2024-01-03 15:30"]))
+    aware = pd.Series(pd.to_datetime(["2024-01-02 00:00", "2024-01-03 00:00"]).tz_localize("Europe/Berlin"))
+
+    expected = pd.Series(pd.to_datetime(["2024-01-02", "2024-01-03"]).tz_localize("UTC"))
+    # Berlin midnight is 23:00 UTC the day before; the date must not move
+    pd.testing.assert_series_equal(job._forecast_timestamps(naive), expected)
+    pd.testing.assert_series_equal(job._forecast_timestamps(aware), expected)
+
+
 def test_calculate_forecast_timestamp_increments(job):
     state = MetricsForecastState(
         job_id="test",
@@ -129,3 +141,199 @@ def test_calculate_forecast_timestamp_increments(job):
     )
     assert ts_second == midnight_ts + 6
 
+
+
+class _StubConnection:
+    """Connection double: answers statements through a handler and records calls."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def execute(self, statement, params=None):
+        self.executed.append(statement)
+        return self.handler(statement, params)
+
+    def begin_nested(self):
+        from contextlib import nullcontext
+        return nullcontext()
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def _forecast_write_inputs():
+    import pandas as pd
+    from victoria_metrics_jobs.jobs.metrics_forecast.metrics_forecast import SeriesHistory
+
+    state = MetricsForecastState(
+        job_id="test",
+        job_config={},
+        started_at=datetime.now(timezone.utc),
+        valid_forecast_types=(("yhat", "yhat"), ("yhat_upper", "yhat_upper")),
+    )
+    series = SeriesHistory(metric_name="requests_total", labels={"job": "api", "env": "dev"}, samples=[])
+    forecast_df = pd.DataFrame({
+        "ds": pd.to_datetime(["2024-01-02"]),
+        "yhat": [1.0],
+        "yhat_upper": [2.0],
+    })
+    return state, series, forecast_df
+
+
+def test_failed_forecast_type_keeps_job_idx(job, monkeypatch):
+    """A failed lookup for one type must not reset job_idx for the next type."""
+    from unittest.mock import MagicMock
+    from sqlalchemy.exc import SQLAlchemyError
+    from victoria_metrics_jobs.jobs.metrics_forecast import metrics_forecast as mf
+
+    lookups = []
+
+    def handler(statement, params):
+        result = MagicMock()
+        if statement is mf._SELECT_METRIC_IDS_SQL:
+            result.fetchall.return_value = []
+        elif statement is mf._SELECT_METRIC_ID_SQL:
+            lookups.append(params["normalized_labels_json"])
+            if len(lookups) == 1:
+                raise SQLAlchemyError("lookup failed")
+            result.fetchone.return_value = (42,)
+        return result
+
+    written = []
+    monkeypatch.setattr(job, "_upsert_forecast_rows", lambda conn, rows: written.extend(rows))
+    job._job_idx_cache["api_forecast"] = 7
+    conn = _StubConnection(handler)
+
+    state, series, forecast_df = _forecast_write_inputs()
+    assert job._write_forecasts_to_database(state, conn, series, forecast_df) == 1
+
+    assert mf._INSERT_FIRST_METRIC_METADATA_SQL not in conn.executed
+    assert [(row["job_idx"], row["metric_id"]) for row in written] == [(7, 42)]
+    assert conn.commits == 1
+
+
+def test_all_forecast_types_failing_rolls_back(job):
+    """When no type resolves, the series transaction is rolled back."""
+    from sqlalchemy.exc import SQLAlchemyError
+
+    def handler(statement, params):
+        raise SQLAlchemyError("connection lost")
+
+    job._metric_id_cache[(1, "other_forecast", "m", "{}")] = 3
+    conn = _StubConnection(handler)
+
+    state, series, forecast_df = _forecast_write_inputs()
+    assert job._write_forecasts_to_database(state, conn, series, forecast_df) == 0
+
+    assert conn.rollbacks == 1
+    assert conn.commits == 0
+    assert job._metric_id_cache == {}
+
+
+def test_copy_forecast_rows_binary_encoding(job):
+    import struct
+    import pandas as pd
+
+    class Cursor:
+        def copy_expert(self, sql, buffer):
+            self.sql = sql
+            self.payload = buffer.read()
+
+        def close(self):
+            pass
+
+    class Conn:
+        def __init__(self):
+            self.connection = self
+            self.cursor_obj = Cursor()
+            self.executed = []
+
+        def cursor(self):
+            return self.cursor_obj
+
+        def execute(self, statement):
+            self.executed.append(statement)
+
+    conn = Conn()
+    rows = [
+        {
+            "job_idx": 7,
+            "metric_id": 3,
+            "metric_timestamp": pd.Timestamp("2000-01-01 00:00:01", tz="UTC"),
+            "metric_value": 1.5,
+            "run_id": None,
+        },
+        {
+            "job_idx": 7,
+            "metric_id": 4,
+            # 01:00 in Berlin is midnight UTC on 2000-01-02
+            "metric_timestamp": pd.Timestamp("2000-01-02 01:00", tz="Europe/Berlin"),
+            "metric_value": -2.0,
+            "run_id": 11,
+        },
+    ]
+
+    assert job._copy_forecast_rows(conn, rows) is True
+    assert "FORMAT BINARY" in conn.cursor_obj.sql
+
+    payload = conn.cursor_obj.payload
+    assert payload[:19] == b"PGCOPY\n\xff\r\n\x00" + b"\x00" * 8
+    assert payload[-2:] == b"\xff\xff"
+
+    row_size = struct.calcsize("!hiqiiiqid")
+    first = struct.unpack_from("!hiqiiiqid", payload, 19)
+    assert first == (5, 8, 7, 4, 3, 8, 1_000_000, 8, 1.5)
+    assert struct.unpack_from("!i", payload, 19 + row_size) == (-1,)  # NULL run_id
+
+    offset = 19 + row_size + 4
+    second = struct.unpack_from("!hiqiiiqid", payload, offset)
+    assert second == (5, 8, 7, 4, 4, 8, 86_400_000_000, 8, -2.0)
+    assert struct.unpack_from("!iq", payload, offset + row_size) == (8, 11)
+    assert len(payload) == offset + row_size + 12 + 2
+
+
+def test_drain_pending_writes_counts_failures(job):
+    from concurrent.futures import Future
+
+    state = MetricsForecastState(job_id="test", job_config={}, started_at=datetime.now(timezone.utc))
+    written, failed = Future(), Future()
+    written.set_result(3)
+    failed.set_exception(RuntimeError("connection lost"))
+    job._pending_writes = [written, failed]
+
+    job._drain_pending_writes(state)
+
+    assert (state.forecasts_written, state.series_processed, state.failed_series) == (3, 1, 1)
+    assert job._pending_writes == []
+
+
+def test_write_on_worker_raises_instead_of_returning_zero(job, monkeypatch):
+    from victoria_metrics_jobs.jobs.metrics_forecast.metrics_forecast import SeriesHistory
+
+    state = MetricsForecastState(job_id="test", job_config={}, started_at=datetime.now(timezone.utc))
+    series = SeriesHistory(metric_name="requests_total", labels={}, samples=[])
+    monkeypatch.setattr(job, "_get_database_engine", lambda state: None)
+
+    with pytest.raises(ValueError, match="engine not available"):
+        job._write_forecast_rows_on_worker(state, series, [{"job_idx": 1}])
+
+
+def test_rollback_series_transaction_clears_id_caches(job):
+    class Conn:
+        def rollback(self):
+            raise RuntimeError("connection closed")
+
+    job._job_idx_cache["api_forecast"] = 7
+    job._metric_id_cache[(7, "api_forecast", "m", "{}")] = 3
+
+    # A failing rollback is logged, not raised
+    job._rollback_series_transaction(Conn())
+
+    assert job._job_idx_cache == {}
+    assert job._metric_id_cache == {}
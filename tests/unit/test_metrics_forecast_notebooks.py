@@ -0,0 +1,66 @@
+"""
+Unit tests for metrics_forecast_notebooks job helpers.
+"""
+
+import pickle
+import threading
+from concurrent.futures import Future
+from datetime import date, datetime
+from unittest.mock import patch
+
+import pytest
+
+from victoria_metrics_jobs.jobs.metrics_forecast_notebooks import metrics_forecast_notebooks as mfn
+
+
+class _PicklingPool:
+    """Stand-in for ProcessPoolExecutor that pickles what is submitted."""
+
+    def __init__(self, max_workers=None):
+        self.submitted = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        fn, args = pickle.loads(pickle.dumps((fn, args)))
+        self.submitted.append(fn)
+        future = Future()
+        future.set_result((args[0], True, {"status": "success"}))
+        return future
+
+
+@pytest.mark.unit
+def test_parallel_execution_submits_picklable_callable(tmp_path):
+    """Workers get a module-level function, not the job with its managers."""
+    job = mfn.MetricsForecastNotebooksJob()
+    # A connected DatabaseManager holds a threading.Lock, which cannot be pickled
+    job._db_manager = threading.Lock()
+
+    state = mfn.MetricsForecastNotebooksState(
+        job_id="metrics_forecast_notebooks",
+        job_config={},
+        started_at=datetime.now(),
+        notebooks_dir=tmp_path,
+        notebooks_output_dir=tmp_path / "out",
+        notebooks_found=["a.ipynb", "b.ipynb"],
+        current_business_date=date(2024, 5, 1),
+        max_parallel_notebooks=2,
+    )
+
+    pools = []
+
+    def make_pool(max_workers=None):
+        pools.append(_PicklingPool(max_workers))
+        return pools[0]
+
+    with patch.object(mfn, "ProcessPoolExecutor", side_effect=make_pool):
+        result = job._execute_notebooks(state)
+
+    assert result.is_ok()
+    assert pools[0].submitted == [mfn._execute_notebook, mfn._execute_notebook]
+    assert state.notebooks_succeeded == 2
+    assert state.notebooks_failed == 0
@@ -10,6 +10,7 @@ Tests the configuration interpolation capabilities including:
 import os
 import tempfile
 import pytest
+import yaml
 from omegaconf import OmegaConf
 
 from victoria_metrics_jobs.scheduler.common.config_loader import ConfigLoader
@@ -333,3 +334,45 @@ class TestOmegaConfAdvancedFeatures:
         finally:
             os.unlink(temp_file)
 
+    
+    def test_exponent_without_dot_is_float(self):
+        """Test YAML 1.2 floats like 1e-3 load as numbers, as in OmegaConf."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yml', delete=False) as f:
+            f.write("settings:\n  tolerance: 1e-3\n  scale: 2.5\n  count: 10\n")
+            temp_file = f.name
+        
+        try:
+            config = ConfigLoader().load(temp_file)
+            
+            assert config['settings']['tolerance'] == 0.001
+            assert isinstance(config['settings']['tolerance'], float)
+            assert config['settings']['scale'] == 2.5
+            assert isinstance(config['settings']['count'], int)
+        finally:
+            os.unlink(temp_file)
+    
+    def test_duplicate_keys_rejected(self):
+        """Test a repeated mapping key fails instead of overriding silently."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yml', delete=False) as f:
+            f.write("settings:\n  timeout: 30\n  timeout: 60\n")
+            temp_file = f.name
+        
+        try:
+            with pytest.raises(yaml.constructor.ConstructorError, match="duplicate key timeout"):
+                ConfigLoader().load(temp_file)
+        finally:
+            os.unlink(temp_file)
+    
+    def test_unquoted_dates_stay_strings(self):
+        """Test unquoted dates load as strings, as with OmegaConf.load."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yml', delete=False) as f:
+            f.write("schedule:\n  type: date\n  run_date: 2025-01-01 10:00:00\n  day: 2025-01-01\n")
+            temp_file = f.name
+        
+        try:
+            config = ConfigLoader().load(temp_file)
+            
+            assert config['schedule']['run_date'] == '2025-01-01 10:00:00'
+            assert config['schedule']['day'] == '2025-01-01'
+        finally:
+            os.unlink(temp_file)
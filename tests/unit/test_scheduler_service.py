@@ -0,0 +1,80 @@
+"""
+Unit tests for applying configuration reloads to the running scheduler.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from victoria_metrics_jobs.scheduler.service import SchedulerService, _diff_jobs
+
+
+def _job(job_id, hour=1, enabled=True):
+    return {
+        'id': job_id,
+        'enabled': enabled,
+        'script': 'python',
+        'schedule': {'type': 'cron', 'args': {'hour': hour}},
+    }
+
+
+@pytest.fixture
+def service():
+    service = SchedulerService('config.yml')
+    service.scheduler = Mock()
+    service.job_executor = Mock()
+    service.config_loader = Mock()
+    service.running = True
+    return service
+
+
+def _scheduled_ids(scheduler):
+    return [call.kwargs['id'] for call in scheduler.add_job.call_args_list]
+
+
+@pytest.mark.unit
+def test_diff_jobs_reports_added_removed_and_changed():
+    old = {'a': _job('a'), 'b': _job('b'), 'c': _job('c')}
+    new = {'a': _job('a'), 'b': _job('b', hour=2), 'd': _job('d')}
+
+    assert _diff_jobs(old, new) == ({'d'}, {'c'}, {'b'})
+
+
+@pytest.mark.unit
+def test_reload_only_touches_added_removed_and_changed_jobs(service):
+    service._add_jobs_from_config({'jobs': [_job('a'), _job('b'), _job('c')]})
+    service.scheduler.reset_mock()
+
+    service.config_loader.load.return_value = {'jobs': [_job('a'), _job('b', hour=2), _job('d')]}
+    service.reload_config()
+
+    removed = sorted(call.args[0] for call in service.scheduler.remove_job.call_args_list)
+    assert removed == ['b', 'c']
+    assert sorted(_scheduled_ids(service.scheduler)) == ['b', 'd']
+    assert sorted(service._job_configs) == ['a', 'b', 'd']
+    assert service._job_configs['b']['schedule']['args'] == {'hour': 2}
+
+
+@pytest.mark.unit
+def test_reload_removes_job_that_was_disabled(service):
+    service._add_jobs_from_config({'jobs': [_job('a'), _job('b')]})
+    service.scheduler.reset_mock()
+
+    service.config_loader.load.return_value = {'jobs': [_job('a'), _job('b', enabled=False)]}
+    service.reload_config()
+
+    service.scheduler.remove_job.assert_called_once_with('b')
+    service.scheduler.add_job.assert_not_called()
+    assert list(service._job_configs) == ['a']
+
+
+@pytest.mark.unit
+def test_duplicate_job_ids_keep_first_and_log(service, caplog):
+    first, second = _job('a', hour=1), _job('a', hour=5)
+
+    with caplog.at_level('ERROR'):
+        service._add_jobs_from_config({'jobs': [first, second]})
+
+    assert _scheduled_ids(service.scheduler) == ['a']
+    assert service._job_configs['a'] is first
+    assert any('duplicate job id' in record.getMessage() for record in caplog.records)
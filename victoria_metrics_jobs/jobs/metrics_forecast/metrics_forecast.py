@@ -22,13 +22,17 @@ Database Storage:
 from __future__ import annotations
 
 import gc
+import io
 import json
+import struct
 import sys
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
@@ -39,10 +43,191 @@ from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 from urllib.parse import quote_plus
 
+try:
+    from psycopg2.extras import execute_values
+except ImportError:  # optional; other drivers use executemany()
+    execute_values = None
+
 # Add the scheduler module to the path for imports shared with other jobs
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from victoria_metrics_jobs.jobs.common import BaseJob, BaseJobState, Err, Ok, Result
 
+# Batches larger than this are bulk loaded through COPY into a temporary
+# staging table and merged with a single INSERT ... SELECT ... ON CONFLICT;
+# smaller ones are sent as one multi-row INSERT ... VALUES statement.
+COPY_THRESHOLD_ROWS = 500
+
+# PostgreSQL binary COPY framing for vm_metric_data_stage rows:
+# (job_idx int8, metric_id int4, metric_timestamp timestamptz, metric_value float8, run_id int8)
+_PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_PGCOPY_TRAILER = struct.pack("!h", -1)
+_PGCOPY_ROW = struct.Struct("!hiqiiiqid")
+_PGCOPY_INT8 = struct.Struct("!iq")
+_PGCOPY_NULL = struct.pack("!i", -1)
+_PG_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Statements executed per series are built once at import so every call
+# reuses the same TextClause (and its SQLAlchemy compiled-cache entry).
+_SELECT_JOB_IDX_SQL = text("""
+    SELECT DISTINCT job_idx
+    FROM public.vm_metric_metadata
+    WHERE job_id = :job_id
+    LIMIT 1
+""")
+
+_SELECT_METRIC_ID_SQL = text("""
+    SELECT metric_id
+    FROM public.vm_metric_metadata
+    WHERE job_idx = :job_idx
+      AND job_id = :job_id
+      AND metric_name = :metric_name
+      AND metric_labels = CAST(:normalized_labels_json AS jsonb)
+    LIMIT 1
+""")
+
+_SELECT_METRIC_IDS_SQL = text("""
+    SELECT metric_id, metric_labels
+    FROM public.vm_metric_metadata
+    WHERE job_idx = :job_idx
+      AND job_id = :job_id
+      AND metric_name = :metric_name
+      AND metric_labels = ANY(CAST(:labels_json AS jsonb[]))
+""")
+
+_SELECT_MAX_METRIC_ID_SQL = text("""
+    SELECT COALESCE(MAX(metric_id), 0)
+    FROM public.vm_metric_metadata
+    WHERE job_idx = :job_idx
+""")
+
+_INSERT_METRIC_METADATA_SQL = text("""
+    INSERT INTO public.vm_metric_metadata (
+        job_idx, metric_id, job_id, metric_name, metric_labels
+    )
+    VALUES (
+        :job_idx, :metric_id, :job_id, :metric_name, CAST(:metric_labels AS jsonb)
+    )
+    RETURNING metric_id
+""")
+
+_INSERT_FIRST_METRIC_METADATA_SQL = text("""
+    INSERT INTO public.vm_metric_metadata (
+        job_idx, metric_id, job_id, metric_name, metric_labels
+    )
+    VALUES (
+        DEFAULT, 1, :job_id, :metric_name, CAST(:metric_labels AS jsonb)
+    )
+    RETURNING job_idx, metric_id
+""")
+
+_UPSERT_METRIC_DATA_SQL = text("""
+    INSERT INTO public.vm_metric_data (
+        job_idx, metric_id, metric_timestamp, metric_value, run_id
+    )
+    VALUES (
+        :job_idx, :metric_id, :metric_timestamp, :metric_value, :run_id
+    )
+    ON CONFLICT (job_idx, metric_id, metric_timestamp)
+    DO UPDATE SET
+        metric_value = EXCLUDED.metric_value,
+        run_id = EXCLUDED.run_id
+""")
+
+_CREATE_STAGE_TABLE_SQL = text("""
+    CREATE TEMP TABLE IF NOT EXISTS vm_metric_data_stage (
+        job_idx BIGINT NOT NULL,
+        metric_id INT NOT NULL,
+        metric_timestamp TIMESTAMPTZ NOT NULL,
+        metric_value DOUBLE PRECISION NOT NULL,
+        run_id BIGINT
+    )
+""")
+
+_MERGE_STAGE_TABLE_SQL = text("""
+    INSERT INTO public.vm_metric_data (
+        job_idx, metric_id, metric_timestamp, metric_value, run_id
+    )
+    SELECT job_idx, metric_id, metric_timestamp, metric_value, run_id
+    FROM vm_metric_data_stage
+    ON CONFLICT (job_idx, metric_id, metric_timestamp)
+    DO UPDATE SET
+        metric_value = EXCLUDED.metric_value,
+        run_id = EXCLUDED.run_id
+""")
+
+_TRUNCATE_STAGE_TABLE_SQL = text("TRUNCATE vm_metric_data_stage")
+
+# psycopg2 execute_values() statement and per-row template for row dictionaries
+_UPSERT_METRIC_DATA_VALUES_SQL = """
+    INSERT INTO public.vm_metric_data (
+        job_idx, metric_id, metric_timestamp, metric_value, run_id
+    )
+    VALUES %s
+    ON CONFLICT (job_idx, metric_id, metric_timestamp)
+    DO UPDATE SET
+        metric_value = EXCLUDED.metric_value,
+        run_id = EXCLUDED.run_id
+"""
+_UPSERT_METRIC_DATA_VALUES_TEMPLATE = (
+    "(%(job_idx)s, %(metric_id)s, %(metric_timestamp)s, %(metric_value)s, %(run_id)s)"
+)
+
+_SELECT_FORECAST_CONFIGS_SQL = text("""
+    SELECT 
+        config_id,
+        selection_value,
+        prophet_params,
+        prophet_fit_params,
+        history_days,
+        history_offset_days,
+        history_step_hours,
+        forecast_horizon_days,
+        min_history_points,
+        cutoff_hour,
+        notes
+    FROM public.vm_forecast_config
+    WHERE job_id = :job_id
+      AND enabled = true
+    ORDER BY config_id
+""")
+
+_INSERT_FORECAST_RUN_SQL = text("""
+    INSERT INTO public.vm_forecast_job (
+        job_id,
+        selection_value,
+        prophet_config,
+        prophet_fit_config,
+        config_source,
+        history_days,
+        forecast_horizon_days,
+        min_history_points,
+        business_date,
+        started_at,
+        status
+    )
+    VALUES (
+        :job_id,
+        :selection_value,
+        CAST(:prophet_config AS jsonb),
+        CAST(:prophet_fit_config AS jsonb),
+        :config_source,
+        :history_days,
+        :forecast_horizon_days,
+        :min_history_points,
+        :business_date,
+        :started_at,
+        :status
+    )
+    RETURNING run_id
+""")
+
+
+@lru_cache(maxsize=4096)
+def _labels_json(label_items: FrozenSet[Tuple[str, str]]) -> str:
+    """Serialize label items to compact, key-sorted JSON; cached since label sets repeat."""
+    return json.dumps(dict(label_items), sort_keys=True, separators=(",", ":"))
+
 
 @dataclass
 class SeriesHistory:
@@ -64,7 +249,10 @@ class MetricsForecastState(BaseJobState):
     history_step_hours: int = 24
     forecast_horizon_days: int = 20
     forecast_types: List[Dict[str, str]] = field(default_factory=list)
+    # (name, field) pairs from forecast_types, validated once at job start
+    valid_forecast_types: Tuple[Tuple[str, str], ...] = ()
     min_history_points: int = 30
+    write_workers: int = 1
     vm_query_url: str = ""
     vm_gateway_url: str = ""
     vm_token: str = ""
@@ -103,6 +291,13 @@ class MetricsForecastJob(BaseJob):
 
     def __init__(self, config_path: str = None, verbose: bool = False):
         super().__init__("metrics_forecast", config_path, verbose)
+        # Per-process lookup caches for vm_metric_metadata identifiers.
+        # Invalidated together with the database connection.
+        self._job_idx_cache: Dict[str, int] = {}
+        self._metric_id_cache: Dict[Tuple[int, str, str, str], int] = {}
+        # Optional pool of vm_metric_data writers (write_workers > 1)
+        self._write_pool: Optional[ThreadPoolExecutor] = None
+        self._pending_writes: List[Future] = []
 
     def create_initial_state(self, job_id: str) -> Result[MetricsForecastState, Exception]:
         try:
@@ -140,7 +335,13 @@ class MetricsForecastJob(BaseJob):
                 history_step_hours=max(1, int(job_config.get("history_step_hours", 24))),
                 forecast_horizon_days=int(job_config.get("forecast_horizon_days", 20)),
                 forecast_types=forecast_types,
+                valid_forecast_types=tuple(
+                    (forecast_type["name"], forecast_type["field"])
+                    for forecast_type in forecast_types
+                    if forecast_type.get("name") and forecast_type.get("field")
+                ),
                 min_history_points=int(job_config.get("min_history_points", 30)),
+                write_workers=max(1, int(job_config.get("write_workers", 1))),
                 prophet_config={},  # No longer used - DB-driven
                 prophet_fit_kwargs={},  # No longer used - DB-driven
                 vm_query_url=victoria_metrics_cfg.get("query_url", ""),
@@ -234,11 +435,20 @@ class MetricsForecastJob(BaseJob):
         No YAML configuration needed - everything driven by database.
         """
         try:
-            # Get database connection
+            # Acquire a single database connection for the whole run; it is
+            # passed down to every helper and closed in finalize_state.
             conn = self._get_database_connection(state)
             if not conn:
                 raise ValueError("Database connection required for DB-driven forecasting")
             
+            # Optional parallel writers: Prophet fits and metadata resolution stay
+            # on this thread, vm_metric_data upserts run on their own connections
+            if state.write_workers > 1:
+                self._write_pool = ThreadPoolExecutor(
+                    max_workers=state.write_workers,
+                    thread_name_prefix="forecast-writer",
+                )
+            
             # Get Prometheus client for querying metrics
             prom = self._get_prometheus_client(state)
             if prom is None:
@@ -249,26 +459,7 @@ class MetricsForecastJob(BaseJob):
                 "Loading forecast configurations from database for job_id='%s'...",
                 state.job_id
             )
-            query = text("""
-                SELECT 
-                    config_id,
-                    selection_value,
-                    prophet_params,
-                    prophet_fit_params,
-                    history_days,
-                    history_offset_days,
-                    history_step_hours,
-                    forecast_horizon_days,
-                    min_history_points,
-                    cutoff_hour,
-                    notes
-                FROM public.vm_forecast_config
-                WHERE job_id = :job_id
-                  AND enabled = true
-                ORDER BY config_id
-            """)
-            
-            result = conn.execute(query, {"job_id": state.job_id})
+            result = conn.execute(_SELECT_FORECAST_CONFIGS_SQL, {"job_id": state.job_id})
             config_rows = result.fetchall()
             
             if not config_rows:
@@ -309,6 +500,7 @@ class MetricsForecastJob(BaseJob):
                     # Create forecast run record for this configuration
                     run_id = self._create_forecast_run_record(
                         state,
+                        conn,
                         selection_value,
                         prophet_params,
                         prophet_fit_params,
@@ -360,6 +552,7 @@ class MetricsForecastJob(BaseJob):
                             
                             rows_written = self._forecast_single_series(
                                 state,
+                                conn,
                                 series,
                                 prophet_params,
                                 prophet_fit_params,
@@ -394,6 +587,8 @@ class MetricsForecastJob(BaseJob):
                         config_exc
                     )
                     continue
+                finally:
+                    self._drain_pending_writes(state)
             
             self.logger.info(
                 "Forecast processing complete: %s series processed, %s forecasts written, %s failed",
@@ -407,6 +602,29 @@ class MetricsForecastJob(BaseJob):
         except Exception as exc:
             self.logger.error("Failed to process forecast configurations: %s", exc)
             return Err(exc)
+        finally:
+            if self._write_pool is not None:
+                self._drain_pending_writes(state)
+                self._write_pool.shutdown(wait=True)
+                self._write_pool = None
+
+    def _drain_pending_writes(self, state: MetricsForecastState) -> None:
+        """Wait for writes submitted to the write pool and count their results.
+        
+        Args:
+            state: Job state whose counters are updated
+        """
+        pending, self._pending_writes = self._pending_writes, []
+        for future in pending:
+            try:
+                rows_written = future.result()
+            except Exception:
+                # Already logged with the series name by the writer
+                state.failed_series += 1
+                continue
+            if rows_written > 0:
+                state.forecasts_written += rows_written
+                state.series_processed += 1
 
 
     # Step 6: Publish status metric for observability
@@ -434,7 +652,7 @@ class MetricsForecastJob(BaseJob):
                 f'metrics_forecast_job_status{{{",".join(label_pairs)}}} {status_value} {timestamp}'
             )
 
-            self._write_metric_to_vm(state, metric_line, timeout=30)
+            self._write_metrics_to_vm(state, [metric_line], timeout=30)
             return Ok(state)
         except Exception as exc:
             self.logger.warning("Failed to publish job status metric: %s", exc)
@@ -571,6 +789,7 @@ class MetricsForecastJob(BaseJob):
     def _forecast_single_series(
         self,
         state: MetricsForecastState,
+        conn: Any,
         series: SeriesHistory,
         prophet_params: Dict[str, Any],
         prophet_fit_params: Dict[str, Any],
@@ -582,6 +801,7 @@ class MetricsForecastJob(BaseJob):
         
         Args:
             state: Job state
+            conn: Database connection shared by the job run
             series: Series to forecast
             prophet_params: Prophet model parameters
             prophet_fit_params: Prophet fit parameters
@@ -646,6 +866,7 @@ class MetricsForecastJob(BaseJob):
             # Write forecasts to database
             rows_written = self._write_forecasts_to_database(
                 state,
+                conn,
                 series,
                 forecast_df,
                 run_id
@@ -698,6 +919,18 @@ class MetricsForecastJob(BaseJob):
         daily["y"] = daily["y"].interpolate(method="linear").ffill().bfill()
         return daily[["ds", "y"]]
 
+    def _forecast_timestamps(self, ds: pd.Series) -> pd.Series:
+        """Convert a forecast ``ds`` column to midnight-UTC timestamps in one pass.
+        
+        Naive dates (as produced by Prophet) are taken as UTC. Timezone-aware
+        values keep their local calendar date: the zone is dropped rather than
+        converted, since converting first could move the date across midnight.
+        """
+        timestamps = pd.to_datetime(ds)
+        if timestamps.dt.tz is not None:
+            timestamps = timestamps.dt.tz_localize(None)
+        return timestamps.dt.tz_localize("UTC").dt.normalize()
+
     def _future_business_dates(self, last_history_date: date, periods: int) -> List[pd.Timestamp]:
         """Produce the next N business-day timestamps after last_history_date."""
         future_dates: List[pd.Timestamp] = []
@@ -712,6 +945,7 @@ class MetricsForecastJob(BaseJob):
     def _create_forecast_run_record(
         self,
         state: MetricsForecastState,
+        conn: Any,
         selection_value: str,
         prophet_config: Dict[str, Any],
         prophet_fit_config: Dict[str, Any],
@@ -726,6 +960,7 @@ class MetricsForecastJob(BaseJob):
         
         Args:
             state: Job state
+            conn: Database connection shared by the job run
             selection_value: PromQL selector string
             prophet_config: Prophet model parameters used
             prophet_fit_config: Prophet fit parameters used
@@ -740,42 +975,11 @@ class MetricsForecastJob(BaseJob):
             run_id if successful, None otherwise
         """
         try:
-            conn = self._get_database_connection(state)
             if not conn:
                 self.logger.warning("Cannot create forecast run record - no database connection")
                 return None
             
-            insert_sql = text("""
-                INSERT INTO public.vm_forecast_job (
-                    job_id,
-                    selection_value,
-                    prophet_config,
-                    prophet_fit_config,
-                    config_source,
-                    history_days,
-                    forecast_horizon_days,
-                    min_history_points,
-                    business_date,
-                    started_at,
-                    status
-                )
-                VALUES (
-                    :job_id,
-                    :selection_value,
-                    CAST(:prophet_config AS jsonb),
-                    CAST(:prophet_fit_config AS jsonb),
-                    :config_source,
-                    :history_days,
-                    :forecast_horizon_days,
-                    :min_history_points,
-                    :business_date,
-                    :started_at,
-                    :status
-                )
-                RETURNING run_id
-            """)
-            
-            result = conn.execute(insert_sql, {
+            result = conn.execute(_INSERT_FORECAST_RUN_SQL, {
                 "job_id": state.job_id,
                 "selection_value": selection_value,
                 "prophet_config": json.dumps(prophet_config),
@@ -856,13 +1060,16 @@ class MetricsForecastJob(BaseJob):
             
             connection_string = self._build_database_connection_string(state.forecast_db_config)
             
-            # Create engine with connection pooling
+            # The batch job holds a single connection for the whole run (plus one
+            # per parallel writer), so keep the pool minimal and skip the
+            # per-checkout pre-ping round trip
+            writer_connections = state.write_workers if state.write_workers > 1 else 0
             state.db_engine = create_engine(
                 connection_string,
-                pool_size=5,
-                max_overflow=10,
-                pool_pre_ping=True,
-                pool_recycle=3600,
+                pool_size=1 + writer_connections,
+                max_overflow=1,
+                pool_pre_ping=False,
+                pool_recycle=1800,
                 echo=False,
                 future=True
             )
@@ -905,6 +1112,9 @@ class MetricsForecastJob(BaseJob):
         Args:
             state: Job state with database connection and engine
         """
+        self._job_idx_cache.clear()
+        self._metric_id_cache.clear()
+
         try:
             if state.db_connection:
                 state.db_connection.close()
@@ -931,9 +1141,8 @@ class MetricsForecastJob(BaseJob):
         Returns:
             JSON string with sorted keys
         """
-        # Sort by key to ensure consistent ordering
-        sorted_labels = dict(sorted(labels.items()))
-        return json.dumps(sorted_labels, sort_keys=True)
+        # sort_keys ensures consistent ordering; a frozenset is an order-independent cache key
+        return _labels_json(frozenset(labels.items()))
 
     def _find_or_get_job_idx(
         self, 
@@ -951,20 +1160,18 @@ class MetricsForecastJob(BaseJob):
         Returns:
             job_idx value if found, None if not found (will be created with first metric)
         """
+        cached_job_idx = self._job_idx_cache.get(job_id)
+        if cached_job_idx is not None:
+            return cached_job_idx
+
         try:
             # Try to find existing job_idx for this job_id
-            query = text("""
-                SELECT DISTINCT job_idx
-                FROM public.vm_metric_metadata
-                WHERE job_id = :job_id
-                LIMIT 1
-            """)
-            
-            result = conn.execute(query, {"job_id": job_id})
+            result = conn.execute(_SELECT_JOB_IDX_SQL, {"job_id": job_id})
             row = result.fetchone()
             
             if row:
                 job_idx = row[0]
+                self._job_idx_cache[job_id] = job_idx
                 self.logger.debug(
                     "Found existing job_idx=%s for job_id='%s'",
                     job_idx,
@@ -1009,6 +1216,10 @@ class MetricsForecastJob(BaseJob):
         and normalized metric_labels. If not found, inserts a new row and returns
         the new metric_id. If job_idx is None, the first insert will auto-generate it.
         
+        Runs inside the caller's transaction and does not commit. Lookups that
+        reach the database run in a SAVEPOINT, so a failed query or insert only
+        discards this metric entry and leaves the caller's transaction usable.
+        
         Args:
             conn: Database connection
             job_idx: Job index value, or None if this is the first metric for this job_id
@@ -1017,7 +1228,8 @@ class MetricsForecastJob(BaseJob):
             metric_labels: Dictionary of metric labels (will be normalized)
             
         Returns:
-            Tuple of (job_idx, metric_id) - both will be set after first insert if job_idx was None
+            Tuple of (job_idx, metric_id) - both will be set after first insert if job_idx was None,
+            (None, None) on failure
         """
         try:
             # Normalize labels for comparison
@@ -1025,26 +1237,48 @@ class MetricsForecastJob(BaseJob):
             
             # If job_idx is provided, try to find existing metric_id
             if job_idx is not None:
-                query = text("""
-                    SELECT metric_id
-                    FROM public.vm_metric_metadata
-                    WHERE job_idx = :job_idx
-                      AND job_id = :job_id
-                      AND metric_name = :metric_name
-                      AND metric_labels = CAST(:normalized_labels_json AS jsonb)
-                    LIMIT 1
-                """)
-                
-                result = conn.execute(query, {
-                    "job_idx": job_idx,
-                    "job_id": job_id,
-                    "metric_name": metric_name,
-                    "normalized_labels_json": normalized_labels_json
-                })
-                row = result.fetchone()
+                cache_key = (job_idx, job_id, metric_name, normalized_labels_json)
+                cached_metric_id = self._metric_id_cache.get(cache_key)
+                if cached_metric_id is not None:
+                    return (job_idx, cached_metric_id)
+
+                with conn.begin_nested():
+                    result = conn.execute(_SELECT_METRIC_ID_SQL, {
+                        "job_idx": job_idx,
+                        "job_id": job_id,
+                        "metric_name": metric_name,
+                        "normalized_labels_json": normalized_labels_json
+                    })
+                    row = result.fetchone()
+                    
+                    if row:
+                        metric_id = row[0]
+                        created = False
+                    else:
+                        # Not found - need to create new entry with existing job_idx
+                        max_result = conn.execute(_SELECT_MAX_METRIC_ID_SQL, {"job_idx": job_idx})
+                        max_row = max_result.fetchone()
+                        
+                        # Insert new metadata entry
+                        insert_result = conn.execute(_INSERT_METRIC_METADATA_SQL, {
+                            "job_idx": job_idx,
+                            "metric_id": (max_row[0] if max_row else 0) + 1,
+                            "job_id": job_id,
+                            "metric_name": metric_name,
+                            "metric_labels": normalized_labels_json
+                        })
+                        metric_id = insert_result.fetchone()[0]
+                        created = True
+                self._metric_id_cache[cache_key] = metric_id
                 
-                if row:
-                    metric_id = row[0]
+                if created:
+                    self.logger.info(
+                        "Created new metric_id=%s for job_id='%s', metric_name='%s'",
+                        metric_id,
+                        job_id,
+                        metric_name
+                    )
+                else:
                     self.logger.info(
                         "Found existing metric_id=%s for job_id='%s', metric_name='%s', labels=%s",
                         metric_id,
@@ -1052,73 +1286,25 @@ class MetricsForecastJob(BaseJob):
                         metric_name,
                         normalized_labels_json[:100] if len(normalized_labels_json) > 100 else normalized_labels_json
                     )
-                    return (job_idx, metric_id)
-                
-                # Not found - need to create new entry with existing job_idx
-                max_query = text("""
-                    SELECT COALESCE(MAX(metric_id), 0)
-                    FROM public.vm_metric_metadata
-                    WHERE job_idx = :job_idx
-                """)
-                
-                max_result = conn.execute(max_query, {"job_idx": job_idx})
-                max_row = max_result.fetchone()
-                new_metric_id = (max_row[0] if max_row else 0) + 1
-                
-                # Insert new metadata entry
-                insert_query = text("""
-                    INSERT INTO public.vm_metric_metadata (
-                        job_idx, metric_id, job_id, metric_name, metric_labels
-                    )
-                    VALUES (
-                        :job_idx, :metric_id, :job_id, :metric_name, CAST(:metric_labels AS jsonb)
-                    )
-                    RETURNING metric_id
-                """)
                 
-                insert_result = conn.execute(insert_query, {
-                    "job_idx": job_idx,
-                    "metric_id": new_metric_id,
-                    "job_id": job_id,
-                    "metric_name": metric_name,
-                    "metric_labels": normalized_labels_json
-                })
-                
-                conn.commit()
-                new_metric_id = insert_result.fetchone()[0]
-                
-                self.logger.info(
-                    "Created new metric_id=%s for job_id='%s', metric_name='%s'",
-                    new_metric_id,
-                    job_id,
-                    metric_name
-                )
-                
-                return (job_idx, new_metric_id)
+                return (job_idx, metric_id)
             else:
                 # No job_idx exists - this is the first metric for this job_id
                 # Insert will auto-generate job_idx via BIGSERIAL
                 # Use metric_id = 1 for the first metric
-                insert_query = text("""
-                    INSERT INTO public.vm_metric_metadata (
-                        job_idx, metric_id, job_id, metric_name, metric_labels
-                    )
-                    VALUES (
-                        DEFAULT, 1, :job_id, :metric_name, CAST(:metric_labels AS jsonb)
-                    )
-                    RETURNING job_idx, metric_id
-                """)
-                
-                insert_result = conn.execute(insert_query, {
-                    "job_id": job_id,
-                    "metric_name": metric_name,
-                    "metric_labels": normalized_labels_json
-                })
-                
-                conn.commit()
-                row = insert_result.fetchone()
+                with conn.begin_nested():
+                    insert_result = conn.execute(_INSERT_FIRST_METRIC_METADATA_SQL, {
+                        "job_id": job_id,
+                        "metric_name": metric_name,
+                        "metric_labels": normalized_labels_json
+                    })
+                    row = insert_result.fetchone()
                 new_job_idx = row[0]
                 new_metric_id = row[1]
+                self._job_idx_cache[job_id] = new_job_idx
+                self._metric_id_cache[
+                    (new_job_idx, job_id, metric_name, normalized_labels_json)
+                ] = new_metric_id
                 
                 self.logger.info(
                     "Created new job_idx=%s and metric_id=%s for job_id='%s', metric_name='%s'",
@@ -1137,8 +1323,6 @@ class MetricsForecastJob(BaseJob):
                 metric_name,
                 exc
             )
-            if conn:
-                conn.rollback()
             return (None, None)
         except Exception as exc:
             self.logger.error(
@@ -1149,9 +1333,50 @@ class MetricsForecastJob(BaseJob):
             )
             return (None, None)
 
+    def _prefetch_metric_ids(
+        self,
+        conn: Any,
+        job_idx: int,
+        job_id: str,
+        metric_name: str,
+        label_sets: List[Dict[str, str]],
+    ) -> None:
+        """Load existing metric_ids for several label sets with a single query.
+        
+        Found ids are stored in the metric_id cache used by _find_or_get_metric_id;
+        label sets that are already cached are not queried again.
+        
+        Args:
+            conn: Database connection
+            job_idx: Job index value
+            job_id: Job ID string
+            metric_name: Metric name
+            label_sets: Metric label dictionaries to resolve
+        """
+        uncached_labels_json = [
+            labels_json
+            for labels_json in map(self._normalize_metric_labels_for_comparison, label_sets)
+            if (job_idx, job_id, metric_name, labels_json) not in self._metric_id_cache
+        ]
+        if not uncached_labels_json:
+            return
+        
+        result = conn.execute(_SELECT_METRIC_IDS_SQL, {
+            "job_idx": job_idx,
+            "job_id": job_id,
+            "metric_name": metric_name,
+            "labels_json": uncached_labels_json,
+        })
+        for metric_id, metric_labels in result.fetchall():
+            if isinstance(metric_labels, str):
+                metric_labels = json.loads(metric_labels)
+            normalized_labels_json = self._normalize_metric_labels_for_comparison(metric_labels)
+            self._metric_id_cache[(job_idx, job_id, metric_name, normalized_labels_json)] = metric_id
+
     def _write_forecasts_to_database(
         self,
         state: MetricsForecastState,
+        conn: Any,
         series: SeriesHistory,
         forecast_df: pd.DataFrame,
         run_id: Optional[int] = None,
@@ -1166,16 +1391,18 @@ class MetricsForecastJob(BaseJob):
         5. Inserts forecast values into vm_metric_data
         
         Args:
-            state: Job state with database connection
+            state: Job state with forecast type configuration
+            conn: Database connection shared by the job run
             series: Series history containing metric metadata
             forecast_df: Prophet forecast DataFrame with predictions
             run_id: Optional reference to vm_forecast_job run record (stored in vm_metric_data)
             
         Returns:
-            Number of forecast rows written
+            Number of forecast rows written. When a write pool is active the
+            rows are handed to a writer connection and 0 is returned here; they
+            are counted by _drain_pending_writes.
         """
         try:
-            conn = self._get_database_connection(state)
             if not conn:
                 raise ValueError("Database connection not available")
             
@@ -1206,19 +1433,29 @@ class MetricsForecastJob(BaseJob):
             # This ensures the FK constraint is satisfied
             forecast_type_metric_ids = {}
             
-            for forecast_type in state.forecast_types:
-                name = forecast_type.get("name")
-                if not name:
-                    continue
-                
-                # Add forecast_type to metric_labels - this makes each forecast_type a separate timeseries
+            # Add forecast_type to metric_labels - this makes each forecast_type a separate timeseries
+            labels_by_type = {}
+            for name, _ in state.valid_forecast_types:
                 metric_labels_with_type = dict(base_metric_labels)
                 metric_labels_with_type["forecast_type"] = name
-                
+                labels_by_type[name] = metric_labels_with_type
+            
+            # Resolve every existing forecast_type metric_id in one round trip;
+            # the per-type lookups below are then served from the cache
+            if job_idx is not None:
+                self._prefetch_metric_ids(
+                    conn,
+                    job_idx,
+                    forecast_job_id,
+                    series.metric_name,
+                    list(labels_by_type.values()),
+                )
+            
+            for name, metric_labels_with_type in labels_by_type.items():
                 # Find or get metric_id for this forecast_type timeseries
                 # This will CREATE the metadata entry if it doesn't exist
                 # If job_idx is None, this will auto-generate it with the first metric
-                job_idx, metric_id = self._find_or_get_metric_id(
+                type_job_idx, metric_id = self._find_or_get_metric_id(
                     conn,
                     job_idx,
                     forecast_job_id,
@@ -1226,7 +1463,9 @@ class MetricsForecastJob(BaseJob):
                     metric_labels_with_type
                 )
                 
-                if job_idx is None or metric_id is None:
+                if type_job_idx is None or metric_id is None:
+                    # Keep job_idx: a failed type must not make the next one
+                    # mint a new job_idx for this forecast_job_id
                     self.logger.warning(
                         "Failed to get job_idx/metric_id for %s (forecast_type=%s), skipping this forecast type",
                         series.metric_name,
@@ -1234,6 +1473,7 @@ class MetricsForecastJob(BaseJob):
                     )
                     continue
                 
+                job_idx = type_job_idx
                 forecast_type_metric_ids[name] = metric_id
             
             if not forecast_type_metric_ids:
@@ -1241,73 +1481,54 @@ class MetricsForecastJob(BaseJob):
                     "No valid metric_ids found for any forecast_type for %s, skipping",
                     series.metric_name
                 )
+                # The lookups may have left the transaction aborted
+                self._rollback_series_transaction(conn)
                 return 0
             
-            # STEP 2: Ensure all metadata entries are committed before inserting data
-            # (The _find_or_get_metric_id method commits after creation, but we ensure it's done here)
-            conn.commit()
-            
-            # STEP 3: Now we can safely insert data (FK constraint will be satisfied)
-            
-            # Now prepare rows for batch insert using the pre-looked-up metric_ids
-            rows_to_insert = []
-            
-            for future_row in forecast_df.itertuples():
-                # Use forecast date as-is (biz_date from Prophet forecast)
-                forecast_date = future_row.ds.date()
-                forecast_timestamp = datetime.combine(
-                    forecast_date, 
-                    datetime.min.time()
-                ).replace(tzinfo=timezone.utc)
+            # STEP 2: Insert data in the same transaction as the metadata entries
+            # (FK constraint is satisfied); everything is committed once below.
+            # Now prepare rows for batch insert using the pre-looked-up metric_ids.
+            # Forecast dates (biz_date from Prophet) are converted to midnight UTC
+            # once for the whole frame, then each forecast_type column is taken
+            # as a vector with NaN values masked out.
+            metric_timestamps = self._forecast_timestamps(forecast_df["ds"])
+            rows_to_insert: List[Dict[str, Any]] = []
+            
+            for name, field in state.valid_forecast_types:
+                if field not in forecast_df.columns:
+                    continue
                 
-                for forecast_type in state.forecast_types:
-                    name = forecast_type.get("name")
-                    field = forecast_type.get("field")
-                    if not name or not field or not hasattr(future_row, field):
-                        continue
-                    
-                    # Skip if we didn't get a metric_id for this forecast_type
-                    if name not in forecast_type_metric_ids:
-                        continue
-                    
-                    value = getattr(future_row, field)
-                    if value is None or np.isnan(value):
-                        continue
-                    
-                    # Use the pre-looked-up metric_id for this forecast_type
-                    metric_id = forecast_type_metric_ids[name]
-                    
-                    rows_to_insert.append({
-                        "job_idx": job_idx,
-                        "metric_id": metric_id,
-                        "metric_timestamp": forecast_timestamp,
-                        "metric_value": float(value),
-                        "run_id": run_id,  # Store run_id to track which forecast run generated this data
-                    })
+                # Skip if we didn't get a metric_id for this forecast_type
+                if name not in forecast_type_metric_ids:
+                    continue
+                
+                values = forecast_df[field]
+                valid = values.notna()
+                type_rows = pd.DataFrame({
+                    "job_idx": job_idx,
+                    "metric_id": forecast_type_metric_ids[name],
+                    "metric_timestamp": metric_timestamps[valid],
+                    "metric_value": values[valid].astype(float),
+                    "run_id": run_id,  # Store run_id to track which forecast run generated this data
+                })
+                rows_to_insert.extend(type_rows.to_dict("records"))
             
             if not rows_to_insert:
                 self.logger.debug("No forecast rows to write for %s", series.metric_name)
+                conn.commit()  # keep any metadata entries created above
                 return 0
             
-            # Build PostgreSQL upsert statement for vm_metric_data
-            # ON CONFLICT ... DO UPDATE for idempotent writes
-            upsert_sql = text("""
-                INSERT INTO public.vm_metric_data (
-                    job_idx, metric_id, metric_timestamp, metric_value, run_id
-                )
-                VALUES (
-                    :job_idx, :metric_id, :metric_timestamp, :metric_value, :run_id
+            if self._write_pool is not None:
+                # Writer connections only see committed metadata (FK constraint)
+                conn.commit()
+                self._pending_writes.append(
+                    self._write_pool.submit(
+                        self._write_forecast_rows_on_worker, state, series, rows_to_insert
+                    )
                 )
-                ON CONFLICT (job_idx, metric_id, metric_timestamp)
-                DO UPDATE SET
-                    metric_value = EXCLUDED.metric_value,
-                    run_id = EXCLUDED.run_id
-            """)
-            
-            # Execute batch insert
-            for row in rows_to_insert:
-                conn.execute(upsert_sql, row)
+                return 0
             
+            self._upsert_forecast_rows(conn, rows_to_insert)
             conn.commit()
             
             self.logger.info(
@@ -1326,9 +1547,7 @@ class MetricsForecastJob(BaseJob):
                 series.metric_name,
                 exc,
             )
-            # Rollback on error
-            if conn:
-                conn.rollback()
+            self._rollback_series_transaction(conn)
             return 0
         except Exception as exc:
             self.logger.error(
@@ -1336,8 +1555,154 @@ class MetricsForecastJob(BaseJob):
                 series.metric_name,
                 exc,
             )
+            self._rollback_series_transaction(conn)
             return 0
 
+    def _rollback_series_transaction(self, conn: Any) -> None:
+        """Roll back a failed per-series transaction.
+
+        Metadata rows created inside the transaction are discarded as well, so
+        the job_idx/metric_id caches are cleared to avoid handing out ids that
+        no longer exist.
+
+        Args:
+            conn: Database connection
+        """
+        self._job_idx_cache.clear()
+        self._metric_id_cache.clear()
+        if not conn:
+            return
+        try:
+            conn.rollback()
+        except Exception as exc:
+            self.logger.warning("Failed to roll back forecast transaction: %s", exc)
+
+    def _upsert_forecast_rows(self, conn: Any, rows: List[Dict[str, Any]]) -> None:
+        """Upsert rows into vm_metric_data (ON CONFLICT ... DO UPDATE for idempotent writes).
+        
+        Large batches go through COPY, where the staging setup pays off.
+        Smaller ones are a single multi-row INSERT ... VALUES on psycopg2
+        (execute_values), or one executemany() call on other drivers.
+        Does not commit.
+        
+        Args:
+            conn: Database connection
+            rows: Row dictionaries as built by _write_forecasts_to_database
+        """
+        if len(rows) > COPY_THRESHOLD_ROWS and self._copy_forecast_rows(conn, rows):
+            return
+
+        if execute_values is not None and conn.dialect.driver == "psycopg2":
+            # A raw cursor does not autobegin; start the transaction so the
+            # caller's conn.commit() covers these rows
+            if not conn.in_transaction():
+                conn.begin()
+            dbapi_cursor = conn.connection.cursor()
+            try:
+                execute_values(
+                    dbapi_cursor,
+                    _UPSERT_METRIC_DATA_VALUES_SQL,
+                    rows,
+                    template=_UPSERT_METRIC_DATA_VALUES_TEMPLATE,
+                    page_size=COPY_THRESHOLD_ROWS,
+                )
+            finally:
+                dbapi_cursor.close()
+            return
+
+        conn.execute(_UPSERT_METRIC_DATA_SQL, rows)
+
+    def _write_forecast_rows_on_worker(
+        self,
+        state: MetricsForecastState,
+        series: SeriesHistory,
+        rows: List[Dict[str, Any]],
+    ) -> int:
+        """Upsert forecast rows on a dedicated pooled connection (write pool task).
+        
+        Args:
+            state: Job state with the database engine
+            series: Series the rows belong to (for logging)
+            rows: Row dictionaries as built by _write_forecasts_to_database
+            
+        Returns:
+            Number of forecast rows written
+            
+        Raises:
+            Exception: Re-raised after logging so the failure is counted when
+                the future is drained
+        """
+        try:
+            engine = self._get_database_engine(state)
+            if not engine:
+                raise ValueError("Database engine not available")
+            with engine.connect() as worker_conn:
+                self._upsert_forecast_rows(worker_conn, rows)
+                worker_conn.commit()
+            self.logger.info(
+                "Wrote %s forecast rows for %s on writer connection",
+                len(rows),
+                series.metric_name,
+            )
+            return len(rows)
+        except Exception as exc:
+            self.logger.error(
+                "Failed to write forecasts to database for %s: %s",
+                series.metric_name,
+                exc,
+            )
+            raise
+
+    def _copy_forecast_rows(self, conn: Any, rows: List[Dict[str, Any]]) -> bool:
+        """Bulk load forecast rows via COPY and merge them into vm_metric_data.
+
+        Rows are streamed into a session-local temporary table with binary
+        COPY (no server-side text parsing of numbers/timestamps) and then upserted into vm_metric_data in one statement, so
+        conflict handling stays identical to the executemany path. Runs in the
+        caller's transaction; the caller commits or rolls back.
+
+        Args:
+            conn: Database connection
+            rows: Row dictionaries as built by _write_forecasts_to_database
+
+        Returns:
+            True if the rows were loaded, False if the driver has no COPY support
+        """
+        dbapi_cursor = conn.connection.cursor()
+        try:
+            if not hasattr(dbapi_cursor, "copy_expert"):
+                return False
+
+            conn.execute(_CREATE_STAGE_TABLE_SQL)
+
+            buffer = io.BytesIO()
+            buffer.write(_PGCOPY_HEADER)
+            for row in rows:
+                buffer.write(_PGCOPY_ROW.pack(
+                    5,
+                    8, row["job_idx"],
+                    4, row["metric_id"],
+                    8, (row["metric_timestamp"] - _PG_EPOCH) // _ONE_MICROSECOND,
+                    8, row["metric_value"],
+                ))
+                run_id = row["run_id"]
+                buffer.write(_PGCOPY_NULL if run_id is None else _PGCOPY_INT8.pack(8, run_id))
+            buffer.write(_PGCOPY_TRAILER)
+            buffer.seek(0)
+
+            dbapi_cursor.copy_expert(
+                "COPY vm_metric_data_stage "
+                "(job_idx, metric_id, metric_timestamp, metric_value, run_id) "
+                "FROM STDIN WITH (FORMAT BINARY)",
+                buffer,
+            )
+
+            conn.execute(_MERGE_STAGE_TABLE_SQL)
+            conn.execute(_TRUNCATE_STAGE_TABLE_SQL)
+            return True
+        finally:
+            dbapi_cursor.close()
+
     def _get_prometheus_client(self, state: MetricsForecastState) -> Optional[PrometheusConnect]:
         if state.prom_client:
             return state.prom_client
@@ -1350,12 +1715,21 @@ class MetricsForecastJob(BaseJob):
         state.prom_client = PrometheusConnect(url=url, headers=headers, disable_ssl=True)
         return state.prom_client
 
-    def _write_metric_to_vm(
-        self, state: MetricsForecastState, metric_line: str, timeout: int = 60
+    def _write_metrics_to_vm(
+        self, state: MetricsForecastState, metric_lines: List[str], timeout: int = 60
     ) -> bool:
-        """Write a single metric line to VictoriaMetrics (used for job status metric)."""
+        """Write metric lines to VictoriaMetrics in a single import request.
+        
+        Args:
+            state: Job state with gateway URL and token
+            metric_lines: Prometheus exposition lines (e.g. the job status metric)
+            timeout: Request timeout in seconds
+            
+        Returns:
+            True if the lines were accepted, False otherwise
+        """
         try:
-            if not metric_line:
+            if not metric_lines:
                 return False
             if not state.vm_gateway_url:
                 self.logger.error("VM gateway URL not configured")
@@ -1371,7 +1745,7 @@ class MetricsForecastJob(BaseJob):
                 headers["Authorization"] = f"Bearer {state.vm_token}"
             response = session.post(
                 f"{state.vm_gateway_url}/api/v1/import/prometheus",
-                data=metric_line,
+                data=("\n".join(metric_lines) + "\n").encode("utf-8"),
                 headers=headers,
                 timeout=timeout,
             )
@@ -12,17 +12,419 @@ The job:
 
 from __future__ import annotations
 
+import json
+import logging
+import multiprocessing.util
 import os
 import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass, field
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+# Notebook tooling is imported once per process; each piece is optional so the
+# job can still report a clean error when it is missing.
+try:
+    import nbformat
+    import papermill as pm
+    from nbclient import NotebookClient
+    from papermill.parameterize import parameterize_notebook
+except ImportError:
+    nbformat = None
+    pm = None
+    NotebookClient = None
+    parameterize_notebook = None
+
+try:
+    from nbconvert import HTMLExporter
+except ImportError:
+    HTMLExporter = None
+
+# orjson is optional; json.loads accepts bytes as well
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Papermill 2.6.0+ may warn about "unknown parameters" even when parameters are
+# correctly defined; they are still injected, so silence the warning once here.
+warnings.filterwarnings('ignore', message='.*unknown.*parameter.*', category=UserWarning)
+
+# Same logger as the job (setup_job_logging names it after the job); worker
+# processes inherit its handlers
+_LOGGER = logging.getLogger("metrics_forecast_notebooks")
+
+# Write buffer for executed notebooks (embedded plots make them several MB).
+# Only used with reuse_kernel (opt-in); papermill writes and autosaves its
+# output path itself, so the default path is not affected.
+OUTPUT_WRITE_BUFFER_BYTES = 8 << 20
+
+# Days to roll back to the previous business day, keyed by
+# (weekday, before_cutoff); missing keys mean "today" (weekday after cutoff)
+_DAYS_BACK = {
+    (0, True): 3,  # Monday before cutoff -> Friday
+    (1, True): 1,
+    (2, True): 1,
+    (3, True): 1,
+    (4, True): 1,
+    (5, False): 1,  # Saturday -> Friday
+    (5, True): 1,
+    (6, False): 2,  # Sunday -> Friday
+    (6, True): 2,
+}
 
 # Add the scheduler module to the path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from victoria_metrics_jobs.jobs.common import BaseJob, BaseJobState, Err, Ok, Result
-from victoria_metrics_jobs.scheduler.notebooks_file_manager import NotebooksFileManager
+
+
+@dataclass(frozen=True)
+class NotebookExecutionSettings:
+    """Picklable subset of the job state needed to execute a single notebook.
+
+    Sent to worker processes instead of the full state object.
+    """
+
+    notebooks_dir: Path
+    partition_dir: Path
+    output_timestamp: str = ""
+    base_parameters: Dict[str, Any] = field(default_factory=dict)
+    papermill_start_timeout: int = 300
+    papermill_execution_timeout: Optional[int] = None
+    reuse_kernel: bool = False
+    log_output: bool = False
+    generate_html: bool = True
+
+
+# Jupyter kernel shared by all notebooks executed in this process (inline or
+# worker process); started lazily and shut down when the process exits.
+_SHARED_KERNEL = None
+_SHARED_KERNEL_FINALIZER = None
+
+
+def _get_or_start_kernel(cwd: Path, startup_timeout: int):
+    """Return the process-wide Jupyter kernel, starting it on first use.
+
+    Args:
+        cwd: Working directory for the kernel (the notebooks directory, so
+            notebooks can import their helper modules)
+        startup_timeout: Seconds to wait for the kernel to become ready
+
+    Returns:
+        A started jupyter_client KernelManager
+    """
+    global _SHARED_KERNEL, _SHARED_KERNEL_FINALIZER
+    if _SHARED_KERNEL is not None:
+        if _SHARED_KERNEL.is_alive():
+            return _SHARED_KERNEL
+        _shutdown_shared_kernel()
+
+    from jupyter_client import KernelManager
+
+    km = KernelManager(kernel_name="python3")
+    km.start_kernel(cwd=str(cwd))
+    kc = km.client()
+    kc.start_channels()
+    try:
+        kc.wait_for_ready(timeout=startup_timeout)
+    finally:
+        kc.stop_channels()
+
+    _SHARED_KERNEL = km
+    if _SHARED_KERNEL_FINALIZER is None:
+        # Runs at interpreter exit and when a ProcessPoolExecutor worker exits
+        _SHARED_KERNEL_FINALIZER = multiprocessing.util.Finalize(
+            None, _shutdown_shared_kernel, exitpriority=10
+        )
+    return km
+
+
+@lru_cache(maxsize=1)
+def _get_html_exporter():
+    """Return the process-wide HTML exporter (templates are compiled once)."""
+    if HTMLExporter is None:
+        raise ImportError("nbconvert is not installed")
+    return HTMLExporter(template_name="classic")
+
+
+def _shutdown_shared_kernel() -> None:
+    """Shut down the process-wide Jupyter kernel if one is running."""
+    global _SHARED_KERNEL
+    km, _SHARED_KERNEL = _SHARED_KERNEL, None
+    if km is None:
+        return
+    try:
+        km.shutdown_kernel(now=True)
+    except Exception:
+        pass
+
+
+def _execute_notebook(
+    notebook_rel_path: str, settings: NotebookExecutionSettings
+) -> Tuple[str, bool, Dict[str, Any]]:
+    """Execute a single notebook and render its HTML twin.
+
+    Runs either inline or inside a worker process. It is a module-level
+    function so submitting it pickles only its arguments, not the job
+    (whose database manager holds an engine and locks).
+
+    Args:
+        notebook_rel_path: Notebook path relative to the notebooks directory
+        settings: Execution settings shared by all notebooks of the run
+
+    Returns:
+        Tuple of (notebook_rel_path, executed, exec_result); executed is
+        False when the notebook could not be run at all
+    """
+    notebook_path = settings.notebooks_dir / notebook_rel_path
+    notebook_name = notebook_path.stem
+    partition_dir = settings.partition_dir
+
+    # Generate output filename with the run timestamp
+    timestamp = settings.output_timestamp
+    output_filename = f"{notebook_name}_{timestamp}.ipynb"
+    output_path = partition_dir / output_filename
+
+    try:
+        _LOGGER.info(
+            "Executing notebook: %s -> %s", notebook_path, output_path
+        )
+
+        # Path for notebook to write timeseries_processed / timeseries_failed
+        output_results_path = partition_dir / f"{output_path.stem}_results.json"
+
+        # Execute notebook using papermill
+        result = _execute_with_papermill(
+            notebook_path, output_path, settings, output_results_path
+        )
+
+        if not result["success"]:
+            _LOGGER.error(
+                "Failed to execute notebook %s: %s",
+                notebook_rel_path,
+                result.get("error", "Unknown error"),
+            )
+            return notebook_rel_path, True, {
+                "status": "failed",
+                "error": result.get("error", "Unknown error"),
+            }
+
+        exec_result = {
+            "status": "success",
+            "output_path": str(output_path),
+            "execution_time": result.get("execution_time", 0),
+        }
+
+        # Generate HTML version (optional; skipped when nothing consumes it)
+        if settings.generate_html:
+            html_output_path = partition_dir / f"{notebook_name}_{timestamp}.html"
+            _convert_to_html(output_path, html_output_path)
+            exec_result["html_path"] = str(html_output_path)
+
+        # Add timeseries counts if notebook wrote results
+        if result.get("timeseries_processed") is not None:
+            exec_result["timeseries_processed"] = result["timeseries_processed"]
+        if result.get("timeseries_failed") is not None:
+            exec_result["timeseries_failed"] = result["timeseries_failed"]
+        _LOGGER.info(
+            "Successfully executed notebook: %s", notebook_rel_path
+        )
+        return notebook_rel_path, True, exec_result
+
+    except Exception as exc:
+        _LOGGER.error(
+            "Exception executing notebook %s: %s",
+            notebook_rel_path,
+            exc,
+            exc_info=True,
+        )
+        return notebook_rel_path, False, {"status": "failed", "error": str(exc)}
+
+def _execute_with_papermill(
+    input_path: Path,
+    output_path: Path,
+    settings: NotebookExecutionSettings,
+    output_results_path: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Execute notebook using papermill with injected parameters.
+
+    If output_results_path is set, the notebook may write a JSON file with
+    timeseries_processed and timeseries_failed; those are read and returned.
+    """
+    try:
+        if pm is None:
+            raise ImportError("papermill is not installed")
+
+        start_time = time.time()
+
+        # Run-wide parameters plus the per-notebook results path
+        notebook_parameters = {
+            **settings.base_parameters,
+            "output_results_path": str(output_results_path) if output_results_path else "",
+        }
+
+        if settings.reuse_kernel:
+            # Run on the long-lived kernel of this process (no per-notebook kernel start)
+            _execute_via_shared_kernel(
+                input_path, output_path, settings, notebook_parameters
+            )
+        else:
+            # Execute notebook with parameters
+            # Prepare execute_notebook arguments (nbclient Integer trait expects int, not float)
+            execute_kwargs = {
+                'input_path': str(input_path),
+                'output_path': os.path.abspath(output_path),  # papermill autosaves from inside cwd
+                'parameters': notebook_parameters,
+                'kernel_name': 'python3',  # Explicitly specify kernel to avoid "no kernel name" error
+                'log_output': settings.log_output,
+                'start_timeout': int(settings.papermill_start_timeout),  # Timeout for kernel startup (seconds)
+                'cwd': str(input_path.parent),  # Run in the notebook's directory so imports work correctly
+            }
+
+            # Add execution_timeout only if specified (None means no timeout)
+            if settings.papermill_execution_timeout is not None:
+                execute_kwargs['execution_timeout'] = int(settings.papermill_execution_timeout)
+
+            _LOGGER.info(
+                "Executing notebook with start_timeout=%ss, execution_timeout=%s",
+                settings.papermill_start_timeout,
+                "unlimited"
+                if settings.papermill_execution_timeout is None
+                else "%ss" % settings.papermill_execution_timeout,
+            )
+
+            if settings.log_output:
+                pm.execute_notebook(**execute_kwargs)
+            else:
+                # Stream notebook stdout/stderr to files next to the output
+                # instead of routing every message through logging
+                log_prefix = output_path.parent / output_path.stem
+                with open(f"{log_prefix}.stdout.log", "w", encoding="utf-8") as stdout_file, open(
+                    f"{log_prefix}.stderr.log", "w", encoding="utf-8"
+                ) as stderr_file:
+                    pm.execute_notebook(
+                        stdout_file=stdout_file, stderr_file=stderr_file, **execute_kwargs
+                    )
+
+        execution_time = time.time() - start_time
+
+        out = {
+            "success": True,
+            "execution_time": execution_time,
+        }
+        # Read notebook results file if present (timeseries_processed, timeseries_failed)
+        if output_results_path:
+            try:
+                data = _json_loads(output_results_path.read_bytes())
+                out["timeseries_processed"] = data.get("timeseries_processed")
+                out["timeseries_failed"] = data.get("timeseries_failed")
+            except FileNotFoundError:
+                pass
+            except Exception as read_err:
+                _LOGGER.debug(
+                    "Could not read notebook results file %s: %s",
+                    output_results_path,
+                    read_err,
+                )
+        return out
+
+    except ImportError:
+        _LOGGER.error("papermill not installed")
+        return {
+            "success": False,
+            "error": "papermill not installed",
+        }
+    except Exception as exc:
+        _LOGGER.error("Papermill execution failed: %s", exc)
+        return {
+            "success": False,
+            "error": str(exc),
+        }
+
+def _execute_via_shared_kernel(
+    input_path: Path,
+    output_path: Path,
+    settings: NotebookExecutionSettings,
+    parameters: Dict[str, Any],
+) -> None:
+    """Execute a notebook on the process-wide kernel with injected parameters.
+
+    Parameters are injected the same way papermill does it; the executed
+    notebook is written to output_path even if a cell fails, and the
+    kernel namespace is reset afterwards. The reset does not undo state kept
+    in imported modules (caches, patched globals, threads), which is why
+    this path is opt-in via ``reuse_kernel``.
+
+    Args:
+        input_path: Source notebook
+        output_path: Where to write the executed notebook
+        settings: Execution settings (timeouts)
+        parameters: Parameters to inject into the notebook
+    """
+    km = _get_or_start_kernel(input_path.parent, int(settings.papermill_start_timeout))
+
+    nb = nbformat.read(str(input_path), as_version=4)
+    nb = parameterize_notebook(nb, parameters, kernel_name="python3", language="python")
+
+    client = NotebookClient(
+        nb,
+        km=km,
+        kernel_name="python3",
+        timeout=settings.papermill_execution_timeout,
+        startup_timeout=int(settings.papermill_start_timeout),
+        resources={"metadata": {"path": str(input_path.parent)}},
+    )
+    try:
+        client.execute()
+    finally:
+        # Serialize once and hand the bytes to a large buffer; avoids many
+        # small writes on network-mounted output directories
+        with open(output_path, "wb", buffering=OUTPUT_WRITE_BUFFER_BYTES) as f:
+            f.write(nbformat.writes(nb).encode("utf-8"))
+        _reset_kernel(km)
+
+def _reset_kernel(km: Any) -> None:
+    """Clear the user namespace of a shared kernel between notebooks."""
+    if not km.is_alive():
+        return
+    kc = km.client()
+    kc.start_channels()
+    try:
+        kc.wait_for_ready(timeout=60)
+        kc.execute_interactive("%reset -f", timeout=60)
+    except Exception as exc:
+        _LOGGER.warning("Failed to reset shared kernel, restarting it: %s", exc)
+        _shutdown_shared_kernel()
+    finally:
+        kc.stop_channels()
+
+def _convert_to_html(notebook_path: Path, html_path: Path) -> None:
+    """Convert executed notebook to HTML using nbconvert."""
+    try:
+        html_exporter = _get_html_exporter()
+
+        # Read and export in one pass using the cached classic-template exporter
+        (body, resources) = html_exporter.from_filename(str(notebook_path))
+
+        # Write HTML file (encode once, large buffer for plot-heavy notebooks)
+        with open(html_path, "wb", buffering=1 << 20) as f:
+            f.write(body.encode("utf-8"))
+
+        _LOGGER.debug("Generated HTML version: %s", html_path)
+
+    except ImportError as exc:
+        _LOGGER.warning(
+            "nbconvert not available, skipping HTML generation: %s", exc
+        )
+    except Exception as exc:
+        _LOGGER.warning(
+            "Failed to convert notebook to HTML: %s", exc, exc_info=True
+        )
 
 
 @dataclass
@@ -45,6 +447,11 @@ class MetricsForecastNotebooksState(BaseJobState):
     papermill_start_timeout: int = 300  # Timeout for kernel startup (seconds); nbclient Integer trait expects int
     papermill_execution_timeout: Optional[int] = None  # Timeout for cell execution (None = no timeout); nbclient Integer trait expects int
     config_path: str = ""  # Path to YAML config file; passed to notebook so it can call create_database_connection(..., config_path=...)
+    max_parallel_notebooks: int = 1  # Number of notebooks executed concurrently (worker processes)
+    reuse_kernel: bool = False  # Opt-in: execute notebooks on one long-lived kernel per process instead of one kernel each
+    log_output: bool = False  # Forward notebook output to the job log (papermill path) instead of per-notebook log files
+    generate_html: bool = True  # Render an HTML twin of every executed notebook (served by the notebooks UI)
+    partition_dir: Optional[Path] = None  # Output partition (YYYY/MM/DD) for current_business_date; set on first use
 
     def to_results(self) -> Dict[str, Any]:
         """Extend base results with notebook execution metadata."""
@@ -101,6 +508,12 @@ class MetricsForecastNotebooksJob(BaseJob):
             papermill_start_timeout = int(_start) if _start is not None else 300
             papermill_execution_timeout = int(_exec) if _exec is not None else None
 
+            # Notebooks are independent; run several at once in worker processes
+            max_parallel_notebooks = max(
+                1,
+                int(job_config.get("max_parallel_notebooks", (os.cpu_count() or 2) // 2)),
+            )
+
             # Get Victoria Metrics and database config for notebook parameters
             victoria_metrics_cfg = job_config.get("victoria_metrics", {})
             database_cfg = job_config.get("database") or job_config.get("forecast_database", {})
@@ -120,12 +533,17 @@ class MetricsForecastNotebooksJob(BaseJob):
                 papermill_start_timeout=papermill_start_timeout,
                 papermill_execution_timeout=papermill_execution_timeout,
                 config_path=config_path or "",
+                max_parallel_notebooks=max_parallel_notebooks,
+                reuse_kernel=bool(job_config.get("reuse_kernel", False)),
+                log_output=bool(job_config.get("log_output", False)),
+                generate_html=bool(job_config.get("generate_html", True)),
             )
 
             self.logger.info(
                 "Initialized metrics_forecast_notebooks job. "
-                f"Notebooks directory: {notebooks_dir_path}, "
-                f"Output directory: {notebooks_output_dir_path}"
+                "Notebooks directory: %s, Output directory: %s",
+                notebooks_dir_path,
+                notebooks_output_dir_path,
             )
 
             return Ok(state)
@@ -142,6 +560,7 @@ class MetricsForecastNotebooksJob(BaseJob):
     def finalize_state(
         self, state: MetricsForecastNotebooksState
     ) -> MetricsForecastNotebooksState:
+        _shutdown_shared_kernel()
         state.completed_at = datetime.now()
 
         if state.notebooks_failed > 0 and state.notebooks_succeeded == 0:
@@ -170,20 +589,11 @@ class MetricsForecastNotebooksJob(BaseJob):
         """Determine the current business date for partitioning outputs."""
         try:
             cutoff_hour = int(state.job_config.get("cutoff_hour", 6))
-            now = datetime.utcnow()
-
-            if now.weekday() >= 5 or now.hour < cutoff_hour:
-                # roll back to previous business day
-                days_back = 1
-                if now.weekday() == 5:  # Saturday -> Friday
-                    days_back = 1
-                elif now.weekday() == 6:  # Sunday -> Friday
-                    days_back = 2
-                elif now.hour < cutoff_hour and now.weekday() == 0:
-                    days_back = 3  # Monday before cutoff -> Friday
-                state.current_business_date = (now - timedelta(days=days_back)).date()
-            else:
-                state.current_business_date = now.date()
+            now = datetime.now(timezone.utc)
+
+            # roll back to previous business day on weekends and before the cutoff
+            days_back = _DAYS_BACK.get((now.weekday(), now.hour < cutoff_hour), 0)
+            state.current_business_date = (now - timedelta(days=days_back)).date()
 
             self.logger.info("Current business date: %s", state.current_business_date)
             return Ok(state)
@@ -203,11 +613,14 @@ class MetricsForecastNotebooksJob(BaseJob):
                 return Ok(state)
 
             # Find all .ipynb files (but exclude files starting with . or _)
-            notebooks = [
-                str(nb.relative_to(state.notebooks_dir))
-                for nb in state.notebooks_dir.glob("*.ipynb")
-                if not nb.name.startswith(".") and not nb.name.startswith("_")
-            ]
+            with os.scandir(state.notebooks_dir) as entries:
+                notebooks = [
+                    entry.name
+                    for entry in entries
+                    if entry.name.endswith(".ipynb")
+                    and not entry.name.startswith((".", "_"))
+                    and entry.is_file(follow_symlinks=False)
+                ]
 
             state.notebooks_found = sorted(notebooks)
             self.logger.info(
@@ -224,100 +637,129 @@ class MetricsForecastNotebooksJob(BaseJob):
     def _execute_notebooks(
         self, state: MetricsForecastNotebooksState
     ) -> Result[MetricsForecastNotebooksState, Exception]:
-        """Execute each discovered notebook using papermill."""
+        """Execute discovered notebooks using papermill, several at a time.
+
+        Notebooks are independent, so up to ``max_parallel_notebooks`` run
+        concurrently in worker processes; results are aggregated into the
+        state on the main process as they complete.
+        """
         try:
             if not state.notebooks_found:
                 self.logger.info("No notebooks to execute")
                 return Ok(state)
 
-            # Get partition path for output (using same structure as notebooks)
-            business_date_str = state.current_business_date.isoformat()
-            notebooks_manager = NotebooksFileManager(
-                notebooks_dir=str(state.notebooks_output_dir),
-                archive_dir=None,
-                enable_archive=False,
+            # Partition path for output: notebooks_output_dir/YYYY/MM/DD (same
+            # layout NotebooksFileManager serves), resolved once per run
+            partition_dir = state.partition_dir
+            if partition_dir is None:
+                business_date = state.current_business_date
+                partition_dir = (
+                    state.notebooks_output_dir
+                    / str(business_date.year)
+                    / f"{business_date.month:02d}"
+                    / f"{business_date.day:02d}"
+                )
+                partition_dir.mkdir(parents=True, exist_ok=True)
+                state.partition_dir = partition_dir
+
+            # One timestamp for every output of this run; notebook names are
+            # unique within the directory, so output filenames cannot collide
+            output_timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+
+            settings = NotebookExecutionSettings(
+                notebooks_dir=state.notebooks_dir,
+                partition_dir=partition_dir,
+                output_timestamp=output_timestamp,
+                base_parameters=self._build_base_parameters(state),
+                papermill_start_timeout=state.papermill_start_timeout,
+                papermill_execution_timeout=state.papermill_execution_timeout,
+                reuse_kernel=state.reuse_kernel,
+                log_output=state.log_output,
+                generate_html=state.generate_html,
             )
-            partition_dir = notebooks_manager._get_partition_path(business_date_str)
-
-            # Execute each notebook
-            for notebook_rel_path in state.notebooks_found:
-                notebook_path = state.notebooks_dir / notebook_rel_path
-                notebook_name = notebook_path.stem
 
-                # Generate output filename with timestamp
-                timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-                output_filename = f"{notebook_name}_{timestamp}.ipynb"
-                output_path = partition_dir / output_filename
-
-                try:
-                    self.logger.info(
-                        "Executing notebook: %s -> %s", notebook_path, output_path
-                    )
-
-                    # Path for notebook to write timeseries_processed / timeseries_failed
-                    output_results_path = partition_dir / f"{output_path.stem}_results.json"
-
-                    # Execute notebook using papermill
-                    result = self._execute_with_papermill(
-                        notebook_path, output_path, state, output_results_path
-                    )
+            max_workers = min(state.max_parallel_notebooks, len(state.notebooks_found))
+            if max_workers <= 1:
+                results = [
+                    _execute_notebook(notebook_rel_path, settings)
+                    for notebook_rel_path in state.notebooks_found
+                ]
+                self._record_notebook_results(state, results)
+                return Ok(state)
 
-                    if result["success"]:
-                        # Generate HTML version
-                        html_output_path = partition_dir / f"{notebook_name}_{timestamp}.html"
-                        self._convert_to_html(output_path, html_output_path)
-
-                        state.notebooks_succeeded += 1
-                        exec_result = {
-                            "status": "success",
-                            "output_path": str(output_path),
-                            "html_path": str(html_output_path),
-                            "execution_time": result.get("execution_time", 0),
-                        }
-                        # Add timeseries counts if notebook wrote results
-                        if result.get("timeseries_processed") is not None:
-                            exec_result["timeseries_processed"] = result["timeseries_processed"]
-                            state.timeseries_processed += result["timeseries_processed"]
-                        if result.get("timeseries_failed") is not None:
-                            exec_result["timeseries_failed"] = result["timeseries_failed"]
-                            state.timeseries_failed += result["timeseries_failed"]
-                        state.execution_results[notebook_rel_path] = exec_result
-                        self.logger.info(
-                            "Successfully executed notebook: %s", notebook_rel_path
+            self.logger.info(
+                "Executing %s notebook(s) with %s worker process(es)",
+                len(state.notebooks_found),
+                max_workers,
+            )
+            results = []
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = {
+                    pool.submit(_execute_notebook, notebook_rel_path, settings): notebook_rel_path
+                    for notebook_rel_path in state.notebooks_found
+                }
+                for future in as_completed(futures):
+                    notebook_rel_path = futures[future]
+                    try:
+                        results.append(future.result())
+                    except Exception as exc:
+                        results.append(
+                            (notebook_rel_path, False, {"status": "failed", "error": str(exc)})
                         )
-                    else:
-                        state.notebooks_failed += 1
-                        state.execution_results[notebook_rel_path] = {
-                            "status": "failed",
-                            "error": result.get("error", "Unknown error"),
-                        }
                         self.logger.error(
-                            "Failed to execute notebook %s: %s",
-                            notebook_rel_path,
-                            result.get("error", "Unknown error"),
+                            "Worker failed for notebook %s: %s", notebook_rel_path, exc
                         )
 
-                    state.notebooks_executed += 1
-
-                except Exception as exc:
-                    state.notebooks_failed += 1
-                    state.execution_results[notebook_rel_path] = {
-                        "status": "failed",
-                        "error": str(exc),
-                    }
-                    self.logger.error(
-                        "Exception executing notebook %s: %s",
-                        notebook_rel_path,
-                        exc,
-                        exc_info=True,
-                    )
-
+            self._record_notebook_results(state, results)
             return Ok(state)
 
         except Exception as exc:
             self.logger.error("Failed to execute notebooks: %s", exc)
             return Err(exc)
 
+    def _record_notebook_results(
+        self,
+        state: MetricsForecastNotebooksState,
+        results: List[Tuple[str, bool, Dict[str, Any]]],
+    ) -> None:
+        """Fold all notebook results into the job state in one pass.
+
+        Args:
+            state: Job state to update
+            results: (notebook_rel_path, executed, exec_result) per notebook
+        """
+        succeeded = [r for _, _, r in results if r.get("status") == "success"]
+        state.notebooks_succeeded += len(succeeded)
+        state.notebooks_failed += len(results) - len(succeeded)
+        state.notebooks_executed += sum(1 for _, executed, _ in results if executed)
+        state.timeseries_processed += sum(r.get("timeseries_processed", 0) for r in succeeded)
+        state.timeseries_failed += sum(r.get("timeseries_failed", 0) for r in succeeded)
+        state.execution_results.update(
+            (notebook_rel_path, exec_result) for notebook_rel_path, _, exec_result in results
+        )
+
+    def _build_base_parameters(self, state: MetricsForecastNotebooksState) -> Dict[str, Any]:
+        """Build the notebook parameters shared by every notebook of a run.
+
+        All parameters defined in the notebook's parameters cell must be
+        passed to avoid papermill warnings about unknown parameters; only
+        output_results_path is added per notebook.
+
+        Args:
+            state: Job state
+
+        Returns:
+            Parameters dictionary without output_results_path
+        """
+        return {
+            "vm_query_url": state.vm_query_url,
+            "vm_token": state.vm_token,
+            "vm_jobs_environment": os.getenv('VM_JOBS_ENVIRONMENT', ''),
+            # Passed so the notebook can call create_database_connection(..., config_path=...)
+            "vm_jobs_config_path": state.config_path or "",
+            "dry_run": False,  # Default to False for production runs
+        }
+
     def _build_database_connection_string(self, db_config: Dict[str, Any]) -> str:
         """Build PostgreSQL connection string from config.
         
@@ -327,8 +769,6 @@ class MetricsForecastNotebooksJob(BaseJob):
         Returns:
             PostgreSQL connection string
         """
-        from urllib.parse import quote_plus
-        
         host = db_config.get("host", "localhost")
         port = db_config.get("port", 5432)
         dbname = db_config.get("name", "forecasts_db")
@@ -337,156 +777,16 @@ class MetricsForecastNotebooksJob(BaseJob):
         sslmode = db_config.get("ssl_mode", "prefer")
         connect_timeout = db_config.get("connection_timeout", 10)
         
-        # URL-encode password to handle special characters
-        if password:
-            password = quote_plus(password)
-        
+        # Percent-encode user, password and database name so characters such as
+        # "@", ":" or "/" cannot break the URL (libpq does not decode "+" as space)
         connection_string = (
-            f"postgresql://{user}:{password}@{host}:{port}/{dbname}"
+            f"postgresql://{quote(str(user), safe='')}:{quote(str(password), safe='')}"
+            f"@{host}:{port}/{quote(str(dbname), safe='')}"
             f"?sslmode={sslmode}&connect_timeout={connect_timeout}"
         )
         
         return connection_string
 
-    def _execute_with_papermill(
-        self,
-        input_path: Path,
-        output_path: Path,
-        state: MetricsForecastNotebooksState,
-        output_results_path: Optional[Path] = None,
-    ) -> Dict[str, Any]:
-        """Execute notebook using papermill with injected parameters.
-        
-        If output_results_path is set, the notebook may write a JSON file with
-        timeseries_processed and timeseries_failed; those are read and returned.
-        """
-        try:
-            import papermill as pm
-            import time
-            import json
-
-            start_time = time.time()
-
-            # Get environment from job config or environment variable
-            environment = os.getenv('VM_JOBS_ENVIRONMENT', '')
-            
-            # Prepare parameters to inject into notebook
-            # Note: All parameters defined in the notebook's parameters cell must be passed
-            # to avoid papermill warnings about unknown parameters
-            # vm_jobs_config_path: passed so notebook can call create_database_connection(..., config_path=...)
-            notebook_parameters = {
-                "vm_query_url": state.vm_query_url,
-                "vm_token": state.vm_token,
-                "vm_jobs_environment": environment,
-                "vm_jobs_config_path": state.config_path or "",
-                "dry_run": False,  # Default to False for production runs
-                "output_results_path": str(output_results_path) if output_results_path else "",
-            }
-
-            # Execute notebook with parameters
-            # Set working directory to the notebook's directory so imports work correctly
-            notebooks_dir = input_path.parent
-            original_cwd = os.getcwd()
-            try:
-                os.chdir(str(notebooks_dir))
-                # Execute notebook with parameters
-                # Note: Papermill 2.6.0+ may show warnings about "unknown parameters" even when
-                # parameters are correctly defined. These are typically warnings, not errors.
-                # The parameters are still injected correctly into the notebook.
-                import warnings
-                with warnings.catch_warnings():
-                    # Suppress papermill parameter warnings if they occur
-                    warnings.filterwarnings('ignore', message='.*unknown.*parameter.*', category=UserWarning)
-                    
-                    # Prepare execute_notebook arguments (nbclient Integer trait expects int, not float)
-                    execute_kwargs = {
-                        'input_path': str(input_path),
-                        'output_path': str(output_path),
-                        'parameters': notebook_parameters,
-                        'kernel_name': 'python3',  # Explicitly specify kernel to avoid "no kernel name" error
-                        'log_output': True,
-                        'stdout_file': None,  # Don't capture stdout
-                        'stderr_file': None,  # Don't capture stderr
-                        'start_timeout': int(state.papermill_start_timeout),  # Timeout for kernel startup (seconds)
-                    }
-                    
-                    # Add execution_timeout only if specified (None means no timeout)
-                    if state.papermill_execution_timeout is not None:
-                        execute_kwargs['execution_timeout'] = int(state.papermill_execution_timeout)
-                    
-                    self.logger.info(
-                        f"Executing notebook with start_timeout={state.papermill_start_timeout}s, "
-                        f"execution_timeout={'unlimited' if state.papermill_execution_timeout is None else f'{state.papermill_execution_timeout}s'}"
-                    )
-                    
-                    pm.execute_notebook(**execute_kwargs)
-            finally:
-                # Restore original working directory
-                os.chdir(original_cwd)
-
-            execution_time = time.time() - start_time
-
-            out = {
-                "success": True,
-                "execution_time": execution_time,
-            }
-            # Read notebook results file if present (timeseries_processed, timeseries_failed)
-            if output_results_path and output_results_path.exists():
-                try:
-                    with open(output_results_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    out["timeseries_processed"] = data.get("timeseries_processed")
-                    out["timeseries_failed"] = data.get("timeseries_failed")
-                except Exception as read_err:
-                    self.logger.debug(
-                        "Could not read notebook results file %s: %s",
-                        output_results_path,
-                        read_err,
-                    )
-            return out
-
-        except ImportError:
-            self.logger.error("papermill not installed")
-            return {
-                "success": False,
-                "error": "papermill not installed",
-            }
-        except Exception as exc:
-            self.logger.error("Papermill execution failed: %s", exc)
-            return {
-                "success": False,
-                "error": str(exc),
-            }
-
-    def _convert_to_html(self, notebook_path: Path, html_path: Path) -> None:
-        """Convert executed notebook to HTML using nbconvert."""
-        try:
-            from nbconvert import HTMLExporter
-            import nbformat
-
-            # Read the executed notebook
-            with open(notebook_path, "r", encoding="utf-8") as f:
-                notebook_content = nbformat.read(f, as_version=4)
-
-            # Export to HTML using classic template
-            html_exporter = HTMLExporter(template_name="classic")
-            (body, resources) = html_exporter.from_notebook_node(notebook_content)
-
-            # Write HTML file
-            with open(html_path, "w", encoding="utf-8") as f:
-                f.write(body)
-
-            self.logger.debug("Generated HTML version: %s", html_path)
-
-        except ImportError as exc:
-            self.logger.warning(
-                "nbconvert not available, skipping HTML generation: %s", exc
-            )
-        except Exception as exc:
-            self.logger.warning(
-                "Failed to convert notebook to HTML: %s", exc, exc_info=True
-            )
-
 
 def main():
     """CLI entry point."""
@@ -6,49 +6,336 @@ the metrics_forecast job, allowing notebooks to save forecasts to the database
 without duplicating code.
 """
 
+import csv
+import io
 import json
+import math
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 from datetime import date, datetime, timezone
 from urllib.parse import quote_plus
+from weakref import WeakKeyDictionary, WeakSet
 
-import numpy as np
-import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.util import LRUCache
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib json module
+    orjson = None
+
+try:
+    from psycopg2.extras import execute_values
+except ImportError:  # optional; other drivers use executemany()
+    execute_values = None
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Add the scheduler module to the path for imports
 # This allows notebooks to use ConfigLoader
 # Find project root: look for directory containing victoria_metrics_jobs/
-_helper_dir = Path(__file__).parent.resolve()
-_project_root = None
-
-# Try current working directory first (most reliable for notebooks)
-_cwd = Path.cwd()
-if (_cwd / 'victoria_metrics_jobs').exists():
-    _project_root = _cwd
-else:
-    # Walk up from helper directory to find project root
-    _current = _helper_dir
-    for _ in range(6):  # Max 6 levels up
-        if (_current / 'victoria_metrics_jobs').exists():
-            _project_root = _current
-            break
-        _current = _current.parent
-        if _current == _current.parent:  # Reached filesystem root
-            break
-
-if _project_root and str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
+@lru_cache(maxsize=1)
+def _discover_project_root() -> Optional[Path]:
+    """Return the directory containing victoria_metrics_jobs/, or None.
+
+    Cached, so the filesystem is probed at most once per interpreter.
+    """
+    project_root = None
+    # Try current working directory first (most reliable for notebooks)
+    cwd = Path.cwd()
+    if (cwd / 'victoria_metrics_jobs').exists():
+        project_root = cwd
+    else:
+        # Walk up from helper directory to find project root
+        current = Path(__file__).parent.resolve()
+        for _ in range(6):  # Max 6 levels up
+            if (current / 'victoria_metrics_jobs').exists():
+                project_root = current
+                break
+            current = current.parent
+            if current == current.parent:  # Reached filesystem root
+                break
+
+    return project_root
+
+
+if 'victoria_metrics_jobs' not in sys.modules:
+    _project_root = _discover_project_root()
+    if _project_root and str(_project_root) not in sys.path:
+        sys.path.insert(0, str(_project_root))
 
 from victoria_metrics_jobs.scheduler.config import ConfigLoader
 
 
+# Forecast rows can be recomputed from the model, so their transactions
+# commit without waiting for the WAL flush (a crash may lose the last few
+# writes, never corrupt them). VM_JOBS_FORECAST_SYNC_COMMIT=1 turns this off.
+_ASYNC_FORECAST_COMMIT = os.environ.get("VM_JOBS_FORECAST_SYNC_COMMIT") != "1"
+
+# System labels that are not part of a forecast series' metric_labels
+_EXCLUDED_LABELS = frozenset({"job", "auid", "biz_date", "forecast"})
+
+# Retries of the find-or-insert metric_id statement when it loses a race
+_METRIC_ID_ALLOCATION_ATTEMPTS = 5
+
+# vm_metric_data rows per COPY / executemany batch (VM_JOBS_COPY_BATCH_ROWS);
+# batches above COPY_THRESHOLD_ROWS are loaded through COPY when the driver supports it
+COPY_BATCH_ROWS = max(1, int(os.environ.get("VM_JOBS_COPY_BATCH_ROWS", "10000")))
+COPY_THRESHOLD_ROWS = 500
+
+# Compiled SQL shared by every engine built in _get_engine (the cache key
+# includes the dialect). Bounded like SQLAlchemy's own per-engine cache so
+# ad-hoc statements issued on these engines cannot grow it without limit.
+_COMPILED_CACHE: LRUCache = LRUCache(500)
+
+# Engines handed out by _get_engine (weak, so lru_cache eviction frees them)
+_ENGINES: "WeakSet[Engine]" = WeakSet()
+
+# Per-connection job_id -> job_idx mapping; entries go away with the connection
+_JOB_IDX_CACHE: "WeakKeyDictionary[Any, Dict[str, int]]" = WeakKeyDictionary()
+
+# Per-engine (process-wide) job_id -> job_idx mapping, filled from the
+# per-connection caches when their transaction commits
+_COMMITTED_JOB_IDX: "WeakKeyDictionary[Engine, Dict[str, int]]" = WeakKeyDictionary()
+
+# SQL statements are built once at import time and reused for every call
+_SELECT_JOB_IDX_SQL = text("""
+    SELECT DISTINCT job_idx
+    FROM public.vm_metric_metadata
+    WHERE job_id = :job_id
+    LIMIT 1
+""")
+
+_FIND_OR_INSERT_METRIC_ID_SQL = text("""
+    WITH existing AS (
+        SELECT metric_id
+        FROM public.vm_metric_metadata
+        WHERE job_idx = :job_idx
+          AND job_id = :job_id
+          AND metric_name = :metric_name
+          AND metric_labels = CAST(:metric_labels AS jsonb)
+        LIMIT 1
+    ),
+    inserted AS (
+        INSERT INTO public.vm_metric_metadata (
+            job_idx, metric_id, job_id, metric_name, metric_labels
+        )
+        SELECT
+            :job_idx, next_id.metric_id, :job_id, :metric_name,
+            CAST(:metric_labels AS jsonb)
+        FROM (
+            SELECT COALESCE(MAX(metric_id), 0) + 1 AS metric_id
+            FROM public.vm_metric_metadata
+            WHERE job_idx = :job_idx
+        ) AS next_id
+        WHERE NOT EXISTS (SELECT 1 FROM existing)
+        ON CONFLICT DO NOTHING
+        RETURNING metric_id
+    )
+    SELECT metric_id FROM existing
+    UNION ALL
+    SELECT metric_id FROM inserted
+""")
+
+# Existing metric_ids for several label sets of one metric in one round-trip;
+# returns the label JSON as passed in, so callers can map rows back
+_SELECT_METRIC_IDS_SQL = text("""
+    SELECT wanted.metric_labels, m.metric_id
+    FROM unnest(CAST(:metric_labels AS text[])) AS wanted(metric_labels)
+    JOIN public.vm_metric_metadata AS m
+      ON m.metric_labels = CAST(wanted.metric_labels AS jsonb)
+    WHERE m.job_idx = :job_idx
+      AND m.job_id = :job_id
+      AND m.metric_name = :metric_name
+""")
+
+_FIND_OR_INSERT_SERIES_SQL = text("""
+    WITH job AS (
+        SELECT job_idx
+        FROM public.vm_metric_metadata
+        WHERE job_id = :job_id
+        LIMIT 1
+    ),
+    existing AS (
+        SELECT m.job_idx, m.metric_id
+        FROM public.vm_metric_metadata AS m
+        JOIN job ON m.job_idx = job.job_idx
+        WHERE m.job_id = :job_id
+          AND m.metric_name = :metric_name
+          AND m.metric_labels = CAST(:metric_labels AS jsonb)
+        LIMIT 1
+    ),
+    inserted AS (
+        INSERT INTO public.vm_metric_metadata (
+            job_idx, metric_id, job_id, metric_name, metric_labels
+        )
+        SELECT
+            COALESCE(
+                job.job_idx,
+                nextval(pg_get_serial_sequence('public.vm_metric_metadata', 'job_idx'))
+            ),
+            COALESCE(
+                (SELECT MAX(metric_id) FROM public.vm_metric_metadata WHERE job_idx = job.job_idx),
+                0
+            ) + 1,
+            :job_id, :metric_name, CAST(:metric_labels AS jsonb)
+        FROM (SELECT 1) AS one
+        LEFT JOIN job ON TRUE
+        WHERE NOT EXISTS (SELECT 1 FROM existing)
+        ON CONFLICT DO NOTHING
+        RETURNING job_idx, metric_id
+    )
+    SELECT job_idx, metric_id FROM existing
+    UNION ALL
+    SELECT job_idx, metric_id FROM inserted
+""")
+
+_INSERT_FIRST_METRIC_METADATA_SQL = text("""
+    INSERT INTO public.vm_metric_metadata (
+        job_idx, metric_id, job_id, metric_name, metric_labels
+    )
+    VALUES (
+        DEFAULT, 1, :job_id, :metric_name, CAST(:metric_labels AS jsonb)
+    )
+    RETURNING job_idx, metric_id
+""")
+
+_INSERT_FORECAST_RUN_SQL = text("""
+    INSERT INTO public.vm_forecast_job (
+        job_id,
+        selection_value,
+        prophet_config,
+        prophet_fit_config,
+        config_source,
+        history_days,
+        forecast_horizon_days,
+        min_history_points,
+        business_date,
+        started_at,
+        status
+    )
+    VALUES (
+        :job_id,
+        :selection_value,
+        CAST(:prophet_config AS jsonb),
+        CAST(:prophet_fit_config AS jsonb),
+        :config_source,
+        :history_days,
+        :forecast_horizon_days,
+        :min_history_points,
+        :business_date,
+        :started_at,
+        :status
+    )
+    RETURNING run_id
+""")
+
+_FORECAST_METADATA_TABLE_EXISTS_SQL = text("""
+    SELECT 1 FROM information_schema.tables
+    WHERE table_schema = 'public' AND table_name = 'vm_metrics_forecast_metadata'
+    LIMIT 1
+""")
+
+_UPSERT_FORECAST_METADATA_SQL = text("""
+    INSERT INTO public.vm_metrics_forecast_metadata (
+        job_idx, metric_id, run_id, metadata
+    )
+    VALUES (
+        :job_idx, :metric_id, :run_id, CAST(:metadata AS jsonb)
+    )
+    ON CONFLICT (job_idx, metric_id, run_id)
+    DO UPDATE SET metadata = EXCLUDED.metadata
+""")
+
+_UPSERT_METRIC_DATA_SQL = text("""
+    INSERT INTO public.vm_metric_data (
+        job_idx, metric_id, metric_timestamp, metric_value, run_id
+    )
+    VALUES (
+        :job_idx, :metric_id, :metric_timestamp, :metric_value, :run_id
+    )
+    ON CONFLICT (job_idx, metric_id, metric_timestamp)
+    DO UPDATE SET
+        metric_value = EXCLUDED.metric_value,
+        run_id = EXCLUDED.run_id
+""")
+
+_CREATE_STAGE_TABLE_SQL = text("""
+    CREATE TEMP TABLE IF NOT EXISTS vm_metric_data_stage (
+        job_idx BIGINT NOT NULL,
+        metric_id INT NOT NULL,
+        metric_timestamp TIMESTAMPTZ NOT NULL,
+        metric_value DOUBLE PRECISION NOT NULL,
+        run_id BIGINT
+    ) ON COMMIT DROP
+""")
+
+_MERGE_STAGE_TABLE_SQL = text("""
+    INSERT INTO public.vm_metric_data (
+        job_idx, metric_id, metric_timestamp, metric_value, run_id
+    )
+    SELECT job_idx, metric_id, metric_timestamp, metric_value, run_id
+    FROM vm_metric_data_stage
+    ON CONFLICT (job_idx, metric_id, metric_timestamp)
+    DO UPDATE SET
+        metric_value = EXCLUDED.metric_value,
+        run_id = EXCLUDED.run_id
+""")
+
+_TRUNCATE_STAGE_TABLE_SQL = text("TRUNCATE vm_metric_data_stage")
+
+# Transaction-scoped: reverts when the forecast write transaction ends
+_SET_ASYNC_COMMIT_SQL = text("SET LOCAL synchronous_commit = off")
+
+# vm_metric_data row tuples are (job_idx, metric_id, metric_timestamp, metric_value, run_id)
+_METRIC_DATA_COLUMNS = ("job_idx", "metric_id", "metric_timestamp", "metric_value", "run_id")
+
+# psycopg2 execute_values() template: one multi-row VALUES statement per page
+_UPSERT_METRIC_DATA_VALUES_SQL = """
+    INSERT INTO public.vm_metric_data (
+        job_idx, metric_id, metric_timestamp, metric_value, run_id
+    )
+    VALUES %s
+    ON CONFLICT (job_idx, metric_id, metric_timestamp)
+    DO UPDATE SET
+        metric_value = EXCLUDED.metric_value,
+        run_id = EXCLUDED.run_id
+"""
+
+
+@lru_cache(maxsize=1)
+def _serializer_dispatch() -> Dict[type, Callable[[Any], Any]]:
+    """Exact-type converters for the values _json_serializer sees most often."""
+    import numpy as np
+
+    return {
+        np.float64: float,
+        np.float32: float,
+        np.int64: int,
+        np.int32: int,
+        np.bool_: bool,
+        np.ndarray: np.ndarray.tolist,
+        datetime: datetime.isoformat,
+        date: date.isoformat,
+    }
+
+
 def _json_serializer(obj: Any) -> Any:
     """Convert date/datetime and other non-JSON types for json.dumps."""
+    # Fast path: one dict lookup on the exact type; subclasses (e.g. pandas
+    # Timestamp) and other numpy widths fall through to the isinstance checks
+    convert = _serializer_dispatch().get(type(obj))
+    if convert is not None:
+        return convert(obj)
+
+    import numpy as np
+
     if isinstance(obj, (date, datetime)):
         return obj.isoformat()
     if isinstance(obj, (np.integer, np.floating)):
@@ -62,14 +349,32 @@ def _json_serializer(obj: Any) -> Any:
 
 def _json_serializer_for_metadata(obj: Any) -> Any:
     """JSON serializer for forecast metadata; handles NaN/inf and uses _json_serializer for rest."""
+    import numpy as np
+
     try:
-        if isinstance(obj, (float, np.floating)) and (np.isnan(obj) or np.isinf(obj)):
+        if isinstance(obj, (float, np.floating)) and not math.isfinite(obj):
             return None
     except (TypeError, ValueError):
         pass
     return _json_serializer(obj)
 
 
+def _dumps(obj: Any, default: Any = _json_serializer) -> str:
+    """Serialize to a JSON string, using orjson when it is installed.
+
+    orjson handles numpy scalars/arrays and datetimes natively (default is
+    only called for other types) and writes NaN/inf as null; the json
+    fallback keeps the previous behaviour.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        ).decode("utf-8")
+    return json.dumps(obj, default=default)
+
+
 def load_database_config_from_yaml(
     config_path: Optional[str] = None,
     environment: Optional[str] = None
@@ -111,9 +416,9 @@ def load_database_config_from_yaml(
     if not os.path.exists(config_path):
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
     
-    # Load configuration using ConfigLoader
-    config_loader = ConfigLoader()
-    env_config = config_loader.load(config_path, environment=environment)
+    # Load configuration using ConfigLoader; it caches per file version and
+    # environment variables, and the read-only view avoids a deep copy
+    env_config = ConfigLoader().load(config_path, environment=environment, mutable=False)
     
     # Extract database configuration
     database_config = env_config.get('database', {})
@@ -169,13 +474,19 @@ def build_database_connection_string(
         return connection_string
     
     # Build from components with defaults
-    host = host or "localhost"
-    port = port or 5432
-    dbname = dbname or "forecasts_db"
-    user = user or "forecast_user"
-    password = password or ""
-    ssl_mode = ssl_mode or "prefer"
-    
+    return _build_dsn(
+        host or "localhost",
+        port or 5432,
+        dbname or "forecasts_db",
+        user or "forecast_user",
+        password or "",
+        ssl_mode or "prefer",
+    )
+
+
+@lru_cache(maxsize=64)
+def _build_dsn(host: str, port: int, dbname: str, user: str, password: str, ssl_mode: str) -> str:
+    """Format the connection URL; memoized since notebooks reuse the same few DSNs."""
     # URL-encode password to handle special characters
     if password:
         password = quote_plus(password)
@@ -183,6 +494,39 @@ def build_database_connection_string(
     return f"postgresql://{user}:{password}@{host}:{port}/{dbname}?sslmode={ssl_mode}"
 
 
+@lru_cache(maxsize=8)
+def _get_engine(conn_str: str) -> Engine:
+    """Return the process-wide engine (connection pool) for a connection string.
+
+    Engines are reused across create_database_connection calls so repeated
+    notebook runs in the same kernel keep their pooled connections;
+    engine.dispose() only closes idle connections and leaves it usable.
+    """
+    engine = create_engine(
+        conn_str,
+        pool_size=int(os.getenv("VM_JOBS_DB_POOL_SIZE", "5")),
+        max_overflow=10,
+        pool_timeout=30,
+        pool_recycle=1800,  # Recycle before server/proxy idle timeouts drop connections
+        pool_pre_ping=True,  # Detect stale connections on checkout instead of mid-transaction
+        pool_use_lifo=True,  # Reuse the most recent connection; idle overflow ones time out
+        # One compiled-statement cache for all helper engines in this process
+        execution_options={"compiled_cache": _COMPILED_CACHE},
+    )
+    _ENGINES.add(engine)
+    return engine
+
+
+def dispose_all_engines() -> None:
+    """Close the pooled connections of every engine created by this module.
+
+    Engines stay cached and usable; new connections are opened on demand.
+    Call at the end of a notebook (or kernel) to release server connections.
+    """
+    for engine in list(_ENGINES):
+        engine.dispose()
+
+
 def create_database_connection(
     connection_string: Optional[str] = None,
     host: Optional[str] = None,
@@ -199,6 +543,11 @@ def create_database_connection(
     If connection parameters are not provided, loads them from the YAML config file
     using VM_JOBS_ENVIRONMENT (from parameter or env var) and VM_JOBS_DB_PASSWORD environment variable.
     
+    The engine is cached per connection string, so every call returns the
+    same pool; always close the returned connection (or use the engine in
+    ``with engine.begin() as conn:`` blocks) so pool slots are given back,
+    and call dispose_all_engines() when done.
+    
     Args:
         connection_string: Full connection string (if provided, used as-is, ignores other params)
         host: Database host (used if connection_string not provided)
@@ -215,7 +564,7 @@ def create_database_connection(
     """
     # If connection_string provided, use it directly
     if connection_string:
-        engine = create_engine(connection_string)
+        engine = _get_engine(connection_string)
         conn = engine.connect()
         return engine, conn
     
@@ -239,12 +588,22 @@ def create_database_connection(
         ssl_mode=ssl_mode,
     )
     
-    engine = create_engine(conn_str)
+    engine = _get_engine(conn_str)
     conn = engine.connect()
     
     return engine, conn
 
 
+def _labels_json_with(labels_json: str, key: str, value: str) -> str:
+    """Append key/value to a serialized labels object without re-encoding it.
+
+    The result is not key-sorted; it is only meant for jsonb comparisons,
+    where key order does not matter.
+    """
+    separator = "," if labels_json != "{}" else ""
+    return f"{labels_json[:-1]}{separator}{json.dumps(key)}:{json.dumps(value, ensure_ascii=False)}}}"
+
+
 def normalize_metric_labels_for_comparison(labels: Dict[str, str]) -> str:
     """Normalize metric labels for consistent comparison.
     
@@ -257,8 +616,58 @@ def normalize_metric_labels_for_comparison(labels: Dict[str, str]) -> str:
     Returns:
         JSON string with sorted keys
     """
-    sorted_labels = dict(sorted(labels.items()))
-    return json.dumps(sorted_labels, sort_keys=True)
+    return _normalize_label_items(tuple(sorted(labels.items())))
+
+
+@lru_cache(maxsize=4096)
+def _normalize_label_items(items: Tuple[Tuple[str, str], ...]) -> str:
+    """JSON-encode sorted label items; memoized because label sets recur across metrics."""
+    return json.dumps(dict(items), separators=(",", ":"), ensure_ascii=False)
+
+
+def _job_idx_cache(conn: Any) -> Dict[str, int]:
+    """Return the job_id -> job_idx cache of a connection, creating it on first use.
+
+    The cache is dropped when the connection rolls back, so a job_idx created
+    by a rolled-back insert is never served from it. On commit its entries
+    are published to the engine-wide cache used by _cached_job_idx.
+    """
+    cache = _JOB_IDX_CACHE.get(conn)
+    if cache is None:
+        cache = _JOB_IDX_CACHE[conn] = {}
+        event.listen(conn, "rollback", _clear_job_idx_cache)
+        event.listen(conn, "commit", _publish_job_idx_cache)
+    return cache
+
+
+def _clear_job_idx_cache(conn: Any) -> None:
+    """Rollback listener: forget the cached job_idx values of a connection."""
+    _JOB_IDX_CACHE.pop(conn, None)
+
+
+def _publish_job_idx_cache(conn: Any) -> None:
+    """Commit listener: share the connection's job_idx values with its engine."""
+    cache = _JOB_IDX_CACHE.get(conn)
+    if cache:
+        _COMMITTED_JOB_IDX.setdefault(conn.engine, {}).update(cache)
+
+
+def _cached_job_idx(conn: Any, job_id: str) -> Optional[int]:
+    """Return the cached job_idx of job_id for conn, or None on a miss.
+
+    Checks the connection's own (possibly uncommitted) values first, then the
+    committed values of every connection of the same engine.
+    """
+    job_idx = _job_idx_cache(conn).get(job_id)
+    if job_idx is None:
+        job_idx = _COMMITTED_JOB_IDX.get(conn.engine, {}).get(job_id)
+    return job_idx
+
+
+def clear_job_idx_cache() -> None:
+    """Forget all cached job_idx values, e.g. after vm_metric_metadata was rebuilt."""
+    _COMMITTED_JOB_IDX.clear()
+    _JOB_IDX_CACHE.clear()
 
 
 def find_or_get_job_idx(conn: Any, job_id: str) -> Optional[int]:
@@ -274,18 +683,15 @@ def find_or_get_job_idx(conn: Any, job_id: str) -> Optional[int]:
         job_idx value if found, None if not found (will be created with first metric)
     """
     try:
-        query = text("""
-            SELECT DISTINCT job_idx
-            FROM public.vm_metric_metadata
-            WHERE job_id = :job_id
-            LIMIT 1
-        """)
+        job_idx = _cached_job_idx(conn, job_id)
+        if job_idx is not None:
+            return job_idx
         
-        result = conn.execute(query, {"job_id": job_id})
-        row = result.fetchone()
+        job_idx = conn.execute(_SELECT_JOB_IDX_SQL, {"job_id": job_id}).scalar_one_or_none()
         
-        if row:
-            return row[0]
+        if job_idx is not None:
+            _job_idx_cache(conn)[job_id] = job_idx
+            return job_idx
         
         # No existing job_idx found - return None
         # The first metric entry will auto-generate the job_idx via BIGSERIAL
@@ -302,7 +708,9 @@ def find_or_get_metric_id(
     job_idx: Optional[int],
     job_id: str,
     metric_name: str,
-    metric_labels: Dict[str, str]
+    metric_labels: Dict[str, str],
+    commit: bool = True,
+    labels_json: Optional[str] = None,
 ) -> Tuple[Optional[int], Optional[int]]:
     """Find existing metric_id or create new one in vm_metric_metadata.
     
@@ -316,113 +724,172 @@ def find_or_get_metric_id(
         job_id: Job ID string
         metric_name: Metric name
         metric_labels: Dictionary of metric labels (will be normalized)
+        commit: Commit here (default). Pass False when the caller owns the
+            transaction, e.g. inside ``with engine.begin() as conn:``
+        labels_json: Already serialized metric_labels (any key order); skips
+            normalizing metric_labels when given
         
     Returns:
         Tuple of (job_idx, metric_id) - both will be set after first insert if job_idx was None
     """
     try:
         # Normalize labels for comparison
-        normalized_labels_json = normalize_metric_labels_for_comparison(metric_labels)
+        normalized_labels_json = labels_json or normalize_metric_labels_for_comparison(metric_labels)
         
-        # If job_idx is provided, try to find existing metric_id
+        # If job_idx is provided, find the existing metric_id or insert a new
+        # one (next MAX(metric_id) + 1 for the job_idx) in a single round-trip
         if job_idx is not None:
-            query = text("""
-                SELECT metric_id
-                FROM public.vm_metric_metadata
-                WHERE job_idx = :job_idx
-                  AND job_id = :job_id
-                  AND metric_name = :metric_name
-                  AND metric_labels = CAST(:normalized_labels_json AS jsonb)
-                LIMIT 1
-            """)
-            
-            result = conn.execute(query, {
+            params = {
                 "job_idx": job_idx,
                 "job_id": job_id,
                 "metric_name": metric_name,
-                "normalized_labels_json": normalized_labels_json
-            })
-            row = result.fetchone()
-            
-            if row:
-                metric_id = row[0]
-                return (job_idx, metric_id)
-            
-            # Not found - need to create new entry with existing job_idx
-            max_query = text("""
-                SELECT COALESCE(MAX(metric_id), 0)
-                FROM public.vm_metric_metadata
-                WHERE job_idx = :job_idx
-            """)
-            
-            max_result = conn.execute(max_query, {"job_idx": job_idx})
-            max_row = max_result.fetchone()
-            new_metric_id = (max_row[0] if max_row else 0) + 1
-            
-            # Insert new metadata entry
-            insert_query = text("""
-                INSERT INTO public.vm_metric_metadata (
-                    job_idx, metric_id, job_id, metric_name, metric_labels
-                )
-                VALUES (
-                    :job_idx, :metric_id, :job_id, :metric_name, CAST(:metric_labels AS jsonb)
-                )
-                RETURNING metric_id
-            """)
-            
-            insert_result = conn.execute(insert_query, {
-                "job_idx": job_idx,
-                "metric_id": new_metric_id,
-                "job_id": job_id,
-                "metric_name": metric_name,
                 "metric_labels": normalized_labels_json
-            })
+            }
             
-            conn.commit()
-            new_metric_id = insert_result.fetchone()[0]
+            # A concurrent writer can take the same series or metric_id between
+            # our snapshot and the insert (ON CONFLICT DO NOTHING returns no
+            # row); re-running the statement sees its committed row.
+            for _ in range(_METRIC_ID_ALLOCATION_ATTEMPTS):
+                metric_id = conn.execute(_FIND_OR_INSERT_METRIC_ID_SQL, params).scalar()
+                if commit:
+                    conn.commit()
+                if metric_id is not None:
+                    return (job_idx, metric_id)
             
-            return (job_idx, new_metric_id)
+            raise RuntimeError(
+                f"Could not allocate metric_id after {_METRIC_ID_ALLOCATION_ATTEMPTS} attempts"
+            )
         else:
             # No job_idx exists - this is the first metric for this job_id
             # Insert will auto-generate job_idx via BIGSERIAL
             # Use metric_id = 1 for the first metric
-            insert_query = text("""
-                INSERT INTO public.vm_metric_metadata (
-                    job_idx, metric_id, job_id, metric_name, metric_labels
-                )
-                VALUES (
-                    DEFAULT, 1, :job_id, :metric_name, CAST(:metric_labels AS jsonb)
-                )
-                RETURNING job_idx, metric_id
-            """)
-            
-            insert_result = conn.execute(insert_query, {
+            insert_result = conn.execute(_INSERT_FIRST_METRIC_METADATA_SQL, {
                 "job_id": job_id,
                 "metric_name": metric_name,
                 "metric_labels": normalized_labels_json
             })
             
-            conn.commit()
-            row = insert_result.fetchone()
-            new_job_idx = row[0]
-            new_metric_id = row[1]
+            new_job_idx, new_metric_id = insert_result.one()
+            _job_idx_cache(conn)[job_id] = new_job_idx
+            if commit:
+                conn.commit()
             
             return (new_job_idx, new_metric_id)
         
     except SQLAlchemyError as exc:
-        if conn:
+        if conn and commit:
             conn.rollback()
         raise RuntimeError(
             f"Database error finding/creating metric_id for job_id='{job_id}', metric_name='{metric_name}': {exc}"
         ) from exc
     except Exception as exc:
-        if conn:
+        if conn and commit:
             conn.rollback()
         raise RuntimeError(
             f"Failed to find/create metric_id for job_id='{job_id}', metric_name='{metric_name}': {exc}"
         ) from exc
 
 
+def find_existing_metric_ids(
+    conn: Any,
+    job_idx: int,
+    job_id: str,
+    metric_name: str,
+    labels_keys: List[str],
+) -> Dict[str, int]:
+    """Look up the metric_ids of several label sets of one metric at once.
+
+    Args:
+        conn: Database connection
+        job_idx: Job index value
+        job_id: Job ID string
+        metric_name: Metric name
+        labels_keys: Label sets serialized as JSON objects (e.g. by
+            normalize_metric_labels_for_comparison); compared as jsonb, so
+            key order does not matter
+
+    Returns:
+        Mapping of labels key -> metric_id for the label sets that already
+        exist; missing ones are left out
+    """
+    if not labels_keys:
+        return {}
+    try:
+        result = conn.execute(_SELECT_METRIC_IDS_SQL, {
+            "job_idx": job_idx,
+            "job_id": job_id,
+            "metric_name": metric_name,
+            "metric_labels": list(labels_keys),
+        })
+        return dict(result.tuples().all())
+    except SQLAlchemyError as exc:
+        raise RuntimeError(
+            f"Database error looking up metric_ids for job_id='{job_id}', metric_name='{metric_name}': {exc}"
+        ) from exc
+
+
+def find_or_create_metric_series(
+    conn: Any,
+    job_id: str,
+    metric_name: str,
+    metric_labels: Dict[str, str],
+    commit: bool = True,
+) -> Tuple[Optional[int], Optional[int]]:
+    """Resolve (job_idx, metric_id) for a series, creating it if needed.
+
+    Combines find_or_get_job_idx and find_or_get_metric_id: when the job_idx
+    of job_id is not cached yet, a single statement looks it up (or takes the
+    next job_idx for a new job) and finds or inserts the series.
+
+    Args:
+        conn: Database connection
+        job_id: Job ID string
+        metric_name: Metric name
+        metric_labels: Dictionary of metric labels (will be normalized)
+        commit: Commit here (default). Pass False when the caller owns the
+            transaction, e.g. inside ``with engine.begin() as conn:``
+
+    Returns:
+        Tuple of (job_idx, metric_id)
+    """
+    job_idx = _cached_job_idx(conn, job_id)
+    if job_idx is not None:
+        return find_or_get_metric_id(
+            conn, job_idx, job_id, metric_name, metric_labels, commit=commit
+        )
+
+    try:
+        params = {
+            "job_id": job_id,
+            "metric_name": metric_name,
+            "metric_labels": normalize_metric_labels_for_comparison(metric_labels),
+        }
+        for _ in range(_METRIC_ID_ALLOCATION_ATTEMPTS):
+            row = conn.execute(_FIND_OR_INSERT_SERIES_SQL, params).fetchone()
+            if row:
+                _job_idx_cache(conn)[job_id] = row[0]
+            if commit:
+                conn.commit()
+            if row:
+                return (row[0], row[1])
+
+        raise RuntimeError(
+            f"Could not allocate metric_id after {_METRIC_ID_ALLOCATION_ATTEMPTS} attempts"
+        )
+    except SQLAlchemyError as exc:
+        if conn and commit:
+            conn.rollback()
+        raise RuntimeError(
+            f"Database error finding/creating metric series for job_id='{job_id}', metric_name='{metric_name}': {exc}"
+        ) from exc
+    except Exception as exc:
+        if conn and commit:
+            conn.rollback()
+        raise RuntimeError(
+            f"Failed to find/create metric series for job_id='{job_id}', metric_name='{metric_name}': {exc}"
+        ) from exc
+
+
 def create_forecast_run_record(
     conn: Any,
     job_id: str,
@@ -435,6 +902,7 @@ def create_forecast_run_record(
     min_history_points: Optional[int] = None,
     business_date: Optional[datetime] = None,
     config_source: str = "notebook",
+    commit: bool = True,
 ) -> Optional[int]:
     """Create a forecast run record in vm_forecast_job table.
     
@@ -453,6 +921,8 @@ def create_forecast_run_record(
         min_history_points: Minimum history points required (optional)
         business_date: Business date for this run (optional, defaults to today)
         config_source: Source of configuration (default: 'notebook')
+        commit: Commit here (default). Pass False when the caller owns the
+            transaction, e.g. inside ``with engine.begin() as conn:``
         
     Returns:
         run_id if successful, None otherwise
@@ -480,40 +950,10 @@ def create_forecast_run_record(
         
         # For Prophet, use the existing prophet_config field
         # For other models, we'll also use prophet_config but include model_type
-        prophet_config_json = json.dumps(config_json, default=_json_serializer)
-        prophet_fit_config_json = json.dumps(model_fit_config, default=_json_serializer) if model_fit_config else None
-        
-        insert_sql = text("""
-            INSERT INTO public.vm_forecast_job (
-                job_id,
-                selection_value,
-                prophet_config,
-                prophet_fit_config,
-                config_source,
-                history_days,
-                forecast_horizon_days,
-                min_history_points,
-                business_date,
-                started_at,
-                status
-            )
-            VALUES (
-                :job_id,
-                :selection_value,
-                CAST(:prophet_config AS jsonb),
-                CAST(:prophet_fit_config AS jsonb),
-                :config_source,
-                :history_days,
-                :forecast_horizon_days,
-                :min_history_points,
-                :business_date,
-                :started_at,
-                :status
-            )
-            RETURNING run_id
-        """)
+        prophet_config_json = _dumps(config_json, default=_json_serializer)
+        prophet_fit_config_json = _dumps(model_fit_config, default=_json_serializer) if model_fit_config else None
         
-        result = conn.execute(insert_sql, {
+        result = conn.execute(_INSERT_FORECAST_RUN_SQL, {
             "job_id": job_id,
             "selection_value": selection_value,
             "prophet_config": prophet_config_json,
@@ -527,17 +967,18 @@ def create_forecast_run_record(
             "status": "running",
         })
         
-        conn.commit()
-        run_id = result.fetchone()[0]
+        run_id = result.scalar_one()
+        if commit:
+            conn.commit()
         
         return run_id
         
     except SQLAlchemyError as exc:
-        if conn:
+        if conn and commit:
             conn.rollback()
         raise RuntimeError(f"Database error creating forecast run record: {exc}") from exc
     except Exception as exc:
-        if conn:
+        if conn and commit:
             conn.rollback()
         raise RuntimeError(f"Failed to create forecast run record: {exc}") from exc
 
@@ -545,16 +986,20 @@ def create_forecast_run_record(
 def check_forecast_metadata_table_exists(conn: Any) -> bool:
     """Return True if public.vm_metrics_forecast_metadata table exists."""
     try:
-        result = conn.execute(text("""
-            SELECT 1 FROM information_schema.tables
-            WHERE table_schema = 'public' AND table_name = 'vm_metrics_forecast_metadata'
-            LIMIT 1
-        """))
-        return result.fetchone() is not None
+        result = conn.execute(_FORECAST_METADATA_TABLE_EXISTS_SQL)
+        return result.scalar() is not None
     except Exception:
         return False
 
 
+@lru_cache(maxsize=32)
+def _update_forecast_run_sql(assignments: Tuple[str, ...]) -> Any:
+    """Return the UPDATE statement for one combination of updated columns."""
+    return text(
+        "UPDATE public.vm_forecast_job SET " + ", ".join(assignments) + " WHERE run_id = :run_id"
+    )
+
+
 def update_forecast_run_record(
     conn: Any,
     run_id: int,
@@ -565,6 +1010,7 @@ def update_forecast_run_record(
     completed_at: Optional[datetime] = None,
     duration_seconds: Optional[float] = None,
     error_message: Optional[str] = None,
+    commit: bool = True,
 ) -> None:
     """Update a forecast run record with counts and completion status."""
     try:
@@ -593,13 +1039,11 @@ def update_forecast_run_record(
             params["error_message"] = error_message
         if not updates:
             return
-        update_sql = text(
-            "UPDATE public.vm_forecast_job SET " + ", ".join(updates) + " WHERE run_id = :run_id"
-        )
-        conn.execute(update_sql, params)
-        conn.commit()
+        conn.execute(_update_forecast_run_sql(tuple(updates)), params)
+        if commit:
+            conn.commit()
     except SQLAlchemyError as exc:
-        if conn:
+        if conn and commit:
             conn.rollback()
         raise RuntimeError(f"Database error updating forecast run record: {exc}") from exc
 
@@ -613,6 +1057,7 @@ def save_forecast_metadata_for_metric(
     tsfel_features: Dict[str, Any],
     classification: Dict[str, str],
     prophet_params: Optional[Dict[str, Any]] = None,
+    commit: bool = True,
 ) -> None:
     """Insert or update one row in vm_metrics_forecast_metadata for a metric in a run.
 
@@ -633,6 +1078,8 @@ def save_forecast_metadata_for_metric(
         tsfel_features: Dict of TSFEL/stat features (serializable)
         classification: Dict with "category" and "reason" keys
         prophet_params: Prophet parameters for this metric, or None when Not Suitable
+        commit: Commit here (default). Pass False when the caller owns the
+            transaction, e.g. inside ``with engine.begin() as conn:``
     """
     try:
         # Match extractor convention: job is stored in job_id column, not in metric_labels.
@@ -640,13 +1087,12 @@ def save_forecast_metadata_for_metric(
         # extractor, avoiding duplicate source metrics in vm_metric_metadata.
         source_metric_labels = {k: v for k, v in metric_labels.items() if k != "job"}
 
-        job_idx = find_or_get_job_idx(conn, job_id)
-        job_idx, metric_id = find_or_get_metric_id(
+        job_idx, metric_id = find_or_create_metric_series(
             conn,
-            job_idx,
             job_id,
             metric_name,
             source_metric_labels,
+            commit=False,  # committed together with the metadata row below
         )
         if job_idx is None or metric_id is None:
             raise RuntimeError(
@@ -658,33 +1104,24 @@ def save_forecast_metadata_for_metric(
             "classification": classification,
             "prophet_params": prophet_params,
         }
-        metadata_json = json.dumps(metadata_payload, default=_json_serializer_for_metadata)
+        metadata_json = _dumps(metadata_payload, default=_json_serializer_for_metadata)
 
-        upsert_sql = text("""
-            INSERT INTO public.vm_metrics_forecast_metadata (
-                job_idx, metric_id, run_id, metadata
-            )
-            VALUES (
-                :job_idx, :metric_id, :run_id, CAST(:metadata AS jsonb)
-            )
-            ON CONFLICT (job_idx, metric_id, run_id)
-            DO UPDATE SET metadata = EXCLUDED.metadata
-        """)
-        conn.execute(upsert_sql, {
+        conn.execute(_UPSERT_FORECAST_METADATA_SQL, {
             "job_idx": job_idx,
             "metric_id": metric_id,
             "run_id": run_id,
             "metadata": metadata_json,
         })
-        conn.commit()
+        if commit:
+            conn.commit()
     except SQLAlchemyError as exc:
-        if conn:
+        if conn and commit:
             conn.rollback()
         raise RuntimeError(
             f"Database error saving forecast metadata for {metric_name}: {exc}"
         ) from exc
     except Exception as exc:
-        if conn:
+        if conn and commit:
             conn.rollback()
         raise RuntimeError(
             f"Failed to save forecast metadata for {metric_name}: {exc}"
@@ -699,6 +1136,7 @@ def save_forecast_metadata_for_metric_by_id(
     tsfel_features: Dict[str, Any],
     classification: Dict[str, str],
     prophet_params: Optional[Dict[str, Any]] = None,
+    commit: bool = True,
 ) -> None:
     """Insert or update one row in vm_metrics_forecast_metadata using known (job_idx, metric_id).
 
@@ -715,43 +1153,71 @@ def save_forecast_metadata_for_metric_by_id(
         tsfel_features: Dict of TSFEL/stat features (serializable)
         classification: Dict with "category" and "reason" keys
         prophet_params: Prophet parameters for this metric, or None when Not Suitable
+        commit: Commit here (default). Pass False when the caller owns the
+            transaction, e.g. inside ``with engine.begin() as conn:``
+    """
+    save_forecast_metadata_bulk(conn, [{
+        "run_id": run_id,
+        "job_idx": job_idx,
+        "metric_id": metric_id,
+        "tsfel_features": tsfel_features,
+        "classification": classification,
+        "prophet_params": prophet_params,
+    }], commit=commit)
+
+
+def save_forecast_metadata_bulk(conn: Any, rows: List[Dict[str, Any]], commit: bool = True) -> int:
+    """Insert or update many vm_metrics_forecast_metadata rows in one transaction.
+
+    All rows are sent with a single executemany upsert and committed once,
+    instead of one round-trip and commit per metric.
+
+    Args:
+        conn: Database connection
+        rows: Dicts with keys run_id, job_idx, metric_id, tsfel_features,
+            classification and (optional) prophet_params, as accepted by
+            save_forecast_metadata_for_metric_by_id
+        commit: Commit here (default). Pass False when the caller owns the
+            transaction, e.g. inside ``with engine.begin() as conn:``
+
+    Returns:
+        Number of rows written
     """
+    if not rows:
+        return 0
     try:
-        metadata_payload = {
-            "tsfel_features": tsfel_features,
-            "classification": classification,
-            "prophet_params": prophet_params,
-        }
-        metadata_json = json.dumps(metadata_payload, default=_json_serializer_for_metadata)
+        params = [
+            {
+                "job_idx": row["job_idx"],
+                "metric_id": row["metric_id"],
+                "run_id": row["run_id"],
+                "metadata": _dumps(
+                    {
+                        "tsfel_features": row["tsfel_features"],
+                        "classification": row["classification"],
+                        "prophet_params": row.get("prophet_params"),
+                    },
+                    default=_json_serializer_for_metadata,
+                ),
+            }
+            for row in rows
+        ]
 
-        upsert_sql = text("""
-            INSERT INTO public.vm_metrics_forecast_metadata (
-                job_idx, metric_id, run_id, metadata
-            )
-            VALUES (
-                :job_idx, :metric_id, :run_id, CAST(:metadata AS jsonb)
-            )
-            ON CONFLICT (job_idx, metric_id, run_id)
-            DO UPDATE SET metadata = EXCLUDED.metadata
-        """)
-        conn.execute(upsert_sql, {
-            "job_idx": job_idx,
-            "metric_id": metric_id,
-            "run_id": run_id,
-            "metadata": metadata_json,
-        })
-        conn.commit()
+        conn.execute(_UPSERT_FORECAST_METADATA_SQL, params)
+        if commit:
+            conn.commit()
+        return len(params)
     except SQLAlchemyError as exc:
-        if conn:
+        if conn and commit:
             conn.rollback()
         raise RuntimeError(
-            f"Database error saving forecast metadata (job_idx={job_idx}, metric_id={metric_id}): {exc}"
+            f"Database error saving forecast metadata for {len(rows)} metric(s): {exc}"
         ) from exc
     except Exception as exc:
-        if conn:
+        if conn and commit:
             conn.rollback()
         raise RuntimeError(
-            f"Failed to save forecast metadata (job_idx={job_idx}, metric_id={metric_id}): {exc}"
+            f"Failed to save forecast metadata for {len(rows)} metric(s): {exc}"
         ) from exc
 
 
@@ -759,9 +1225,10 @@ def save_forecasts_to_database(
     conn: Any,
     metric_name: str,
     labels: Dict[str, str],
-    forecast_df: pd.DataFrame,
+    forecast_df: "pd.DataFrame",
     forecast_types: List[Dict[str, str]],
     run_id: Optional[int] = None,
+    commit: bool = True,
 ) -> Tuple[int, Optional[int], Optional[int]]:
     """Write forecast data to database (vm_metric_data and vm_metric_metadata).
     
@@ -772,6 +1239,10 @@ def save_forecasts_to_database(
     4. Finds or creates job_idx and metric_id in vm_metric_metadata
     5. Inserts forecast values into vm_metric_data
     
+    The write transaction runs with synchronous_commit = off (see
+    _ASYNC_FORECAST_COMMIT): after a server crash the most recent forecast
+    writes may be missing and have to be recomputed.
+    
     Args:
         conn: Database connection
         metric_name: Name of the metric
@@ -781,12 +1252,16 @@ def save_forecasts_to_database(
         forecast_types: List of dicts with 'name' and 'field' keys
                        Example: [{'name': 'trend', 'field': 'yhat'}, ...]
         run_id: Optional run_id from vm_forecast_job table for parameter tracking
+        commit: Commit here (default), once for metadata and data together.
+            Pass False when the caller owns the transaction, e.g. inside
+            ``with engine.begin() as conn:``
         
     Returns:
         Tuple of (rows_written, job_idx, metric_id) for the first forecast type
         (e.g. "trend"), so the caller can use (job_idx, metric_id) for
         vm_metrics_forecast_metadata without looking up again.
-        If no rows written, returns (0, None, None).
+        If forecast_df is empty or none of the forecast_types has a column in
+        it, returns (0, None, None) without touching the database.
 
     Raises:
         ValueError: If 'job' label is missing from labels
@@ -799,13 +1274,22 @@ def save_forecasts_to_database(
         
         # Transform job_id: add "_forecast" suffix
         forecast_job_id = f"{input_job}_forecast"
+
+        # Nothing to write: skip the metadata lookups entirely
+        if forecast_df is None or len(forecast_df) == 0:
+            return (0, None, None)
+        forecast_types = [
+            forecast_type for forecast_type in forecast_types
+            if forecast_type.get("name") and forecast_type.get("field") in forecast_df.columns
+        ]
+        if not forecast_types:
+            return (0, None, None)
+
+        if _ASYNC_FORECAST_COMMIT and conn.dialect.name == "postgresql":
+            conn.execute(_SET_ASYNC_COMMIT_SQL)
         
         # Prepare base metric_labels: remove job label and exclude system labels
-        excluded_labels = {"job", "auid", "biz_date", "forecast"}
-        base_metric_labels = {
-            k: v for k, v in labels.items() 
-            if k not in excluded_labels
-        }
+        base_metric_labels = {k: labels[k] for k in labels.keys() - _EXCLUDED_LABELS}
         
         # Find existing job_idx for the forecast_job_id (may be None if first metric)
         job_idx = find_or_get_job_idx(conn, forecast_job_id)
@@ -813,23 +1297,38 @@ def save_forecasts_to_database(
         # Each forecast_type becomes its own timeseries with its own metric_id
         # STEP 1: Look up or create ALL metadata entries FIRST (before inserting any data)
         forecast_type_metric_ids = {}
-        
-        for forecast_type in forecast_types:
-            name = forecast_type.get("name")
-            if not name:
+
+        # Add forecast_type to metric_labels - this makes each forecast_type a separate timeseries.
+        # The base labels are serialized once and forecast_type is appended per type.
+        base_labels_json = normalize_metric_labels_for_comparison(base_metric_labels)
+        labels_key_by_type = {
+            forecast_type["name"]: _labels_json_with(base_labels_json, "forecast_type", forecast_type["name"])
+            for forecast_type in forecast_types
+        }
+
+        # Resolve every already known series in one query; only new ones
+        # (first run of a metric) go through find_or_get_metric_id
+        existing_ids = {}
+        if job_idx is not None:
+            existing_ids = find_existing_metric_ids(
+                conn, job_idx, forecast_job_id, metric_name, list(labels_key_by_type.values())
+            )
+
+        for name, labels_key in labels_key_by_type.items():
+            metric_id = existing_ids.get(labels_key)
+            if metric_id is not None:
+                forecast_type_metric_ids[name] = metric_id
                 continue
-            
-            # Add forecast_type to metric_labels - this makes each forecast_type a separate timeseries
-            metric_labels_with_type = dict(base_metric_labels)
-            metric_labels_with_type["forecast_type"] = name
-            
+
             # Find or get metric_id for this forecast_type timeseries
             job_idx, metric_id = find_or_get_metric_id(
                 conn,
                 job_idx,
                 forecast_job_id,
                 metric_name,
-                metric_labels_with_type
+                {**base_metric_labels, "forecast_type": name},
+                commit=False,  # committed together with the data rows below
+                labels_json=labels_key,
             )
             
             if job_idx is None or metric_id is None:
@@ -841,79 +1340,179 @@ def save_forecasts_to_database(
             return (0, None, None)
 
         # job_idx and first forecast_type's metric_id for caller (e.g. vm_metrics_forecast_metadata)
-        first_type_name = forecast_types[0]["name"] if forecast_types else None
-        metric_id_primary = forecast_type_metric_ids.get(first_type_name) if first_type_name else next(iter(forecast_type_metric_ids.values()), None)
+        metric_id_primary = forecast_type_metric_ids.get(forecast_types[0]["name"])
         
-        # STEP 2: Ensure all metadata entries are committed before inserting data
-        conn.commit()
-        
-        # STEP 3: Now we can safely insert data (FK constraint will be satisfied)
+        # STEP 2: Now we can safely insert data (new metadata rows are visible
+        # in this transaction, so the FK constraint is satisfied)
+        # Reshape the wide frame (one column per forecast field) into long
+        # (metric_timestamp, metric_id, metric_value) rows with one melt
+        # instead of walking every (row, forecast_type) pair in Python.
+        fields = []
+        metric_ids = []
+        for forecast_type in forecast_types:
+            # Skip types we didn't get a metric_id for
+            metric_id = forecast_type_metric_ids.get(forecast_type["name"])
+            if metric_id is None:
+                continue
+            fields.append(forecast_type["field"])
+            metric_ids.append(metric_id)
+
         rows_to_insert = []
-        
-        for forecast_row in forecast_df.itertuples():
-            # Use forecast date as-is (biz_date from Prophet forecast)
-            forecast_date = forecast_row.ds.date()
-            forecast_timestamp = datetime.combine(
-                forecast_date, 
-                datetime.min.time()
-            ).replace(tzinfo=timezone.utc)
-            
-            for forecast_type in forecast_types:
-                name = forecast_type.get("name")
-                field = forecast_type.get("field")
-                if not name or not field or not hasattr(forecast_row, field):
-                    continue
-                
-                # Skip if we didn't get a metric_id for this forecast_type
-                if name not in forecast_type_metric_ids:
-                    continue
-                
-                value = getattr(forecast_row, field)
-                if value is None or np.isnan(value):
-                    continue
-                
-                # Use the pre-looked-up metric_id for this forecast_type
-                metric_id = forecast_type_metric_ids[name]
-                
-                rows_to_insert.append({
-                    "job_idx": job_idx,
-                    "metric_id": metric_id,
-                    "metric_timestamp": forecast_timestamp,
-                    "metric_value": float(value),
-                    "run_id": run_id,  # Store run_id to link to parameter record
-                })
+        if fields:
+            import pandas as pd
+
+            # Use forecast date as-is (biz_date from Prophet forecast): the
+            # wall-clock date at midnight UTC, converted for the whole column
+            forecast_ds = pd.to_datetime(forecast_df["ds"])
+            if forecast_ds.dt.tz is not None:
+                forecast_ds = forecast_ds.dt.tz_localize(None)
+            forecast_timestamps = forecast_ds.dt.normalize().dt.tz_localize("UTC")
+            wide = forecast_df[fields].set_axis(metric_ids, axis=1)
+            wide.insert(0, "metric_timestamp", forecast_timestamps)
+            long_df = wide.melt(
+                id_vars="metric_timestamp",
+                var_name="metric_id",
+                value_name="metric_value",
+            )
+            # Drop missing values (None/NaN) with one mask over the column
+            long_df = long_df[long_df["metric_value"].notna()]
+            # Write in (metric_id, metric_timestamp) order (job_idx is fixed here)
+            # so inserts walk the primary key index sequentially
+            long_df = long_df.sort_values(["metric_id", "metric_timestamp"], kind="mergesort")
+
+            for forecast_timestamp, metric_id, value in long_df.itertuples(index=False, name=None):
+                # run_id links the row to its parameter record
+                rows_to_insert.append(
+                    (job_idx, int(metric_id), forecast_timestamp.to_pydatetime(), float(value), run_id)
+                )
         
         if not rows_to_insert:
             return (0, job_idx, metric_id_primary)
         
-        # Build PostgreSQL upsert statement for vm_metric_data
+        # Upsert into vm_metric_data
         # ON CONFLICT ... DO UPDATE for idempotent writes
-        upsert_sql = text("""
-            INSERT INTO public.vm_metric_data (
-                job_idx, metric_id, metric_timestamp, metric_value, run_id
-            )
-            VALUES (
-                :job_idx, :metric_id, :metric_timestamp, :metric_value, :run_id
-            )
-            ON CONFLICT (job_idx, metric_id, metric_timestamp)
-            DO UPDATE SET
-                metric_value = EXCLUDED.metric_value,
-                run_id = EXCLUDED.run_id
-        """)
-        
-        # Execute batch insert
-        for row in rows_to_insert:
-            conn.execute(upsert_sql, row)
+        for start in range(0, len(rows_to_insert), COPY_BATCH_ROWS):
+            _upsert_metric_data_rows(conn, rows_to_insert[start:start + COPY_BATCH_ROWS])
         
-        conn.commit()
+        if commit:
+            conn.commit()
         
         return (len(rows_to_insert), job_idx, metric_id_primary)
         
     except SQLAlchemyError as exc:
-        if conn:
+        if conn and commit:
             conn.rollback()
         raise RuntimeError(f"Database error writing forecasts for {metric_name}: {exc}") from exc
     except Exception as exc:
-        if conn:
+        if conn and commit:
             conn.rollback()
         raise RuntimeError(f"Failed to write forecasts to database for {metric_name}: {exc}") from exc
+
+
+def _dbapi_cursor(conn: Any) -> Any:
+    """Return a raw DBAPI cursor that shares conn's transaction.
+
+    Begins the SQLAlchemy transaction first if needed, so conn.commit() also
+    commits what is written through the cursor.
+    """
+    if not conn.in_transaction():
+        conn.begin()
+    return conn.connection.cursor()
+
+
+def _upsert_metric_data_rows(conn: Any, rows: List[Tuple[Any, ...]]) -> None:
+    """Upsert rows into vm_metric_data; does not commit.
+
+    Batches larger than COPY_THRESHOLD_ROWS go through COPY when the driver
+    supports it. Smaller ones are sent as multi-row VALUES statements with
+    psycopg2's execute_values(), or as one executemany() call on other drivers.
+    """
+    if len(rows) > COPY_THRESHOLD_ROWS and _copy_metric_data_rows(conn, rows):
+        return
+
+    if execute_values is not None and conn.dialect.driver == "psycopg2":
+        dbapi_cursor = _dbapi_cursor(conn)
+        try:
+            execute_values(dbapi_cursor, _UPSERT_METRIC_DATA_VALUES_SQL, rows, page_size=1000)
+        finally:
+            dbapi_cursor.close()
+        return
+
+    conn.execute(_UPSERT_METRIC_DATA_SQL, [dict(zip(_METRIC_DATA_COLUMNS, row)) for row in rows])
+
+
+def _copy_metric_data_rows(conn: Any, rows: List[Tuple[Any, ...]]) -> bool:
+    """Bulk load rows via COPY into a temporary table and merge them into vm_metric_data.
+
+    COPY cannot resolve conflicts itself, so the rows are staged and then
+    upserted in one statement with the same ON CONFLICT rule as the
+    executemany path. Runs in the caller's transaction; the stage table is
+    dropped when it commits.
+
+    Args:
+        conn: Database connection
+        rows: Row tuples as built by save_forecasts_to_database
+
+    Returns:
+        True if the rows were loaded, False if the driver has no COPY support
+    """
+    dbapi_cursor = _dbapi_cursor(conn)
+    try:
+        if not hasattr(dbapi_cursor, "copy_expert"):
+            return False
+
+        conn.execute(_CREATE_STAGE_TABLE_SQL)
+
+        # CSV writes None as an empty unquoted field, which COPY reads as NULL
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        buffer.seek(0)
+
+        dbapi_cursor.copy_expert(
+            "COPY vm_metric_data_stage "
+            "(job_idx, metric_id, metric_timestamp, metric_value, run_id) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+
+        conn.execute(_MERGE_STAGE_TABLE_SQL)
+        conn.execute(_TRUNCATE_STAGE_TABLE_SQL)
+        return True
+    finally:
+        dbapi_cursor.close()
+
+
+def save_forecasts_bulk(
+    engine: Engine,
+    series: List[Dict[str, Any]],
+    forecast_types: List[Dict[str, str]],
+    run_id: Optional[int] = None,
+) -> List[Tuple[int, Optional[int], Optional[int]]]:
+    """Write forecasts for many series in a single transaction.
+
+    Calls save_forecasts_to_database for every series with commit=False inside
+    ``with engine.begin() as conn:``, so everything is committed once at the
+    end (or rolled back together on the first error).
+
+    Args:
+        engine: SQLAlchemy engine (e.g. from create_database_connection)
+        series: Dicts with 'metric_name', 'labels' and 'forecast_df' keys
+        forecast_types: List of dicts with 'name' and 'field' keys
+        run_id: Optional run_id from vm_forecast_job table for parameter tracking
+
+    Returns:
+        One (rows_written, job_idx, metric_id) tuple per series, in input order
+    """
+    with engine.begin() as conn:
+        return [
+            save_forecasts_to_database(
+                conn,
+                item["metric_name"],
+                item["labels"],
+                item["forecast_df"],
+                forecast_types,
+                run_id=run_id,
+                commit=False,
+            )
+            for item in series
+        ]
@@ -8,8 +8,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')  # Non-interactive backend
-import tsfel
 from pathlib import Path
+from scipy import stats
 
 # Create output directory
 output_dir = Path(__file__).parent / 'parameter_examples'
@@ -17,7 +17,7 @@ output_dir.mkdir(exist_ok=True)
 
 # Set style
 plt.style.use('seaborn-v0_8-whitegrid')
-figsize = (10, 6)
+figsize = (10, 6)  # figures use layout='constrained' instead of per-figure tight_layout()
 
 def generate_example_series():
     """Generate example time series with different characteristics."""
@@ -116,8 +116,22 @@ def generate_example_series():
     
     return examples
 
+def _autocorr_persistence(signal):
+    """Lag at which the autocorrelation first drops below 1/e (TSFEL's Autocorrelation)."""
+    centered = signal - np.mean(signal)
+    acf = np.correlate(centered, centered, mode='full')[len(signal) - 1:]
+    if acf[0] == 0:
+        return np.nan
+    below = np.flatnonzero(acf / acf[0] < 1 / np.e)
+    return float(below[0]) if below.size else float(len(signal))
+
 def calculate_features(values):
-    """Calculate all features for a time series."""
+    """Calculate all features for a time series.
+    
+    The handful of TSFEL features used here are computed directly with
+    NumPy/SciPy; running the TSFEL extractor for 100-point example series
+    cost far more than the features themselves.
+    """
     signal = np.array(values)
     signal = signal[~np.isnan(signal)]
     
@@ -125,30 +139,30 @@ def calculate_features(values):
         return {}
     
     try:
-        cfg = tsfel.get_features_by_domain(['statistical', 'temporal'])
-        feature_dict = tsfel.time_series_features_extractor(cfg, signal, fs=1.0)
-        
         # Calculate ACF1 manually
         if len(signal) > 1:
             acf1 = np.corrcoef(signal[:-1], signal[1:])[0, 1]
         else:
             acf1 = np.nan
         
+        slope = np.polyfit(np.arange(len(signal)), signal, 1)[0]
+        centered = signal - np.mean(signal)
+        
         features = {
             'mean': np.mean(signal),
             'std': np.std(signal),
             'var': np.var(signal),
             'cv': np.std(signal) / np.mean(signal) if np.mean(signal) != 0 else np.inf,
             'acf1': acf1,
-            'autocorr_persistence': feature_dict.get('0_Autocorrelation', np.nan),
-            'skewness': feature_dict.get('0_Skewness', np.nan),
-            'kurtosis': feature_dict.get('0_Kurtosis', np.nan),
-            'slope': feature_dict.get('0_Slope', np.nan),
-            'trend_strength': abs(feature_dict.get('0_Slope', 0)),
-            'mean_absolute_deviation': feature_dict.get('0_Mean absolute deviation', np.nan),
-            'zero_crossing_rate': feature_dict.get('0_Zero crossing rate', np.nan),
-            'interquartile_range': feature_dict.get('0_Interquartile range', np.nan),
-            'entropy': feature_dict.get('0_Entropy', np.nan),
+            'autocorr_persistence': _autocorr_persistence(signal),
+            'skewness': stats.skew(signal),
+            'kurtosis': stats.kurtosis(signal),
+            'slope': slope,
+            'trend_strength': abs(slope),
+            'mean_absolute_deviation': np.mean(np.abs(centered)),
+            'zero_crossing_rate': np.mean(signal[:-1] * signal[1:] < 0),
+            'interquartile_range': np.subtract(*np.percentile(signal, [75, 25])),
+            'entropy': stats.entropy(np.histogram(signal, bins=10)[0] + 1e-12),
         }
         
         # Calculate stability
@@ -170,7 +184,7 @@ def plot_parameter_examples():
     
     # Plot each example series
     for key, data in examples.items():
-        fig, ax = plt.subplots(figsize=figsize)
+        fig, ax = plt.subplots(figsize=figsize, layout='constrained')
         ax.plot(data['t'], data['values'], 'b-', linewidth=2, alpha=0.7)
         ax.axhline(y=np.mean(data['values']), color='r', linestyle='--', label=f"Mean: {np.mean(data['values']):.2f}")
         ax.set_title(data['label'], fontsize=14, fontweight='bold')
@@ -178,7 +192,6 @@ def plot_parameter_examples():
         ax.set_ylabel('Value', fontsize=12)
         ax.legend()
         ax.grid(True, alpha=0.3)
-        plt.tight_layout()
         plt.savefig(output_dir / f'{key}.png', dpi=150, bbox_inches='tight')
         plt.close()
     
@@ -191,7 +204,7 @@ def create_comparison_plots(examples):
     """Create side-by-side comparison plots for key parameters."""
     
     # ACF1 comparison
-    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6), layout='constrained')
     for idx, key in enumerate(['high_acf1', 'low_acf1']):
         data = examples[key]
         features = calculate_features(data['values'])
@@ -202,12 +215,11 @@ def create_comparison_plots(examples):
         ax.set_xlabel('Date', fontsize=10)
         ax.set_ylabel('Value', fontsize=10)
         ax.grid(True, alpha=0.3)
-    plt.tight_layout()
     plt.savefig(output_dir / 'acf1_comparison.png', dpi=150, bbox_inches='tight')
     plt.close()
     
     # Skewness comparison
-    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6), layout='constrained')
     for idx, key in enumerate(['positive_skew', 'negative_skew']):
         data = examples[key]
         features = calculate_features(data['values'])
@@ -218,12 +230,11 @@ def create_comparison_plots(examples):
         ax.set_xlabel('Date', fontsize=10)
         ax.set_ylabel('Value', fontsize=10)
         ax.grid(True, alpha=0.3)
-    plt.tight_layout()
     plt.savefig(output_dir / 'skewness_comparison.png', dpi=150, bbox_inches='tight')
     plt.close()
     
     # Stability comparison
-    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6), layout='constrained')
     for idx, key in enumerate(['high_stability', 'low_stability']):
         data = examples[key]
         features = calculate_features(data['values'])
@@ -237,12 +248,11 @@ def create_comparison_plots(examples):
         ax.set_ylabel('Value', fontsize=10)
         ax.legend()
         ax.grid(True, alpha=0.3)
-    plt.tight_layout()
     plt.savefig(output_dir / 'stability_comparison.png', dpi=150, bbox_inches='tight')
     plt.close()
     
     # CV comparison
-    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6), layout='constrained')
     for idx, key in enumerate(['high_mean_low_var', 'low_mean_high_var']):
         data = examples[key]
         features = calculate_features(data['values'])
@@ -256,7 +266,6 @@ def create_comparison_plots(examples):
         ax.set_ylabel('Value', fontsize=10)
         ax.legend()
         ax.grid(True, alpha=0.3)
-    plt.tight_layout()
     plt.savefig(output_dir / 'cv_comparison.png', dpi=150, bbox_inches='tight')
     plt.close()
 
@@ -3,18 +3,130 @@
 Common configuration loader using OmegaConf with interpolation support.
 """
 
+import copy
 import logging
 import os
-from typing import Dict, Any
+import re
+from functools import lru_cache
+from typing import Dict, Any, Tuple
+import yaml
 from omegaconf import OmegaConf, DictConfig
 from omegaconf.errors import InterpolationResolutionError, ConfigAttributeError
 
+try:
+    # libyaml-backed loader; PyYAML wheels ship it on the common platforms
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+
+class _ConfigYamlLoader(_YamlLoader):
+    """libyaml loader that parses like OmegaConf's own YAML loader.
+    
+    Plain SafeLoader follows YAML 1.1, so ``1e-3`` would load as a string,
+    unquoted dates load as date/datetime objects (which OmegaConf.create
+    rejects), and a repeated key silently overrides the first one. OmegaConf
+    resolves YAML 1.2 floats, keeps timestamps as strings and rejects
+    duplicate keys; do the same here.
+    """
+    
+    def construct_mapping(self, node, deep=False):
+        keys = set()
+        for key_node, _ in node.value:
+            if key_node.tag != yaml.resolver.BaseResolver.DEFAULT_SCALAR_TAG:
+                continue
+            if key_node.value in keys:
+                raise yaml.constructor.ConstructorError(
+                    "while constructing a mapping",
+                    node.start_mark,
+                    f"found duplicate key {key_node.value}",
+                    key_node.start_mark,
+                )
+            keys.add(key_node.value)
+        return super().construct_mapping(node, deep=deep)
+
+
+# Like OmegaConf: no timestamp resolver, and the float resolver is replaced
+# by its pattern (exponent without a dot, no required sign)
+_DROPPED_IMPLICIT_TAGS = ("tag:yaml.org,2002:float", "tag:yaml.org,2002:timestamp")
+_ConfigYamlLoader.yaml_implicit_resolvers = {
+    first: [(tag, regexp) for tag, regexp in resolvers if tag not in _DROPPED_IMPLICIT_TAGS]
+    for first, resolvers in _YamlLoader.yaml_implicit_resolvers.items()
+}
+_ConfigYamlLoader.add_implicit_resolver(
+    "tag:yaml.org,2002:float",
+    re.compile(
+        r"""^(?:
+         [-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+]?[0-9]+)?
+        |[-+]?(?:[0-9][0-9_]*)(?:[eE][-+]?[0-9]+)
+        |\.[0-9_]+(?:[eE][-+][0-9]+)?
+        |[-+]?[0-9][0-9_]*(?::[0-5]?[0-9])+\.[0-9_]*
+        |[-+]?\.(?:inf|Inf|INF)
+        |\.(?:nan|NaN|NAN))$""",
+        re.X,
+    ),
+    list("-+0123456789."),
+)
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _resolve_required_env(var_name: str, error_msg: str = "Variable is required") -> str:
+    """Resolve required environment variable or return placeholder if missing.
+    
+    Args:
+        var_name: Name of environment variable
+        error_msg: Error message if variable is not set
+        
+    Returns:
+        Environment variable value or placeholder string
+        
+    Note:
+        Returns a placeholder value '???' if environment variable is not set.
+        This allows the config to load without all env vars being set.
+        Jobs should validate their specific required vars when they run.
+    """
+    value = os.getenv(var_name)
+    if value is None:
+        # Return placeholder instead of raising error
+        # This allows config to load for other jobs
+        return f"???{var_name}???"
+    return value
+
+
+# Register custom resolvers for backward compatibility with our syntax
+# Syntax: ${env_required:VAR_NAME,Error message}
+if not OmegaConf.has_resolver("env_required"):
+    OmegaConf.register_new_resolver("env_required", _resolve_required_env, use_cache=True)
+
+
+@lru_cache(maxsize=32)
+def _load_resolved(
+    config_path: str,
+    mtime_ns: int,
+    size: int,
+    environ: Tuple[Tuple[str, str], ...],
+) -> Dict[str, Any]:
+    """Load and resolve a YAML file; memoized per file version and environment.
+    
+    mtime_ns/size identify the file version and environ the os.environ
+    snapshot that ${oc.env:...} interpolations were resolved against, so an
+    edited file or a changed variable is loaded again. The YAML is parsed
+    with the libyaml loader (with OmegaConf's float, timestamp and
+    duplicate-key rules) and only then handed to OmegaConf.
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=_ConfigYamlLoader)
+    config = OmegaConf.create(data if data is not None else {})
+    return OmegaConf.to_container(config, resolve=True, throw_on_missing=False)
+
 
 class ConfigLoader:
     """Configuration loader using OmegaConf with environment variable and path interpolation."""
     
     def __init__(self):
-        self.logger = logging.getLogger(__name__)
+        self.logger = _LOGGER
     
     def load(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from YAML file with OmegaConf interpolation.
@@ -36,23 +148,25 @@ class ConfigLoader:
             InterpolationResolutionError: If interpolation fails
             ValueError: If required environment variables are missing
         """
-        if not os.path.exists(config_path):
-            raise FileNotFoundError(f"Configuration file not found: {config_path}")
-        
-        if not config_path.endswith('.yml') and not config_path.endswith('.yaml'):
+        if not config_path.endswith(('.yml', '.yaml')):
             raise ValueError(f"Configuration file must have .yml or .yaml extension: {config_path}")
         
+        # The stat doubles as the existence check and the cache key below
         try:
-            # Load configuration with OmegaConf (lazy resolution)
-            config = OmegaConf.load(config_path)
-            
-            # Register custom resolvers for backward compatibility with our syntax
-            self._register_custom_resolvers()
-            
-            # Don't resolve everything upfront - let OmegaConf resolve lazily when accessed
-            # This way jobs only resolve their specific configuration
-            # Convert to plain Python dict (resolve=True resolves on access)
-            resolved_config = OmegaConf.to_container(config, resolve=True, throw_on_missing=False)
+            stat = os.stat(config_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Configuration file not found: {config_path}") from None
+        
+        try:
+            # Load and resolve with OmegaConf; repeated loads of an unchanged
+            # file reuse the cached result. Callers get a deep copy because
+            # they mutate the returned dict (e.g. the environment loader).
+            resolved_config = copy.deepcopy(_load_resolved(
+                config_path,
+                stat.st_mtime_ns,
+                stat.st_size,
+                tuple(sorted(os.environ.items())),
+            ))
             
             self.logger.info(f"Successfully loaded configuration from {config_path}")
             return resolved_config
@@ -63,36 +177,3 @@ class ConfigLoader:
         except Exception as e:
             self.logger.error(f"Failed to load configuration: {e}")
             raise
-    
-    def _register_custom_resolvers(self):
-        """Register custom OmegaConf resolvers for backward compatibility."""
-        # Register resolver for required environment variables with error message
-        # Syntax: ${env_required:VAR_NAME,Error message}
-        if not OmegaConf.has_resolver("env_required"):
-            OmegaConf.register_new_resolver(
-                "env_required",
-                lambda var_name, error_msg="Variable is required": self._resolve_required_env(var_name, error_msg),
-                use_cache=True
-            )
-    
-    def _resolve_required_env(self, var_name: str, error_msg: str) -> str:
-        """Resolve required environment variable or return placeholder if missing.
-        
-        Args:
-            var_name: Name of environment variable
-            error_msg: Error message if variable is not set
-            
-        Returns:
-            Environment variable value or placeholder string
-            
-        Note:
-            Returns a placeholder value '???' if environment variable is not set.
-            This allows the config to load without all env vars being set.
-            Jobs should validate their specific required vars when they run.
-        """
-        value = os.getenv(var_name)
-        if value is None:
-            # Return placeholder instead of raising error
-            # This allows config to load for other jobs
-            return f"???{var_name}???"
-        return value
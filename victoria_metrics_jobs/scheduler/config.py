@@ -3,24 +3,181 @@
 Configuration loader for YAML-based job definitions with environment support.
 """
 
+import copy
+import glob
+import hashlib
+import json
 import logging
 import os
-from typing import Dict, Any, List, Optional
+import re
+import stat
+import sys
+import tempfile
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from .common import ConfigLoader as BaseConfigLoader
 
 
+# Validated environment configs keyed by (abspath, mtime_ns, size, environment,
+# os.environ snapshot); the snapshot is part of the key because ${oc.env:...}
+# interpolations are resolved against it. Each entry holds a private dict
+# (deep-copied for mutable loads) and its read-only view (returned as is).
+# Bounded LRU, most recent last.
+_ENV_CONFIG_CACHE: "OrderedDict[Tuple[Any, ...], Tuple[Dict[str, Any], Mapping[str, Any]]]" = OrderedDict()
+_ENV_CONFIG_CACHE_SIZE = 32
+
+# Optional cross-process cache of validated configs, enabled by pointing
+# VM_JOBS_CONFIG_CACHE_DIR at a private directory. Entries hold resolved
+# secrets, so files are created 0600 in a 0700 directory; they are plain JSON.
+_DISK_CACHE_ENV_VAR = 'VM_JOBS_CONFIG_CACHE_DIR'
+_DISK_CACHE_ENTRIES = 20
+# Environment variables referenced by the YAML interpolations
+_ENV_REFERENCE = re.compile(rb'\$\{\s*(?:oc\.env|env_required)\s*:\s*([A-Za-z_][A-Za-z0-9_]*)')
+
+_LOGGER = logging.getLogger(__name__)
+
+_ENVIRONMENTS = ('local', 'dev', 'stg', 'prod')
+_VALID_ENVS = frozenset(_ENVIRONMENTS)
+_SCHEDULE_TYPES = ('cron', 'interval', 'date')
+_VALID_SCHEDULE_TYPES = frozenset(_SCHEDULE_TYPES)
+_REQUIRED_JOB_FIELDS = ('id', 'name', 'enabled', 'script')
+_REQUIRED_JOB_FIELDS_SET = frozenset(_REQUIRED_JOB_FIELDS)
+# Scheduler-relevant job attributes kept when converting the dict job format
+_JOB_KEYS = ('id', 'name', 'enabled', 'script', 'args', 'schedule')
+
+# Metrics settings used when the config omits them (read-only; copied on use)
+_DEFAULT_METRICS = MappingProxyType({
+    'directory': '/var/lib/scheduler/metrics',
+    'archive_directory': '/var/lib/scheduler/metrics_archive',
+    'enable_archive': True,
+    'port': 8000,
+    'host': '0.0.0.0',
+    'retention_days': 14
+})
+
+
+def _scheduler_job(job_id: str, job_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Project a dict-format job entry onto the scheduler job attributes.
+    
+    Args:
+        job_id: Key of the job in the jobs mapping (default id and name)
+        job_config: Job configuration from the YAML file
+        
+    Returns:
+        Job dictionary with only the scheduler-relevant attributes
+    """
+    # Defaults are built per job so args/schedule are never shared between jobs
+    job = {'id': job_id, 'name': job_id, 'enabled': True, 'script': None, 'args': [], 'schedule': {}}
+    job.update((key, job_config[key]) for key in _JOB_KEYS if key in job_config)
+    return job
+
+
+def _freeze(value: Any) -> Any:
+    """Return a read-only view of a loaded config: dicts become MappingProxyType, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _disk_cache_dir() -> Optional[str]:
+    """Return the configured cache directory if it is safe to use, else None.
+    
+    Entries are trusted as validated config, so the directory must be a real
+    directory owned by this user that nobody else can write to.
+    """
+    cache_dir = os.environ.get(_DISK_CACHE_ENV_VAR)
+    if not cache_dir:
+        return None
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        st = os.lstat(cache_dir)
+    except OSError as e:
+        _LOGGER.warning(f"Config cache directory {cache_dir} is not usable: {e}")
+        return None
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o022:
+        _LOGGER.warning(
+            f"Ignoring config cache directory {cache_dir}: it must be a directory owned by "
+            f"the current user and not writable by group or others"
+        )
+        return None
+    return cache_dir
+
+
+def _disk_cache_path(config_path: str, environment: str) -> Optional[str]:
+    """Return the on-disk cache file for this config, or None if disabled.
+    
+    The name hashes the file content, the environment and the values of the
+    environment variables the file interpolates (${oc.env:...} and
+    ${env_required:...}); unrelated variables do not affect the key.
+    """
+    cache_dir = _disk_cache_dir()
+    if not cache_dir:
+        return None
+    with open(config_path, 'rb') as f:
+        content = f.read()
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(content)
+    digest.update(environment.encode('utf-8'))
+    for name in sorted(set(_ENV_REFERENCE.findall(content))):
+        value = os.environb.get(name)
+        # Unset and empty are different inputs to the resolvers
+        digest.update(name + (b'=' + value if value is not None else b'') + b'\0')
+    return os.path.join(cache_dir, f"{digest.hexdigest()}_{environment}.json")
+
+
+def _read_disk_cache(path: str) -> Optional[Dict[str, Any]]:
+    """Load a cached config, or None if it is missing or unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            config = json.load(f)
+        os.utime(path)  # Mark as recently used for eviction
+        return config
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        _LOGGER.warning(f"Ignoring unreadable config cache file {path}: {e}")
+        return None
+
+
+def _write_disk_cache(path: str, config: Dict[str, Any]):
+    """Atomically store a validated config and evict the oldest entries."""
+    cache_dir = os.path.dirname(path)
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(config, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        
+        entries = sorted(glob.glob(os.path.join(cache_dir, '*.json')), key=os.path.getmtime)
+        for stale in entries[:-_DISK_CACHE_ENTRIES]:
+            os.unlink(stale)
+    except (OSError, TypeError, ValueError) as e:
+        _LOGGER.warning(f"Could not write config cache file {path}: {e}")
+
+
 class ConfigLoader(BaseConfigLoader):
     """Loads and validates scheduler configuration from YAML files with environment support."""
     
-    def load(self, config_path: str, environment: Optional[str] = None) -> Dict[str, Any]:
+    def load(self, config_path: str, environment: Optional[str] = None, mutable: bool = True) -> Dict[str, Any]:
         """Load configuration from YAML file with environment support.
         
         Args:
             config_path: Path to the YAML configuration file
             environment: Environment name (dev, stg, prod). If None, uses ENVIRONMENT env var
+            mutable: If False, return the cached read-only view (MappingProxyType
+                mappings, tuples for lists) instead of a private deep copy.
+                Much cheaper for callers that only read the config.
             
         Returns:
             Dictionary containing the environment-specific configuration
+            (a read-only mapping when mutable is False)
             
         Raises:
             FileNotFoundError: If the configuration file doesn't exist
@@ -36,10 +193,53 @@ class ConfigLoader(BaseConfigLoader):
                 )
         
         # Validate environment
-        valid_environments = ['local', 'dev', 'stg', 'prod']
-        if environment not in valid_environments:
-            raise ValueError(f"Invalid environment '{environment}'. Must be one of: {valid_environments}")
+        if environment not in _VALID_ENVS:
+            raise ValueError(f"Invalid environment '{environment}'. Must be one of: {list(_ENVIRONMENTS)}")
         
+        # Repeat loads of an unchanged file skip parsing and validation.
+        # Callers mutate the result, so both hits and stores are deep copies.
+        try:
+            file_stat = os.stat(config_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Configuration file not found: {config_path}") from None
+        cache_key = (
+            os.path.abspath(config_path),
+            file_stat.st_mtime_ns,
+            file_stat.st_size,
+            environment,
+            tuple(sorted(os.environ.items())),
+        )
+        cached = _ENV_CONFIG_CACHE.get(cache_key)
+        if cached is not None:
+            _ENV_CONFIG_CACHE.move_to_end(cache_key)
+            config, frozen = cached
+            return copy.deepcopy(config) if mutable else frozen
+        
+        # A fresh process can reuse the config validated by an earlier one
+        disk_path = _disk_cache_path(config_path, environment)
+        env_config = _read_disk_cache(disk_path) if disk_path else None
+        if env_config is None:
+            env_config = self._load_env_config(config_path, environment)
+            if disk_path:
+                _write_disk_cache(disk_path, env_config)
+        
+        frozen = _freeze(env_config)
+        _ENV_CONFIG_CACHE[cache_key] = (copy.deepcopy(env_config), frozen)
+        if len(_ENV_CONFIG_CACHE) > _ENV_CONFIG_CACHE_SIZE:
+            _ENV_CONFIG_CACHE.popitem(last=False)
+        
+        return env_config if mutable else frozen
+    
+    def _load_env_config(self, config_path: str, environment: str) -> Dict[str, Any]:
+        """Parse the YAML file and extract and validate one environment.
+        
+        Args:
+            config_path: Path to the YAML configuration file
+            environment: Validated environment name
+            
+        Returns:
+            Dictionary containing the environment-specific configuration
+        """
         # Use the base class load method which handles environment variables
         full_config = super().load(config_path)
         
@@ -97,39 +297,27 @@ class ConfigLoader(BaseConfigLoader):
             self._validate_metrics(config['metrics'])
         else:
             # Set default metrics configuration if not provided
-            config['metrics'] = {
-                'directory': '/var/lib/scheduler/metrics',
-                'archive_directory': '/var/lib/scheduler/metrics_archive',
-                'enable_archive': True,
-                'port': 8000,
-                'host': '0.0.0.0',
-                'retention_days': 14
-            }
+            config['metrics'] = dict(_DEFAULT_METRICS)
         
         # Validate jobs section
         if 'jobs' in config:
             # Support both dict and list formats
             if isinstance(config['jobs'], dict):
                 # Convert dict format to list format for scheduler compatibility
-                jobs_list = []
-                for job_id, job_config in config['jobs'].items():
-                    # Extract only scheduler-relevant attributes
-                    scheduler_job = {
-                        'id': job_config.get('id', job_id),
-                        'name': job_config.get('name', job_id),
-                        'enabled': job_config.get('enabled', True),
-                        'script': job_config.get('script'),
-                        'args': job_config.get('args', []),
-                        'schedule': job_config.get('schedule', {})
-                    }
-                    jobs_list.append(scheduler_job)
-                config['jobs'] = jobs_list
+                config['jobs'] = [
+                    _scheduler_job(job_id, job_config)
+                    for job_id, job_config in config['jobs'].items()
+                ]
             
             if not isinstance(config['jobs'], list):
                 raise ValueError("Jobs must be a list or dict")
             
             for i, job in enumerate(config['jobs']):
                 self._validate_job(job, i)
+                # Job ids key the advisory lock id cache and per-job lookups;
+                # interned ids compare by identity in those dict lookups
+                if isinstance(job['id'], str):
+                    job['id'] = sys.intern(job['id'])
     
     def _validate_job(self, job: Dict[str, Any], index: int):
         """Validate a single job configuration.
@@ -144,11 +332,12 @@ class ConfigLoader(BaseConfigLoader):
         if not isinstance(job, dict):
             raise ValueError(f"Job {index} must be a dictionary")
         
-        # Required fields
-        required_fields = ['id', 'name', 'enabled', 'script']
-        for field in required_fields:
-            if field not in job:
-                raise ValueError(f"Job {index} missing required field: {field}")
+        # Required fields, all reported at once (in declaration order)
+        missing = _REQUIRED_JOB_FIELDS_SET.difference(job)
+        if missing:
+            fields = [field for field in _REQUIRED_JOB_FIELDS if field in missing]
+            noun = "field" if len(fields) == 1 else "fields"
+            raise ValueError(f"Job {index} missing required {noun}: {', '.join(fields)}")
         
         # Validate enabled field
         if not isinstance(job['enabled'], bool):
@@ -180,9 +369,8 @@ class ConfigLoader(BaseConfigLoader):
         if 'type' not in schedule:
             raise ValueError(f"Job {job_index} schedule missing required field: type")
         
-        valid_schedule_types = ['cron', 'interval', 'date']
-        if schedule['type'] not in valid_schedule_types:
-            raise ValueError(f"Job {job_index} schedule has invalid type '{schedule['type']}'. Must be one of: {valid_schedule_types}")
+        if schedule['type'] not in _VALID_SCHEDULE_TYPES:
+            raise ValueError(f"Job {job_index} schedule has invalid type '{schedule['type']}'. Must be one of: {list(_SCHEDULE_TYPES)}")
         
         if 'args' not in schedule:
             raise ValueError(f"Job {job_index} schedule missing required field: args")
@@ -202,57 +390,31 @@ class ConfigLoader(BaseConfigLoader):
         if not isinstance(metrics, dict):
             raise ValueError("Metrics configuration must be a dictionary")
         
-        # Validate directory
-        if 'directory' in metrics:
-            directory = metrics['directory']
-            if not isinstance(directory, str) or not directory.strip():
-                raise ValueError("Metrics directory must be a non-empty string")
-        else:
-            # Set default directory
-            metrics['directory'] = '/var/lib/scheduler/metrics'
-        
-        # Validate archive_directory (optional)
-        if 'archive_directory' in metrics:
-            archive_dir = metrics['archive_directory']
-            if archive_dir is not None and (not isinstance(archive_dir, str) or not archive_dir.strip()):
-                raise ValueError("Metrics archive_directory must be a non-empty string or None")
-        else:
-            # Set default archive directory
-            metrics['archive_directory'] = '/var/lib/scheduler/metrics_archive'
-        
-        # Validate enable_archive
-        if 'enable_archive' in metrics:
-            enable_archive = metrics['enable_archive']
-            if not isinstance(enable_archive, bool):
-                raise ValueError("Metrics enable_archive must be a boolean")
-        else:
-            # Set default
-            metrics['enable_archive'] = True
-        
-        # Validate port
-        if 'port' in metrics:
-            port = metrics['port']
-            if not isinstance(port, int) or port < 1 or port > 65535:
-                raise ValueError("Metrics port must be an integer between 1 and 65535")
-        else:
-            # Set default port
-            metrics['port'] = 8000
-        
-        # Validate host
-        if 'host' in metrics:
-            host = metrics['host']
-            if not isinstance(host, str) or not host.strip():
-                raise ValueError("Metrics host must be a non-empty string")
-        else:
-            # Set default host
-            metrics['host'] = '0.0.0.0'
-        
-        # Validate retention_days (optional)
-        if 'retention_days' in metrics:
-            retention = metrics['retention_days']
-            if not isinstance(retention, int) or retention < 1:
-                raise ValueError("Metrics retention_days must be a positive integer")
-        else:
-            # Set default
-            metrics['retention_days'] = 14
-    
\ No newline at end of file
+        # Fill in defaults for omitted settings; the defaults themselves pass
+        # the checks below, so every value can be validated unconditionally
+        for key, value in _DEFAULT_METRICS.items():
+            metrics.setdefault(key, value)
+        
+        directory = metrics['directory']
+        if not isinstance(directory, str) or not directory.strip():
+            raise ValueError("Metrics directory must be a non-empty string")
+        
+        # archive_directory may be None to disable archiving
+        archive_dir = metrics['archive_directory']
+        if archive_dir is not None and (not isinstance(archive_dir, str) or not archive_dir.strip()):
+            raise ValueError("Metrics archive_directory must be a non-empty string or None")
+        
+        if not isinstance(metrics['enable_archive'], bool):
+            raise ValueError("Metrics enable_archive must be a boolean")
+        
+        port = metrics['port']
+        if not isinstance(port, int) or port < 1 or port > 65535:
+            raise ValueError("Metrics port must be an integer between 1 and 65535")
+        
+        host = metrics['host']
+        if not isinstance(host, str) or not host.strip():
+            raise ValueError("Metrics host must be a non-empty string")
+        
+        retention = metrics['retention_days']
+        if not isinstance(retention, int) or retention < 1:
+            raise ValueError("Metrics retention_days must be a positive integer")
@@ -5,88 +5,122 @@ Database manager for PostgreSQL connections and advisory locks using SQLAlchemy.
 
 import logging
 import hashlib
+import re
 import contextlib
-from typing import Dict, Any, Optional
-from urllib.parse import quote_plus
-from sqlalchemy import create_engine, text, event
-from sqlalchemy.engine import Engine
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Any, Optional, Set
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine, URL
 from sqlalchemy.exc import SQLAlchemyError, DisconnectionError
 from sqlalchemy.pool import QueuePool
 
 
+_LOGGER = logging.getLogger(__name__)
+
+_SELECT_VERSION_SQL = text("SELECT version()")
+_SELECT_ONE_SQL = text("SELECT 1")
+_TRY_ADVISORY_LOCK_SQL = text("SELECT pg_try_advisory_lock(:lock_id)")
+_ADVISORY_UNLOCK_SQL = text("SELECT pg_advisory_unlock(:lock_id)")
+
+# A successful health check is trusted for this many seconds
+_HEALTH_CHECK_TTL = 5.0
+
+# Leading keyword check for execute_query without copying/upper-casing the SQL
+_SELECT_PREFIX = re.compile(r"\s*SELECT", re.IGNORECASE)
+
+
+def _is_select(query: str) -> bool:
+    """Return True if the query starts with SELECT (after leading whitespace)."""
+    return _SELECT_PREFIX.match(query) is not None
+
+
 class DatabaseManager:
     """Manages PostgreSQL connections and advisory locks for job execution using SQLAlchemy."""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], persistent_lock_connection: bool = False):
         """Initialize the database manager.
         
         Args:
             config: Database configuration dictionary
+            persistent_lock_connection: Take advisory locks on one long-lived
+                connection instead of checking out a pool connection per lock.
+                Meant for the long-running scheduler service.
         """
         self.config = config
-        self.logger = logging.getLogger(__name__)
+        self.logger = _LOGGER
         self._engine: Optional[Engine] = None
-        self._connection_string = self._build_connection_string()
+        self._url = self._build_url()
+        self._connection_string = self._url.render_as_string(hide_password=False)
         self._transaction_connection = None
+        self._persistent_lock_connection = persistent_lock_connection
+        self._lock_connection = None
+        # Serializes use of the shared lock connection and tracks the locks it
+        # holds: session-level advisory locks are re-entrant within a session,
+        # so a second in-process acquire of the same id must be refused here
+        self._lock_guard = threading.Lock()
+        self._held_lock_ids: Set[int] = set()
+        # time.monotonic() of the last successful round trip (0.0 = never)
+        self._last_health_ok = 0.0
     
-    def _build_connection_string(self) -> str:
-        """Build PostgreSQL connection string from config.
+    def _build_url(self) -> URL:
+        """Build the PostgreSQL connection URL from config.
+        
+        URL.create handles escaping of special characters in every component
+        (not just the password) and leaves the password out when unset.
         
         Returns:
-            PostgreSQL connection string
+            SQLAlchemy URL for the psycopg2 driver
         """
-        # Extract connection parameters
-        host = self.config.get('host', 'localhost')
-        port = self.config.get('port', 5432)
-        dbname = self.config.get('name', 'scheduler')
-        user = self.config.get('user', 'scheduler')
-        password = self.config.get('password')
-        sslmode = self.config.get('ssl_mode', 'prefer')
-        connect_timeout = self.config.get('connection_timeout', 10)
-        
-        # URL-encode password to handle special characters
-        if password:
-            password = quote_plus(password)
-        
-        # Build connection string with URL-encoded password
-        connection_string = (
-            f"postgresql://{user}:{password}@{host}:{port}/{dbname}"
-            f"?sslmode={sslmode}&connect_timeout={connect_timeout}"
+        return URL.create(
+            'postgresql',
+            username=self.config.get('user', 'scheduler'),
+            password=self.config.get('password'),
+            host=self.config.get('host', 'localhost'),
+            # ${oc.env:...} interpolations yield strings; URL.create needs an int
+            port=int(self.config.get('port', 5432)),
+            database=self.config.get('name', 'scheduler'),
+            query={
+                'sslmode': self.config.get('ssl_mode', 'prefer'),
+                'connect_timeout': str(self.config.get('connection_timeout', 10)),
+            },
         )
-        
-        return connection_string
     
     def connect(self):
         """Establish connection to PostgreSQL database using SQLAlchemy."""
         try:
-            # Create engine with connection pooling
+            # Session settings applied once when each connection is opened
+            # (use connect_args rather than a "connect" event listener)
+            connect_args = {
+                'application_name': self.config.get('application_name', 'vm_jobs_scheduler')
+            }
+            statement_timeout_ms = self.config.get('statement_timeout_ms')
+            if statement_timeout_ms:
+                connect_args['options'] = f"-c statement_timeout={int(statement_timeout_ms)}"
+            
+            # Create engine with connection pooling; the pool is sized from the
+            # database config so deployments can match it to max_workers
             self._engine = create_engine(
-                self._connection_string,
+                self._url,
                 poolclass=QueuePool,
-                pool_size=5,
-                max_overflow=10,
+                pool_size=self.config.get('pool_size', 5),
+                max_overflow=self.config.get('max_overflow', 10),
                 pool_pre_ping=True,  # Verify connections before use
-                pool_recycle=3600,   # Recycle connections after 1 hour
+                pool_recycle=self.config.get('pool_recycle', 3600),  # Recycle connections after 1 hour
+                pool_use_lifo=self.config.get('pool_use_lifo', True),  # Keep a few connections hot
+                connect_args=connect_args,
+                executemany_mode='values_plus_batch',  # psycopg2: batch executemany of text() statements
                 echo=False,          # Set to True for SQL debugging
                 future=True          # Use SQLAlchemy 2.0 style
             )
             
-            # Add connection event listeners
-            try:
-                @event.listens_for(self._engine, "connect")
-                def set_sqlite_pragma(dbapi_connection, connection_record):
-                    """Set autocommit mode for advisory locks."""
-                    # PostgreSQL doesn't need special pragma settings
-                    pass
-            except Exception:
-                # Skip event listener setup if engine doesn't support it (e.g., in tests)
-                pass
-            
             # Test the connection
             with self._engine.connect() as conn:
-                result = conn.execute(text("SELECT version()"))
+                result = conn.execute(_SELECT_VERSION_SQL)
                 version = result.scalar()
                 self.logger.info(f"Connected to PostgreSQL database: {version}")
+                self._last_health_ok = time.monotonic()
             
             self.logger.info("SQLAlchemy engine created successfully")
             
@@ -96,6 +130,7 @@ class DatabaseManager:
     
     def disconnect(self):
         """Close the database engine and all connections."""
+        self._close_lock_connection()
         if self._engine:
             try:
                 self._engine.dispose()
@@ -104,17 +139,27 @@ class DatabaseManager:
                 self.logger.warning(f"Error closing database engine: {e}")
             finally:
                 self._engine = None
+                self._last_health_ok = 0.0
     
     def is_connected(self) -> bool:
-        """Check if database engine is active and can connect."""
+        """Check if database engine is active and can connect.
+        
+        A check that succeeded within the last _HEALTH_CHECK_TTL seconds is
+        reused instead of running another SELECT 1.
+        """
         if not self._engine:
             return False
         
+        if time.monotonic() - self._last_health_ok < _HEALTH_CHECK_TTL:
+            return True
+        
         try:
             with self._engine.connect() as conn:
-                conn.execute(text("SELECT 1"))
-                return True
+                conn.execute(_SELECT_ONE_SQL)
+            self._last_health_ok = time.monotonic()
+            return True
         except SQLAlchemyError:
+            self._last_health_ok = 0.0
             return False
     
     def ensure_connection(self):
@@ -123,11 +168,14 @@ class DatabaseManager:
             self.logger.info("Database connection lost, reconnecting...")
             self.connect()
     
-    def _generate_lock_id(self, job_id: str) -> int:
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _generate_lock_id(job_id: str) -> int:
         """Generate a consistent integer lock ID from job_id.
         
         PostgreSQL advisory locks require a bigint (64-bit integer).
         We'll use a hash of the job_id to generate a consistent lock ID.
+        The ID only depends on job_id, so it is memoized across managers.
         
         Args:
             job_id: Job identifier string
@@ -135,19 +183,90 @@ class DatabaseManager:
         Returns:
             Integer lock ID for PostgreSQL advisory lock
         """
-        # Use SHA-256 hash and take first 8 bytes to create a 64-bit integer
-        hash_obj = hashlib.sha256(job_id.encode('utf-8'))
-        hash_bytes = hash_obj.digest()[:8]
-        
-        # Convert to signed 64-bit integer
-        lock_id = int.from_bytes(hash_bytes, byteorder='big', signed=True)
+        # BLAKE2b can emit exactly the 8 bytes needed for a 64-bit integer
+        hash_bytes = hashlib.blake2b(job_id.encode('utf-8'), digest_size=8).digest()
         
-        # Ensure it's positive (PostgreSQL advisory locks work better with positive numbers)
-        if lock_id < 0:
-            lock_id = -lock_id
+        # Clear the sign bit so the ID is a non-negative PostgreSQL bigint
+        lock_id = int.from_bytes(hash_bytes, byteorder='big') & 0x7FFF_FFFF_FFFF_FFFF
         
         return lock_id
     
+    def _get_lock_connection(self):
+        """Return the shared advisory lock connection, opening it if needed.
+        
+        Must be called with _lock_guard held.
+        """
+        connection = self._lock_connection
+        if connection is not None and (connection.closed or connection.invalidated):
+            # The session (and every lock it held) is gone; start over
+            self._close_lock_connection_locked()
+            connection = None
+        if connection is None:
+            connection = self._engine.connect().execution_options(isolation_level='AUTOCOMMIT')
+            self._lock_connection = connection
+            self.logger.debug("Opened persistent advisory lock connection")
+        return connection
+    
+    def _close_lock_connection_locked(self):
+        """Close the shared lock connection; must be called with _lock_guard held."""
+        if self._lock_connection is not None:
+            try:
+                self._lock_connection.close()
+            except SQLAlchemyError as e:
+                self.logger.warning(f"Error closing advisory lock connection: {e}")
+            finally:
+                self._lock_connection = None
+                self._held_lock_ids.clear()
+    
+    def _close_lock_connection(self):
+        """Close the shared lock connection, releasing any locks it holds."""
+        with self._lock_guard:
+            self._close_lock_connection_locked()
+    
+    @contextlib.contextmanager
+    def _shared_advisory_lock(self, job_id: str, lock_id: int):
+        """Advisory lock taken on the persistent lock connection."""
+        acquired = False
+        
+        try:
+            with self._lock_guard:
+                if lock_id not in self._held_lock_ids:
+                    connection = self._get_lock_connection()
+                    try:
+                        acquired = bool(connection.execute(_TRY_ADVISORY_LOCK_SQL, {"lock_id": lock_id}).scalar())
+                    except SQLAlchemyError as e:
+                        if getattr(e, 'connection_invalidated', False):
+                            self._close_lock_connection_locked()
+                        raise
+                    if acquired:
+                        self._held_lock_ids.add(lock_id)
+            
+            if acquired:
+                self.logger.debug(f"Acquired advisory lock for job: {job_id} (lock_id: {lock_id})")
+            else:
+                self.logger.warning(f"Could not acquire advisory lock for job: {job_id} (lock_id: {lock_id}) - job already running")
+            
+            yield acquired
+            
+        except SQLAlchemyError as e:
+            self.logger.error(f"Database error during advisory lock operation for job {job_id}: {e}")
+            raise
+        finally:
+            if acquired:
+                with self._lock_guard:
+                    if lock_id in self._held_lock_ids:
+                        self._held_lock_ids.discard(lock_id)
+                        try:
+                            result = self._lock_connection.execute(_ADVISORY_UNLOCK_SQL, {"lock_id": lock_id})
+                            if result.scalar():
+                                self.logger.debug(f"Released advisory lock for job: {job_id} (lock_id: {lock_id})")
+                            else:
+                                self.logger.warning(f"Failed to release advisory lock for job: {job_id} (lock_id: {lock_id})")
+                        except SQLAlchemyError as e:
+                            self.logger.error(f"Error releasing advisory lock for job {job_id}: {e}")
+                            if getattr(e, 'connection_invalidated', False):
+                                self._close_lock_connection_locked()
+    
     @contextlib.contextmanager
     def advisory_lock(self, job_id: str):
         """Context manager for PostgreSQL advisory lock using SQLAlchemy.
@@ -165,6 +284,14 @@ class DatabaseManager:
             SQLAlchemyError: If database operation fails
         """
         lock_id = self._generate_lock_id(job_id)
+        
+        if self._persistent_lock_connection:
+            if not self._engine:
+                self.connect()
+            with self._shared_advisory_lock(job_id, lock_id) as acquired:
+                yield acquired
+            return
+        
         acquired = False
         connection = None
         
@@ -180,7 +307,7 @@ class DatabaseManager:
             connection = connection.execution_options(autocommit=True)
             
             # Try to acquire advisory lock
-            result = connection.execute(text("SELECT pg_try_advisory_lock(:lock_id)"), {"lock_id": lock_id})
+            result = connection.execute(_TRY_ADVISORY_LOCK_SQL, {"lock_id": lock_id})
             acquired = result.scalar()
             
             if acquired:
@@ -197,7 +324,7 @@ class DatabaseManager:
             if acquired and connection:
                 try:
                     # Release the advisory lock
-                    result = connection.execute(text("SELECT pg_advisory_unlock(:lock_id)"), {"lock_id": lock_id})
+                    result = connection.execute(_ADVISORY_UNLOCK_SQL, {"lock_id": lock_id})
                     unlocked = result.scalar()
                     
                     if unlocked:
@@ -224,7 +351,7 @@ class DatabaseManager:
             
             # Test basic connection
             with self._engine.connect() as conn:
-                result = conn.execute(text("SELECT version()"))
+                result = conn.execute(_SELECT_VERSION_SQL)
                 version = result.scalar()
                 self.logger.info(f"PostgreSQL version: {version}")
             
@@ -312,7 +439,7 @@ class DatabaseManager:
                 result = conn.execute(text(query))
             
             # For SELECT queries, return results as list of tuples
-            if query.strip().upper().startswith('SELECT'):
+            if _is_select(query):
                 return result.fetchall()
             return None
         else:
@@ -324,32 +451,39 @@ class DatabaseManager:
                     result = conn.execute(text(query))
                 
                 # For SELECT queries, return results as list of tuples
-                if query.strip().upper().startswith('SELECT'):
+                if _is_select(query):
                     return result.fetchall()
                 return None
     
     def execute_batch_insert(self, query: str, params_list: list):
         """Execute a batch insert query using SQLAlchemy with multiple parameter sets.
         
+        All parameter sets are sent in a single executemany call, which the
+        psycopg2 dialect batches into a few round trips (executemany_mode
+        'values_plus_batch') instead of one round trip per row.
+        
         Args:
-            query: SQL INSERT query string with %s placeholders (for psycopg2 style)
-            params_list: List of parameter tuples for batch insert
+            query: SQL INSERT query string with :param_name placeholders
+            params_list: List of parameter dictionaries for batch insert
             
         Returns:
             None
         """
+        if not params_list:
+            return
+        
         # Ensure engine exists
         if not self._engine:
             self.connect()
         
+        statement = text(query)
+        
         # Use transaction connection if available, otherwise create a new connection
         if self._transaction_connection:
             conn = self._transaction_connection
             # Use SQLAlchemy connection for batch operations to maintain transaction consistency
-            for params in params_list:
-                conn.execute(text(query), params)
+            conn.execute(statement, params_list)
         else:
             # Use autocommit connection for standalone batch operations
             with self._engine.connect() as conn:
-                for params in params_list:
-                    conn.execute(text(query), params)
\ No newline at end of file
+                conn.execute(statement, params_list)
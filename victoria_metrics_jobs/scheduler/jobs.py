@@ -3,36 +3,370 @@
 Job execution handlers for Python script jobs.
 """
 
+import atexit
+import gzip
 import logging
+import queue
 import subprocess
 import sys
 import os
 import json
+import threading
 import time
-import re
-from typing import Dict, Any, Optional, Tuple
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import ConfigLoader
 from .database import DatabaseManager
 
 
+# Shared decoder for pulling the result object out of mixed job output
+_JSON_DECODER = json.JSONDecoder()
+
+# Result fields holding (processed, failed) counts per job type, in order of
+# preference; the first numeric value wins
+_JOB_METRIC_FIELDS = {
+    # total_number_published_metrics: metrics written to VM;
+    # apex_data_collected: older result schema
+    'apex_collector': (('total_number_published_metrics', 'apex_data_collected'), ('failed_count',)),
+    'extractor': (('metrics_saved_count',), ()),
+    'metrics_forecast': (('series_processed',), ('failed_series',)),
+    'metrics_extract': (('metrics_saved_count',), ('failed_series',)),
+    'business_date_converter': (('metrics_converted',), ('failed_count',)),
+    # timeseries_* are written by the notebooks; notebooks_* are the fallback
+    'metrics_forecast_notebooks': (
+        ('timeseries_processed', 'notebooks_executed'),
+        ('timeseries_failed', 'notebooks_failed'),
+    ),
+}
+
+# Common field names tried for unknown job types
+_DEFAULT_METRIC_FIELDS = (
+    (
+        'number_of_processed_metrics', 'total_number_published_metrics', 'metrics_saved_count',
+        'series_processed', 'timeseries_processed', 'processed_count', 'apex_data_collected',
+        'processed_entries', 'metrics_converted', 'notebooks_executed',
+    ),
+    ('number_of_failed_metrics', 'failed_count', 'failed_series', 'timeseries_failed', 'notebooks_failed'),
+)
+
+_DEFAULT_METRIC_FIELD_NAMES = frozenset(_DEFAULT_METRIC_FIELDS[0] + _DEFAULT_METRIC_FIELDS[1])
+
+_NUMERIC_TYPES = (int, float)
+
+
+def _first_int(job_results: Dict[str, Any], fields: Tuple[str, ...]) -> Optional[int]:
+    """Return the first numeric value among fields as an int, or None.
+    
+    Booleans are not counts: JSON true/false decode to bool, a subclass of
+    int, so the exact type is checked rather than isinstance.
+    """
+    for field in fields:
+        value = job_results.get(field)
+        if type(value) in _NUMERIC_TYPES:
+            return int(value)
+    return None
+
+
+# Batches with at least this many lines are gzip-compressed before sending.
+# Level 1: the repeated label sets of Prometheus text already compress well
+# at the fastest level, and the flusher thread should not be CPU-bound
+_GZIP_MIN_LINES = 50
+_GZIP_LEVEL = 1
+
+
+class _MetricsFlusher:
+    """Sends job metrics to Victoria Metrics from one background thread.
+    
+    Jobs enqueue their Prometheus lines and return; the thread batches
+    everything that arrives within flush_interval seconds (up to batch_size
+    lines) into one POST per target, over a shared keep-alive session.
+    """
+    
+    # Queue item asking the thread to send what it has and signal an Event
+    _FLUSH = object()
+    
+    def __init__(self, batch_size: int = 500, flush_interval: float = 0.2, max_queued: int = 10_000):
+        self.logger = logging.getLogger(__name__)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queued)
+        self._session = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+    
+    def enqueue(self, import_url: str, headers: Dict[str, str], timeout: float, lines: List[str]):
+        """Queue metric lines for import_url; drops them if the queue is full."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((import_url, tuple(sorted(headers.items())), timeout, lines))
+        except queue.Full:
+            self.logger.warning("Metrics queue full, dropping %s metric lines for %s", len(lines), import_url)
+    
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Send everything queued so far; returns False if it did not finish in time."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put((self._FLUSH, done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+    
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                # Single flusher thread talking to one VM endpoint: a small
+                # keep-alive pool is enough to reuse the TCP/TLS connection
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+                self._thread = threading.Thread(target=self._run, name="vm-metrics-flusher", daemon=True)
+                self._thread.start()
+    
+    def _run(self):
+        while True:
+            batches: Dict[Tuple[Any, ...], List[str]] = {}
+            pending = 0
+            flush_events = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self._flush_interval
+            while True:
+                if isinstance(item, tuple) and item[0] is self._FLUSH:
+                    flush_events.append(item[1])
+                    break
+                import_url, headers, timeout, lines = item
+                batches.setdefault((import_url, headers, timeout), []).extend(lines)
+                pending += len(lines)
+                remaining = deadline - time.monotonic()
+                if pending >= self._batch_size or remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            
+            for (import_url, headers, timeout), lines in batches.items():
+                self._send(import_url, dict(headers), timeout, lines)
+            for event in flush_events:
+                event.set()
+    
+    def _send(self, import_url: str, headers: Dict[str, str], timeout: float, lines: List[str]):
+        # Encode the batch once; a str body would be re-encoded by http.client
+        # as latin-1, which also breaks on non-ASCII job ids
+        payload = '\n'.join(lines).encode('utf-8') + b'\n'
+        if len(lines) >= _GZIP_MIN_LINES:
+            # Repeated label sets compress well; VM's import endpoint accepts gzip
+            payload = gzip.compress(payload, compresslevel=_GZIP_LEVEL)
+            headers = {**headers, 'Content-Encoding': 'gzip'}
+        try:
+            response = self._session.post(
+                import_url,
+                data=payload,
+                headers=headers,
+                timeout=timeout
+            )
+            response.raise_for_status()
+            self.logger.debug("Wrote %s metric lines to Victoria Metrics", len(lines))
+        except Exception as e:
+            self.logger.warning("Failed to write %s metric lines to Victoria Metrics: %s", len(lines), e)
+
+
+_METRICS_FLUSHER = _MetricsFlusher()
+atexit.register(_METRICS_FLUSHER.flush)
+
+# Lines of each child output stream kept in memory (the tail is kept)
+_OUTPUT_TAIL_LINES = 10_000
+# Largest JSON result block tracked while scanning child stdout
+_RESULT_BLOCK_MAX_CHARS = 1_000_000
+
+
+class _OutputCapture:
+    """Reads a child process stream on a thread, keeping only its last lines.
+    
+    With keep_json_result, blocks of lines starting with '{' are also checked
+    for a complete JSON object as they arrive. The first decoded object is
+    kept as json_result, so the job's result is available as soon as it is
+    printed, and the last block's text is remembered so it survives even
+    when it scrolled out of the kept tail.
+    """
+    
+    def __init__(self, stream, keep_json_result: bool = False):
+        self._stream = stream
+        self._keep_json_result = keep_json_result
+        self._tail = deque(maxlen=_OUTPUT_TAIL_LINES)
+        self._lines_seen = 0
+        self._block: Optional[List[str]] = None
+        self._block_chars = 0
+        self.last_json_block: Optional[str] = None
+        self.json_result: Optional[Dict[str, Any]] = None
+        self._thread = threading.Thread(target=self._read, daemon=True)
+        self._thread.start()
+    
+    def _read(self):
+        with self._stream:
+            for line in self._stream:
+                self._lines_seen += 1
+                self._tail.append(line)
+                if self._keep_json_result:
+                    self._track_json(line)
+    
+    def _track_json(self, line: str):
+        # A '{' in column 0 starts a new top-level object (nested lines of
+        # pretty-printed JSON are indented); other lines only extend a block
+        if line.startswith('{') or (self._block is None and line.lstrip().startswith('{')):
+            self._block = []
+            self._block_chars = 0
+        if self._block is None:
+            return
+        
+        self._block.append(line)
+        self._block_chars += len(line)
+        if line.rstrip().endswith('}'):
+            text = ''.join(self._block)
+            try:
+                result, _ = _JSON_DECODER.raw_decode(text, len(text) - len(text.lstrip()))
+                if self.json_result is None:
+                    self.json_result = result
+                self.last_json_block = text
+                self._block = None
+                return
+            except json.JSONDecodeError as e:
+                if e.pos < len(text.rstrip()):
+                    # Failed before the end of the buffer: this is not JSON
+                    # (JSON strings cannot span lines), not a truncated object
+                    # waiting for more lines, so stop re-decoding it
+                    self._block = None
+                    return
+        if self._block_chars > _RESULT_BLOCK_MAX_CHARS:
+            self._block = None
+    
+    def text(self) -> str:
+        """Wait for the stream to close and return the kept output."""
+        self._thread.join()
+        output = ''.join(self._tail)
+        if self._lines_seen > len(self._tail) and self.last_json_block:
+            # Truncated: put the result back in front of the tail
+            output = self.last_json_block + output
+        return output
+
+
+# Script paths already seen on disk. Only hits are remembered, so a missing
+# script is re-checked on every run and starts working once it appears
+_KNOWN_SCRIPTS: set = set()
+
+
+def _script_exists(script_path: str) -> bool:
+    """Return whether a job script exists, stat-ing each path only until found.
+    
+    A script deleted after its first run is reported by the interpreter
+    instead ("can't open file"), which fails the run the same way.
+    """
+    if script_path in _KNOWN_SCRIPTS:
+        return True
+    if os.path.exists(script_path):
+        _KNOWN_SCRIPTS.add(script_path)
+        return True
+    return False
+
+
+@lru_cache(maxsize=512)
+def _metric_labels(job_id: str) -> str:
+    """Return the Prometheus label set for a job's vmj_* metrics."""
+    # Escape per the text exposition format: backslash, double quote, newline
+    escaped = job_id.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return f'{{job="vmj",vmj_job="{escaped}"}}'
+
+
+def _vm_target(vm_config: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, str], float]]:
+    """Resolve a victoria_metrics config section to (import_url, headers, timeout).
+    
+    Returns None when no gateway_url is configured.
+    """
+    gateway_url = vm_config.get('gateway_url', '')
+    if not gateway_url:
+        return None
+    
+    # Ensure gateway_url doesn't have /api/v1/import/prometheus if it's already in the URL
+    if gateway_url.endswith('/api/v1/import/prometheus'):
+        import_url = gateway_url
+    elif gateway_url.endswith('/api/v1/write'):
+        # Replace /write with /import/prometheus
+        import_url = gateway_url.replace('/api/v1/write', '/api/v1/import/prometheus')
+    else:
+        # Append the endpoint
+        import_url = f"{gateway_url.rstrip('/')}/api/v1/import/prometheus"
+    
+    headers = {'Content-Type': 'text/plain'}
+    vm_token = vm_config.get('token', '')
+    if vm_token:
+        headers['Authorization'] = f'Bearer {vm_token}'
+    
+    return import_url, headers, vm_config.get('timeout', 30)
+
+
+@lru_cache(maxsize=16)
+def _env_vm_target(config_path: str, mtime_ns: int) -> Optional[Tuple[str, Dict[str, str], float]]:
+    """Resolve the environment config's Victoria Metrics target.
+    
+    mtime_ns is part of the cache key only, so an edited config file is
+    loaded again while unchanged ones are shared across JobExecutors.
+    """
+    env_config = ConfigLoader().load(config_path, mutable=False)
+    return _vm_target(env_config.get('victoria_metrics') or {})
+
+
 class JobExecutor:
     """Executes Python script jobs with advisory locking."""
     
     def __init__(
         self,
         database_manager: Optional[DatabaseManager],
-        config_path: str
+        config_path: str,
+        allow_unlocked: bool = False
     ):
         """Initialize the job executor.
         
         Args:
-            database_manager: Database manager for advisory locks (optional)
+            database_manager: Database manager for advisory locks
             config_path: Path to the configuration file (required)
+            allow_unlocked: Run jobs without advisory locks when there is no
+                database manager; must be chosen explicitly
+            
+        Raises:
+            ValueError: If database_manager is None and allow_unlocked is False
         """
         self.logger = logging.getLogger(__name__)
         self.database_manager = database_manager
         self.config_path = config_path
+        # Jobs currently running in this process; checked before the DB lock
+        self._running_jobs: set = set()
+        self._running_guard = threading.Lock()
+        # Locking is decided once here rather than on every run; running
+        # unlocked is an explicit opt-in because overlapping runs go undetected
+        if database_manager:
+            self._run_job = self._execute_locked
+        elif allow_unlocked:
+            self.logger.warning(
+                "No database manager configured - jobs will run WITHOUT advisory locks; "
+                "overlapping runs across scheduler instances are not prevented"
+            )
+            self._run_job = self._execute_unlocked
+        else:
+            raise ValueError(
+                "Advisory locking requires a database manager; configure a 'database' "
+                "section or set allow_unlocked_jobs: true to run jobs without locks"
+            )
     
     def execute_job(self, job_config: Dict[str, Any]):
         """Execute a job script based on its configuration with advisory locking.
@@ -44,54 +378,59 @@ class JobExecutor:
         script = job_config.get('script')
         job_type = job_config.get('job_type', '')
         
-        start_time = time.time()
-        start_timestamp = start_time
-        end_timestamp = start_time
+        # One wall-clock read for the start timestamp; the duration comes from
+        # the monotonic counter, so the end timestamp is derived from both
+        start_wall_ns = time.time_ns()
+        start_perf_ns = time.perf_counter_ns()
+        elapsed_ns = 0
+        claimed = False
         status = 'failure'
         stdout_output = ''
         stderr_output = ''
+        job_results = None
         
-        self.logger.info(f"Executing job: {job_id} (script: {script})")
+        self.logger.info("Executing job: %s (script: %s)", job_id, script)
         
         try:
             if not script:
                 raise ValueError("Job missing 'script' field")
             
-            # Use advisory lock if database manager is available
-            if self.database_manager:
-                with self.database_manager.advisory_lock(job_id) as lock_acquired:
-                    if not lock_acquired:
-                        self.logger.warning(f"Job {job_id} is already running, skipping execution")
-                        return
-                    
-                    # Execute the job within the lock
-                    stdout_output, stderr_output = self._execute_python_job(job_config)
-            else:
-                # Execute without locking if no database manager
-                self.logger.warning(f"No database manager available, executing job {job_id} without locking")
-                stdout_output, stderr_output = self._execute_python_job(job_config)
+            # In-process check first: an overlapping run from this scheduler is
+            # rejected without a round trip to the database
+            claimed = self._claim_job(job_id)
+            if not claimed:
+                self.logger.warning("Job %s is already running in this process, skipping execution", job_id)
+                return
             
-            end_timestamp = time.time()
+            output = self._run_job(job_config)
+            if output is None:
+                return
+            stdout_output, stderr_output, job_results = output
+            
+            elapsed_ns = time.perf_counter_ns() - start_perf_ns
             status = 'success'
-            self.logger.info(f"Job {job_id} completed successfully")
+            self.logger.info("Job %s completed successfully", job_id)
             
         except Exception as e:
-            end_timestamp = time.time()
+            elapsed_ns = time.perf_counter_ns() - start_perf_ns
             status = 'failure'
-            self.logger.error(f"Job {job_id} failed: {e}")
+            self.logger.error("Job %s failed: %s", job_id, e)
             raise
         finally:
+            if claimed:
+                self._release_job(job_id)
+            
             # Extract and write metrics to Victoria Metrics
             try:
-                # Parse job results from JSON output
-                job_results = self._parse_job_results(stdout_output, stderr_output)
-                
-                # Calculate runtime in milliseconds
-                run_time_ms = int((end_timestamp - start_timestamp) * 1000)
+                # Use the result captured while the job ran; only scan the
+                # output again when none was seen
+                if job_results is None:
+                    job_results = self._parse_job_results(stdout_output, stderr_output)
                 
-                # Convert timestamps to milliseconds
-                start_time_ms = int(start_timestamp * 1000)
-                end_time_ms = int(end_timestamp * 1000)
+                # Runtime and timestamps in milliseconds
+                run_time_ms = elapsed_ns // 1_000_000
+                start_time_ms = start_wall_ns // 1_000_000
+                end_time_ms = (start_wall_ns + elapsed_ns) // 1_000_000
                 
                 # Extract job-specific metrics
                 processed_metrics, failed_metrics = self._extract_job_metrics(job_results, job_type, job_id)
@@ -107,7 +446,58 @@ class JobExecutor:
                     failed_metrics=failed_metrics
                 )
             except Exception as metrics_error:
-                self.logger.warning(f"Failed to write metrics for job {job_id}: {metrics_error}")
+                self.logger.warning("Failed to write metrics for job %s: %s", job_id, metrics_error)
+    
+    def _claim_job(self, job_id: str) -> bool:
+        """Mark a job as running in this process.
+        
+        Args:
+            job_id: Job identifier
+            
+        Returns:
+            True if the job was not already running in this process
+        """
+        with self._running_guard:
+            if job_id in self._running_jobs:
+                return False
+            self._running_jobs.add(job_id)
+            return True
+    
+    def _release_job(self, job_id: str):
+        """Clear the in-process running mark set by _claim_job."""
+        with self._running_guard:
+            self._running_jobs.discard(job_id)
+    
+    def _execute_locked(self, job_config: Dict[str, Any]):
+        """Execute a job while holding its advisory lock.
+        
+        Args:
+            job_config: Job configuration dictionary
+            
+        Returns:
+            The _execute_python_job result, or None if another scheduler
+            instance holds the lock
+        """
+        job_id = job_config.get('id', 'unknown')
+        with self.database_manager.advisory_lock(job_id) as lock_acquired:
+            if not lock_acquired:
+                self.logger.warning("Job %s is already running, skipping execution", job_id)
+                return None
+            return self._execute_python_job(job_config)
+    
+    def _execute_unlocked(self, job_config: Dict[str, Any]):
+        """Execute a job without an advisory lock (allow_unlocked opt-in).
+        
+        Args:
+            job_config: Job configuration dictionary
+            
+        Returns:
+            The _execute_python_job result
+        """
+        self.logger.warning(
+            "Executing job %s without advisory locking", job_config.get('id', 'unknown')
+        )
+        return self._execute_python_job(job_config)
     
     def _execute_python_job(self, job_config: Dict[str, Any]):
         """Execute a Python script job.
@@ -116,7 +506,8 @@ class JobExecutor:
             job_config: Job configuration dictionary
             
         Returns:
-            Tuple of (stdout_output, stderr_output) strings
+            Tuple of (stdout_output, stderr_output, job_results), where
+            job_results is the result JSON captured from stdout or None
         """
         script = job_config.get('script')
         args = job_config.get('args', [])
@@ -143,9 +534,10 @@ class JobExecutor:
             args: Command line arguments to pass to the script
             
         Returns:
-            Tuple of (stdout_output, stderr_output) strings
+            Tuple of (stdout_output, stderr_output, job_results), where
+            job_results is the result JSON captured from stdout or None
         """
-        self.logger.debug(f"Executing Python script/module: {script_path}")
+        self.logger.debug("Executing Python script/module: %s", script_path)
         
         try:
             # Prepare command
@@ -154,33 +546,48 @@ class JobExecutor:
                 cmd = [sys.executable] + args
             else:
                 # Script execution: check if file exists
-                if not os.path.exists(script_path):
+                if not _script_exists(script_path):
                     raise FileNotFoundError(f"Python script not found: {script_path}")
                 cmd = [sys.executable, script_path] + args
             
-            # Execute the script/module
-            result = subprocess.run(
+            # Execute the script/module, reading its output as it is produced so
+            # only a bounded tail is kept in memory however much a job logs
+            process = subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=300  # 5 minute timeout
+                bufsize=1
             )
-            
-            if result.stdout:
-                self.logger.info(f"Script stdout: {result.stdout}")
-            
-            if result.stderr:
-                self.logger.warning(f"Script stderr: {result.stderr}")
-            
-            if result.returncode != 0:
+            stdout_capture = _OutputCapture(process.stdout, keep_json_result=True)
+            stderr_capture = _OutputCapture(process.stderr)
+            try:
+                returncode = process.wait(timeout=300)  # 5 minute timeout
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                raise
+            finally:
+                stdout = stdout_capture.text()
+                stderr = stderr_capture.text()
+            
+            # Lazy %s formatting: job output can be large and INFO is often
+            # filtered out in production
+            if stdout and self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Script stdout: %s", stdout)
+            
+            if stderr:
+                self.logger.warning("Script stderr: %s", stderr)
+            
+            if returncode != 0:
                 raise subprocess.CalledProcessError(
-                    result.returncode,
+                    returncode,
                     cmd,
-                    result.stdout,
-                    result.stderr
+                    stdout,
+                    stderr
                 )
             
-            return result.stdout, result.stderr
+            return stdout, stderr, stdout_capture.json_result
                 
         except subprocess.TimeoutExpired as e:
             raise TimeoutError(f"Script timed out: {e}")
@@ -192,7 +599,7 @@ class JobExecutor:
         
         Jobs output JSON results to stdout. This method extracts and parses it.
         Handles cases where log messages are mixed with JSON output by finding
-        the JSON object and extracting it even if log lines appear before, after, or between JSON lines.
+        the first complete JSON object, even if log lines appear before or after it.
         
         Args:
             stdout: Standard output from job execution
@@ -201,105 +608,32 @@ class JobExecutor:
         Returns:
             Parsed JSON dictionary or None if parsing fails
         """
-        if not stdout or not stdout.strip():
+        stripped = stdout.strip() if stdout else ''
+        if not stripped:
             return None
         
         # First, try to parse the entire stdout as JSON (in case it's clean JSON)
         try:
-            job_results = json.loads(stdout.strip())
-            return job_results
+            return _JSON_DECODER.decode(stripped)
         except json.JSONDecodeError:
             pass
         
-        # If that fails, find the JSON object by tracking brace balance
-        # This handles log messages before, after, or even between JSON lines
-        try:
-            lines = stdout.split('\n')
-            json_start = None
-            brace_count = 0
-            json_lines = []
-            in_json = False
-            
-            for line in lines:
-                # Check if this line contains part of the JSON
-                if '{' in line or in_json:
-                    if not in_json:
-                        # Find where JSON starts in this line
-                        json_start_idx = line.find('{')
-                        if json_start_idx >= 0:
-                            in_json = True
-                            # Start collecting from the opening brace
-                            json_lines.append(line[json_start_idx:])
-                            brace_count = line[json_start_idx:].count('{') - line[json_start_idx:].count('}')
-                        else:
-                            # Already in JSON but no { in this line, might be continuation
-                            json_lines.append(line)
-                            brace_count += line.count('{') - line.count('}')
-                    else:
-                        # Already collecting JSON, add this line
-                        json_lines.append(line)
-                        brace_count += line.count('{') - line.count('}')
-                    
-                    # Check if JSON is complete (balanced braces)
-                    if in_json and brace_count == 0:
-                        # Found complete JSON object
-                        json_str = '\n'.join(json_lines)
-                        try:
-                            job_results = json.loads(json_str)
-                            return job_results
-                        except json.JSONDecodeError:
-                            # Might be incomplete, continue collecting
-                            pass
-        except (AttributeError, IndexError) as e:
-            self.logger.debug(f"Error parsing JSON by line tracking: {e}")
-        
-        # Alternative approach: find JSON by looking for the last complete JSON object
-        # This works when JSON is at the end of output
-        try:
-            # Reverse search: find the last { and work forward to find complete object
-            last_brace_idx = stdout.rfind('{')
-            if last_brace_idx >= 0:
-                # Extract from this point and try to find complete JSON
-                remaining = stdout[last_brace_idx:]
-                brace_count = 0
-                json_end = None
-                
-                for i, char in enumerate(remaining):
-                    if char == '{':
-                        brace_count += 1
-                    elif char == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            json_end = i + 1
-                            break
-                
-                if json_end:
-                    json_str = remaining[:json_end]
-                    job_results = json.loads(json_str)
-                    return job_results
-        except (json.JSONDecodeError, AttributeError, IndexError) as e:
-            self.logger.debug(f"Error parsing JSON by reverse search: {e}")
-        
-        # Last resort: try to find any JSON-like structure using regex
-        # This is less reliable but might catch edge cases
-        try:
-            # Look for JSON object pattern, handling nested structures
-            # Match from { to } with balanced braces
-            pattern = r'\{[^{}]*(?:\{[^{}]*(?:\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}[^{}]*)*\}[^{}]*)*\}'
-            json_match = re.search(pattern, stdout, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                job_results = json.loads(json_str)
+        # If that fails, scan forward from each '{' and let the C decoder find
+        # where a complete object ends; log lines before, after or around the
+        # JSON are skipped. Returns the first object that decodes.
+        pos = stdout.find('{')
+        while pos >= 0:
+            try:
+                job_results, _ = _JSON_DECODER.raw_decode(stdout, pos)
                 return job_results
-        except (json.JSONDecodeError, AttributeError) as e:
-            self.logger.debug(f"Error parsing JSON by regex: {e}")
+            except json.JSONDecodeError:
+                pos = stdout.find('{', pos + 1)
         
         # Log a preview of what we received for debugging
-        stdout_preview = stdout[:500] if stdout else "empty"
         self.logger.warning(
-            "Failed to parse JSON from job output. "
-            f"stdout length: {len(stdout) if stdout else 0}, "
-            f"preview: {stdout_preview}"
+            "Failed to parse JSON from job output. stdout length: %s, preview: %s",
+            len(stdout) if stdout else 0,
+            stdout[:500] if stdout else "empty"
         )
         return None
     
@@ -328,101 +662,21 @@ class JobExecutor:
             return None, None
         
         try:
-            # Extract processed metrics based on job_type
-            if job_type == 'apex_collector':
-                # apex_collector returns:
-                # - total_number_published_metrics: total metrics successfully written to VM
-                # - apex_data_collected: number of apex data items collected (legacy/auxiliary)
-                value = job_results.get('total_number_published_metrics')
-                if value is None:
-                    # Backwards compatibility with older result schema
-                    value = job_results.get('apex_data_collected')
-                if value is not None:
-                    processed_metrics = int(value) if isinstance(value, (int, float)) else None
-                # failed_count: number of failed processing operations (unchanged)
-                failed_value = job_results.get('failed_count')
-                if failed_value is not None:
-                    failed_metrics = int(failed_value) if isinstance(failed_value, (int, float)) else None
-            
-            elif job_type == 'extractor':
-                # extractor returns:
-                # - metrics_saved_count: metrics saved to database
-                value = job_results.get('metrics_saved_count')
-                if value is not None:
-                    processed_metrics = int(value) if isinstance(value, (int, float)) else None
-            
-            elif job_type == 'metrics_forecast':
-                # metrics_forecast returns:
-                # - series_processed: number of series forecasted
-                value = job_results.get('series_processed')
-                if value is not None:
-                    processed_metrics = int(value) if isinstance(value, (int, float)) else None
-                # failed_series: number of failed series
-                failed_value = job_results.get('failed_series')
-                if failed_value is not None:
-                    failed_metrics = int(failed_value) if isinstance(failed_value, (int, float)) else None
-            
-            elif job_type == 'metrics_extract':
-                # metrics_extract returns:
-                # - metrics_saved_count: metrics saved to database
-                value = job_results.get('metrics_saved_count')
-                if value is not None:
-                    processed_metrics = int(value) if isinstance(value, (int, float)) else None
-                # failed_series: number of failed series
-                failed_value = job_results.get('failed_series')
-                if failed_value is not None:
-                    failed_metrics = int(failed_value) if isinstance(failed_value, (int, float)) else None
-            
-            elif job_type == 'business_date_converter':
-                # business_date_converter returns:
-                # - metrics_converted: number of metrics converted
-                value = job_results.get('metrics_converted')
-                if value is not None:
-                    processed_metrics = int(value) if isinstance(value, (int, float)) else None
-                # failed_count: number of failed conversions
-                failed_value = job_results.get('failed_count')
-                if failed_value is not None:
-                    failed_metrics = int(failed_value) if isinstance(failed_value, (int, float)) else None
-            
-            elif job_type == 'metrics_forecast_notebooks':
-                # metrics_forecast_notebooks returns (when notebooks write results):
-                # - timeseries_processed: timeseries with successful forecast
-                # - timeseries_failed: timeseries skipped/failed
-                # Fallback: notebooks_executed, notebooks_failed
-                value = job_results.get('timeseries_processed')
-                if value is not None:
-                    processed_metrics = int(value) if isinstance(value, (int, float)) else None
-                if processed_metrics is None:
-                    value = job_results.get('notebooks_executed')
-                    if value is not None:
-                        processed_metrics = int(value) if isinstance(value, (int, float)) else None
-                failed_value = job_results.get('timeseries_failed')
-                if failed_value is not None:
-                    failed_metrics = int(failed_value) if isinstance(failed_value, (int, float)) else None
-                if failed_metrics is None:
-                    failed_value = job_results.get('notebooks_failed')
-                    if failed_value is not None:
-                        failed_metrics = int(failed_value) if isinstance(failed_value, (int, float)) else None
-            
+            known_fields = _JOB_METRIC_FIELDS.get(job_type)
+            if known_fields is not None:
+                processed_fields, failed_fields = known_fields
             else:
-                # Unknown job type, try common field names in order of preference
-                for field in ['number_of_processed_metrics', 'total_number_published_metrics', 'metrics_saved_count', 'series_processed', 'timeseries_processed', 'processed_count', 'apex_data_collected', 'processed_entries', 'metrics_converted', 'notebooks_executed']:
-                    if field in job_results:
-                        value = job_results.get(field)
-                        if value is not None:
-                            processed_metrics = int(value) if isinstance(value, (int, float)) else None
-                            break
-                
-                # Try to find failed metrics
-                for field in ['number_of_failed_metrics', 'failed_count', 'failed_series', 'timeseries_failed', 'notebooks_failed']:
-                    if field in job_results:
-                        failed_value = job_results.get(field)
-                        if failed_value is not None:
-                            failed_metrics = int(failed_value) if isinstance(failed_value, (int, float)) else None
-                            break
-        
+                # Unknown job type: find which candidate fields are present in
+                # one pass, then try only those, in priority order
+                present = _DEFAULT_METRIC_FIELD_NAMES.intersection(job_results)
+                if not present:
+                    return None, None
+                processed_fields = tuple(f for f in _DEFAULT_METRIC_FIELDS[0] if f in present)
+                failed_fields = tuple(f for f in _DEFAULT_METRIC_FIELDS[1] if f in present)
+            processed_metrics = _first_int(job_results, processed_fields)
+            failed_metrics = _first_int(job_results, failed_fields)
         except (AttributeError, TypeError, ValueError) as e:
-            self.logger.warning(f"Error extracting metrics for job {job_id}: {e}")
+            self.logger.warning("Error extracting metrics for job %s: %s", job_id, e)
         
         return processed_metrics, failed_metrics
     
@@ -448,82 +702,47 @@ class JobExecutor:
             failed_metrics: Number of failed metrics (optional)
         """
         try:
-            # Get Victoria Metrics configuration from job config or environment config
-            vm_config = job_config.get('victoria_metrics', {})
-            
-            # If not in job config, try to get from environment config
-            if not vm_config or not vm_config.get('gateway_url'):
-                # Try to load environment config
-                try:
-                    from .config import ConfigLoader
-                    config_loader = ConfigLoader()
-                    env_config = config_loader.load(self.config_path)
-                    vm_config = env_config.get('victoria_metrics', {})
-                except Exception as e:
-                    self.logger.debug(f"Could not load environment config for VM: {e}")
-            
-            gateway_url = vm_config.get('gateway_url', '')
-            if not gateway_url:
-                self.logger.debug(f"Victoria Metrics gateway URL not configured for job {job_id}, skipping metric write")
+            # Per-job Victoria Metrics settings win over the environment config,
+            # which is resolved once per config file version
+            target = _vm_target(job_config.get('victoria_metrics') or {})
+            if target is None:
+                target = self._get_env_vm_target()
+            if target is None:
+                self.logger.debug("Victoria Metrics gateway URL not configured for job %s, skipping metric write", job_id)
                 return
+            import_url, headers, timeout = target
             
             # Build Prometheus text format metrics
-            metrics_lines = []
-            
-            # vmj_run_time
-            metrics_lines.append(f'vmj_run_time{{job="vmj",vmj_job="{job_id}"}} {run_time_ms}')
-            
-            # vmj_start_time
-            metrics_lines.append(f'vmj_start_time{{job="vmj",vmj_job="{job_id}"}} {start_time_ms}')
-            
-            # vmj_end_time
-            metrics_lines.append(f'vmj_end_time{{job="vmj",vmj_job="{job_id}"}} {end_time_ms}')
-            
-            # vmj_number_of_processed_metrics (if available)
+            labels = _metric_labels(job_id)
+            metrics_lines = [
+                f'vmj_run_time{labels} {run_time_ms}',
+                f'vmj_start_time{labels} {start_time_ms}',
+                f'vmj_end_time{labels} {end_time_ms}',
+            ]
+            
+            # Job-reported counts, if available
             if processed_metrics is not None:
-                metrics_lines.append(f'vmj_number_of_processed_metrics{{job="vmj",vmj_job="{job_id}"}} {processed_metrics}')
-            
-            # vmj_number_of_failed_metrics (if available)
+                metrics_lines.append(f'vmj_number_of_processed_metrics{labels} {processed_metrics}')
             if failed_metrics is not None:
-                metrics_lines.append(f'vmj_number_of_failed_metrics{{job="vmj",vmj_job="{job_id}"}} {failed_metrics}')
+                metrics_lines.append(f'vmj_number_of_failed_metrics{labels} {failed_metrics}')
             
-            if not metrics_lines:
-                return
+            # Hand the lines to the background flusher, which batches them with
+            # other jobs' metrics; the job does not wait for the HTTP write
+            _METRICS_FLUSHER.enqueue(import_url, headers, timeout, metrics_lines)
             
-            # Join metrics with newlines
-            metrics_payload = '\n'.join(metrics_lines) + '\n'
+            self.logger.debug("Queued metrics for Victoria Metrics for job %s", job_id)
             
-            # Prepare HTTP request
-            import requests
-            
-            # Ensure gateway_url doesn't have /api/v1/import/prometheus if it's already in the URL
-            if gateway_url.endswith('/api/v1/import/prometheus'):
-                import_url = gateway_url
-            elif gateway_url.endswith('/api/v1/write'):
-                # Replace /write with /import/prometheus
-                import_url = gateway_url.replace('/api/v1/write', '/api/v1/import/prometheus')
-            else:
-                # Append the endpoint
-                import_url = f"{gateway_url.rstrip('/')}/api/v1/import/prometheus"
-            
-            headers = {'Content-Type': 'text/plain'}
-            vm_token = vm_config.get('token', '')
-            if vm_token:
-                headers['Authorization'] = f'Bearer {vm_token}'
-            
-            # Write metrics to Victoria Metrics
-            timeout = vm_config.get('timeout', 30)
-            response = requests.post(
-                import_url,
-                data=metrics_payload,
-                headers=headers,
-                timeout=timeout
-            )
-            response.raise_for_status()
-            
-            self.logger.debug(f"Successfully wrote metrics to Victoria Metrics for job {job_id}")
-            
-        except ImportError:
-            self.logger.warning(f"requests library not available, cannot write metrics to Victoria Metrics for job {job_id}")
         except Exception as e:
-            self.logger.warning(f"Failed to write metrics to Victoria Metrics for job {job_id}: {e}")
\ No newline at end of file
+            self.logger.warning("Failed to write metrics to Victoria Metrics for job %s: %s", job_id, e)
+    
+    def _get_env_vm_target(self) -> Optional[Tuple[str, Dict[str, str], float]]:
+        """Return the environment config's Victoria Metrics target.
+        
+        Shared by every executor on the same config file and re-resolved
+        only when the file's mtime changes.
+        """
+        try:
+            return _env_vm_target(self.config_path, os.stat(self.config_path).st_mtime_ns)
+        except Exception as e:
+            self.logger.debug("Could not load environment config for VM: %s", e)
+            return None
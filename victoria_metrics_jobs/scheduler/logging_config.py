@@ -3,11 +3,28 @@
 Logging configuration for the scheduler service.
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 import sys
-from typing import Optional
+from typing import List, Optional
+
+
+# Background listener that writes queued records to the real handlers
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop_queue_listener() -> None:
+    """Flush queued records and stop the background logging listener."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
 
 
 def setup_logging(
@@ -21,6 +38,10 @@ def setup_logging(
     Logs are rotated weekly at midnight on Monday. Backup files are retained
     for the number of weeks specified by backup_count.
     
+    The root logger only gets a QueueHandler; a QueueListener thread does the
+    formatting and file/console writes, so job threads never wait on disk I/O
+    or the handler locks.
+    
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Path to log file (if None, logs to stdout)
@@ -40,8 +61,10 @@ def setup_logging(
     root_logger = logging.getLogger()
     root_logger.setLevel(numeric_level)
     
-    # Clear existing handlers
+    # Clear existing handlers (and drain the listener of a previous setup)
+    _stop_queue_listener()
     root_logger.handlers.clear()
+    handlers: List[logging.Handler] = []
     
     # Determine log destination
     if log_file:
@@ -63,7 +86,7 @@ def setup_logging(
         )
         file_handler.setLevel(numeric_level)
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
         
         print(f"Logging to file: {log_path}")
         
@@ -73,14 +96,21 @@ def setup_logging(
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(numeric_level)
         console_handler.setFormatter(formatter)
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
     # Also add console handler for development/debugging
     if os.getenv('SCHEDULER_DEBUG', '').lower() in ('true', '1', 'yes'):
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.DEBUG)
         console_handler.setFormatter(formatter)
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
+    
+    # Producers only enqueue records; the listener thread writes them out
+    global _queue_listener
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _queue_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
     
     # Set specific logger levels
     logging.getLogger('apscheduler').setLevel(logging.WARNING)
@@ -6,15 +6,76 @@ Files are organized in YYYY/MM/DD partition structure and cleaned up by schedule
 """
 
 import os
+import hashlib
 import logging
+import re
 import shutil
+import subprocess
+import threading
+import time
+import uuid
+from operator import attrgetter
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 from datetime import date, timedelta
-from flask import Response
+from flask import Response, request, send_file
 
 logger = logging.getLogger(__name__)
 
+# Partition directory names: YYYY/MM/DD
+_YEAR_NAME = re.compile(r'[0-9]{4}').fullmatch
+_MONTH_DAY_NAME = re.compile(r'[0-9]{2}').fullmatch
+
+# How long a rendered directory listing is reused, in seconds
+_LISTING_CACHE_SECONDS = 30
+
+
+def _iter_digit_dirs(parent, match_name, sort: bool = True) -> List[os.DirEntry]:
+    """Return the partition subdirectories of parent whose names match.
+    
+    Uses os.scandir so the directory check comes from the readdir entry type
+    instead of a stat per child. Symlinks are not followed.
+    
+    Args:
+        parent: Directory to scan
+        match_name: _YEAR_NAME or _MONTH_DAY_NAME
+        sort: Order the entries by name; callers that do not display them skip it
+    """
+    with os.scandir(parent) as it:
+        entries = [e for e in it if match_name(e.name) and e.is_dir(follow_symlinks=False)]
+    if sort:
+        entries.sort(key=attrgetter('name'))
+    return entries
+
+
+def _iter_html_parts(notebooks_dir: Path):
+    """Yield the pieces of the notebooks listing HTML, one line per notebook."""
+    yield "<html><head><title>Notebooks</title></head><body><h1>Executed Notebooks</h1><ul>"
+    
+    stem_end = -len('.ipynb')
+    for year_dir in _iter_digit_dirs(notebooks_dir, _YEAR_NAME):
+        for month_dir in _iter_digit_dirs(year_dir.path, _MONTH_DAY_NAME):
+            for day_dir in _iter_digit_dirs(month_dir.path, _MONTH_DAY_NAME):
+                date_str = f"{year_dir.name}/{month_dir.name}/{day_dir.name}"
+                link_prefix = f"/notebooks/{date_str}/"
+                yield f'<li><strong>{date_str}</strong><ul>'
+                
+                # List notebooks for this day
+                with os.scandir(day_dir.path) as it:
+                    names = sorted(
+                        e.name for e in it
+                        if e.name.endswith('.ipynb') and not e.name.startswith('.') and e.is_file()
+                    )
+                for name in names:
+                    yield (
+                        f'<li><a href="{link_prefix}{name}">{name}</a> '
+                        f'(<a href="{link_prefix}{name[:stem_end]}.html">HTML</a>)</li>'
+                    )
+                
+                yield "</ul></li>"
+    
+    yield "</ul></body></html>"
+
 
 class NotebooksFileManager:
     """Manages notebook output files with date-based partitioning.
@@ -27,7 +88,8 @@ class NotebooksFileManager:
         self,
         notebooks_dir: str,
         archive_dir: Optional[str] = None,
-        enable_archive: bool = True
+        enable_archive: bool = True,
+        accel_redirect_prefix: Optional[str] = None
     ):
         """Initialize the notebooks file manager.
         
@@ -35,6 +97,9 @@ class NotebooksFileManager:
             notebooks_dir: Directory for notebook output files
             archive_dir: Optional directory for archived files
             enable_archive: Whether to archive files instead of deleting
+            accel_redirect_prefix: Optional nginx internal location mapped to
+                notebooks_dir; when set, files are handed to nginx with an
+                X-Accel-Redirect header instead of being sent by Python
         """
         self.notebooks_dir = Path(notebooks_dir)
         self.notebooks_dir.mkdir(parents=True, exist_ok=True)
@@ -44,6 +109,14 @@ class NotebooksFileManager:
             self.archive_dir.mkdir(parents=True, exist_ok=True)
         
         self.enable_archive = enable_archive
+        
+        # Expired day directories are renamed in here, then deleted out of band
+        self._trash_dir = self.notebooks_dir / '.trash'
+        self.accel_redirect_prefix = accel_redirect_prefix.rstrip('/') if accel_redirect_prefix else None
+        
+        # Last directory listing: (key, expires_at, html, etag)
+        self._listing_cache: Optional[Tuple[Tuple[str, int], float, str, str]] = None
+        self._listing_lock = threading.Lock()
     
     def _get_partition_path(self, business_date: str) -> Path:
         """Get partition directory path for a given business date.
@@ -72,71 +145,144 @@ class NotebooksFileManager:
         """Cleanup day directories older than max_age_days.
         
         Deletes entire day directories (YYYY/MM/DD/) at once for efficiency.
+        When every day of a month (or every month of a year) has expired, the
+        whole month (or year) directory is moved in one operation instead.
         Also cleans up empty month and year directories after day directories are removed.
         
         Args:
             max_age_days: Maximum age in days before cleanup (default: 14)
             
         Returns:
-            Number of directories removed
+            Number of day directories removed
         """
         cutoff_date = date.today() - timedelta(days=max_age_days)
         removed_dirs = 0
         empty_dirs_removed = 0
         
-        # Iterate through day directories and delete entire directories
-        day_dirs_to_remove = []
-        for year_dir in sorted(self.notebooks_dir.iterdir()):
-            if not year_dir.is_dir() or not year_dir.name.isdigit():
-                continue
-            for month_dir in sorted(year_dir.iterdir()):
-                if not month_dir.is_dir() or not month_dir.name.isdigit():
-                    continue
-                for day_dir in sorted(month_dir.iterdir()):
-                    if not day_dir.is_dir() or not day_dir.name.isdigit():
-                        continue
+        # Collect (partition dir, number of days in it, enclosing dirs that may
+        # become empty). Paths are kept as strings from the scandir entries;
+        # deletion order does not matter, so the entries are not sorted.
+        removals = []
+        for year_entry in _iter_digit_dirs(self.notebooks_dir, _YEAR_NAME, sort=False):
+            year = int(year_entry.name)
+            year_removals = []
+            whole_months = 0
+            for month_entry in _iter_digit_dirs(year_entry.path, _MONTH_DAY_NAME, sort=False):
+                month = int(month_entry.name)
+                expired_days = []
+                for day_entry in _iter_digit_dirs(month_entry.path, _MONTH_DAY_NAME, sort=False):
                     # Extract date from directory path (YYYY/MM/DD)
                     try:
-                        day_date = date.fromisoformat(f"{year_dir.name}-{month_dir.name}-{day_dir.name}")
-                        if day_date < cutoff_date:
-                            day_dirs_to_remove.append((day_dir, year_dir, month_dir))
+                        day_date = date(year, month, int(day_entry.name))
                     except ValueError:
-                        logger.warning(f"Invalid date in directory name: {day_dir}")
+                        logger.warning(f"Invalid date in directory name: {day_entry.path}")
                         continue
+                    if day_date < cutoff_date:
+                        expired_days.append(day_entry.path)
+                
+                if not expired_days:
+                    continue
+                if len(expired_days) == len(os.listdir(month_entry.path)) and self._can_move_whole(month_entry.path):
+                    year_removals.append((month_entry.path, len(expired_days), (year_entry.path,)))
+                    whole_months += 1
+                else:
+                    year_removals.extend(
+                        (day_dir, 1, (month_entry.path, year_entry.path)) for day_dir in expired_days
+                    )
+            
+            if (
+                year_removals
+                and whole_months == len(year_removals) == len(os.listdir(year_entry.path))
+                and self._can_move_whole(year_entry.path)
+            ):
+                removals.append((year_entry.path, sum(days for _, days, _ in year_removals), ()))
+            else:
+                removals.extend(year_removals)
         
-        # Remove day directories
-        for day_dir, year_dir, month_dir in day_dirs_to_remove:
+        # Remove partition directories
+        affected_dirs = set()
+        for partition_dir, days, parent_dirs in removals:
+            relative_path = os.path.relpath(partition_dir, self.notebooks_dir)
             try:
                 if self.archive_dir:
-                    # Archive entire day directory, preserving structure
-                    relative_path = day_dir.relative_to(self.notebooks_dir)
+                    # Archive entire partition directory, preserving structure
                     archive_path = self.archive_dir / relative_path
                     archive_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.move(str(day_dir), str(archive_path))
-                    logger.info(f"Archived day directory: {day_dir.name} (older than {max_age_days} days)")
+                    shutil.move(partition_dir, str(archive_path))
+                    logger.info(f"Archived partition directory: {relative_path} (older than {max_age_days} days)")
                 else:
-                    shutil.rmtree(day_dir)
-                    logger.info(f"Deleted day directory: {day_dir.name} (older than {max_age_days} days)")
-                removed_dirs += 1
+                    # A rename is one metadata operation however many files
+                    # the partition holds; the contents are deleted by _drain_trash
+                    self._trash_dir.mkdir(exist_ok=True)
+                    os.rename(partition_dir, self._trash_dir / uuid.uuid4().hex)
+                    logger.info(f"Deleted partition directory: {relative_path} (older than {max_age_days} days)")
+                removed_dirs += days
+                affected_dirs.update(parent_dirs)
             except Exception as e:
-                logger.error(f"Failed to cleanup day directory {day_dir}: {e}")
-        
-        # Clean up empty month and year directories
-        # Start from deepest level (month) and work up
-        for month_dir in sorted(self.notebooks_dir.rglob("*"), reverse=True):
-            if month_dir.is_dir() and not any(month_dir.iterdir()):
-                try:
-                    month_dir.rmdir()
-                    empty_dirs_removed += 1
-                    logger.debug(f"Removed empty directory: {month_dir}")
-                except Exception as e:
-                    logger.debug(f"Could not remove directory {month_dir}: {e}")
+                logger.error(f"Failed to cleanup partition directory {partition_dir}: {e}")
+        
+        # Clean up month and year directories emptied by the removals; no
+        # other partition can have become empty, so the rest of the tree is
+        # not walked. Longer paths (months) go first so their years can empty too.
+        for partition_dir in sorted(affected_dirs, key=len, reverse=True):
+            try:
+                os.rmdir(partition_dir)
+                empty_dirs_removed += 1
+                logger.debug(f"Removed empty directory: {partition_dir}")
+            except OSError:
+                # Not empty (or already gone)
+                continue
         
         if empty_dirs_removed > 0:
             logger.info(f"Removed {empty_dirs_removed} empty partition directories")
         
+        self._drain_trash()
+        
         return removed_dirs
     
+    def _can_move_whole(self, partition_dir: str) -> bool:
+        """Return whether partition_dir can be removed as one unit.
+        
+        Deleting always can. Archiving can only when the archive has no
+        directory at that place yet; otherwise shutil.move would nest the
+        partition inside it, so its days are archived one by one.
+        """
+        if not self.archive_dir:
+            return True
+        return not (self.archive_dir / os.path.relpath(partition_dir, self.notebooks_dir)).exists()
+    
+    def _drain_trash(self):
+        """Delete everything renamed into the trash directory.
+        
+        On POSIX this starts a detached rm -rf and returns without waiting;
+        cleanup runs in a short-lived job process, so a background thread
+        would be killed when the job exits. Anything left over (e.g. after a
+        crash) is picked up by the next cleanup.
+        """
+        try:
+            with os.scandir(self._trash_dir) as it:
+                entries = [e.path for e in it]
+        except FileNotFoundError:
+            return
+        if not entries:
+            return
+        
+        try:
+            if os.name == 'posix' and shutil.which('rm'):
+                subprocess.Popen(
+                    ['rm', '-rf', '--', *entries],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True
+                )
+                logger.debug(f"Started background removal of {len(entries)} trashed directories")
+            else:
+                for entry in entries:
+                    shutil.rmtree(entry)
+        except Exception as e:
+            logger.error(f"Failed to empty notebooks trash {self._trash_dir}: {e}")
+    
     def serve_notebook_directory_listing(self, notebooks_dir: Path) -> Response:
         """Serve directory listing of available notebooks organized by date.
         
@@ -146,65 +292,66 @@ class NotebooksFileManager:
         Returns:
             Flask Response with HTML directory listing
         """
-        if not notebooks_dir.exists():
+        try:
+            dir_mtime_ns = os.stat(notebooks_dir).st_mtime_ns
+        except FileNotFoundError:
             return Response(
                 "<html><body><h1>Notebooks Directory Not Found</h1></body></html>",
                 mimetype='text/html',
                 status=404
             )
         
-        html_parts = ["<html><head><title>Notebooks</title></head><body>"]
-        html_parts.append("<h1>Executed Notebooks</h1>")
-        html_parts.append("<ul>")
+        # Reuse the last rendering while it is fresh. The top-level mtime only
+        # changes when a year directory is added or removed, so the TTL bounds
+        # how long a new notebook deeper in the tree can be missing.
+        key = (str(notebooks_dir), dir_mtime_ns)
+        now = time.monotonic()
+        with self._listing_lock:
+            cached = self._listing_cache
+        if cached is not None and cached[0] == key and now < cached[1]:
+            _, _, html, etag = cached
+        else:
+            html = self._render_directory_listing(notebooks_dir)
+            # ETag from the content itself: the directory mtime does not change
+            # when a notebook is added to an existing day
+            etag = hashlib.blake2b(html.encode('utf-8'), digest_size=16).hexdigest()
+            with self._listing_lock:
+                self._listing_cache = (key, now + _LISTING_CACHE_SECONDS, html, etag)
         
-        # Walk through date partitions
-        for year_dir in sorted(notebooks_dir.iterdir()):
-            if not year_dir.is_dir() or not year_dir.name.isdigit():
-                continue
-            for month_dir in sorted(year_dir.iterdir()):
-                if not month_dir.is_dir() or not month_dir.name.isdigit():
-                    continue
-                for day_dir in sorted(month_dir.iterdir()):
-                    if not day_dir.is_dir() or not day_dir.name.isdigit():
-                        continue
-                    
-                    date_str = f"{year_dir.name}/{month_dir.name}/{day_dir.name}"
-                    html_parts.append(f'<li><strong>{date_str}</strong><ul>')
-                    
-                    # List notebooks for this day
-                    for notebook_file in sorted(day_dir.glob("*.ipynb")):
-                        filename = notebook_file.name
-                        html_filename = notebook_file.stem + ".html"
-                        html_path = day_dir / html_filename
-                        
-                        html_parts.append(
-                            f'<li>'
-                            f'<a href="/notebooks/{year_dir.name}/{month_dir.name}/{day_dir.name}/{filename}">{filename}</a> '
-                            f'(<a href="/notebooks/{year_dir.name}/{month_dir.name}/{day_dir.name}/{html_filename}">HTML</a>)'
-                            f'</li>'
-                        )
-                    
-                    html_parts.append("</ul></li>")
-        
-        html_parts.append("</ul></body></html>")
-        return Response("".join(html_parts), mimetype='text/html')
+        response = Response(html, mimetype='text/html')
+        response.set_etag(etag)
+        response.cache_control.max_age = _LISTING_CACHE_SECONDS
+        # Answers a matching If-None-Match with an empty 304
+        return response.make_conditional(request)
+    
+    def _render_directory_listing(self, notebooks_dir: Path) -> str:
+        """Render the HTML listing of notebooks under the date partitions.
+        
+        Args:
+            notebooks_dir: Directory containing notebook outputs (with YYYY/MM/DD structure)
+            
+        Returns:
+            HTML document as a string
+        """
+        return "".join(_iter_html_parts(notebooks_dir))
     
-    def serve_notebook_file(self, notebooks_dir: Path, year: str, month: str, day: str, filename: str) -> Response:
+    def serve_notebook_file(self, notebooks_dir: str, year: str, month: str, day: str, filename: str) -> Response:
         """Serve a notebook file (.ipynb or .html).
         
         Args:
-            notebooks_dir: Directory containing notebook outputs
+            notebooks_dir: Absolute, resolved directory containing notebook outputs
             year: Year (YYYY)
             month: Month (MM)
             day: Day (DD)
             filename: Filename (with extension)
             
         Returns:
-            Flask Response with file content
+            Flask Response streaming the file, or redirecting it to nginx
         """
-        file_path = notebooks_dir / year / month / day / filename
+        file_path = os.path.normpath(os.path.join(notebooks_dir, year, month, day, filename))
         
-        if not file_path.exists():
+        # Path segments come from the URL: refuse anything escaping the directory
+        if os.path.commonpath((file_path, notebooks_dir)) != notebooks_dir or not os.path.isfile(file_path):
             return Response(
                 f"File not found: {filename}",
                 mimetype='text/plain',
@@ -219,10 +366,16 @@ class NotebooksFileManager:
             else:
                 mimetype = 'application/octet-stream'
             
-            with open(file_path, 'rb') as f:
-                content = f.read()
+            if self.accel_redirect_prefix:
+                # nginx serves the bytes from its internal location
+                return Response(
+                    mimetype=mimetype,
+                    headers={'X-Accel-Redirect': f"{self.accel_redirect_prefix}/{year}/{month}/{day}/{filename}"}
+                )
             
-            return Response(content, mimetype=mimetype)
+            # Streams the file (sendfile via wsgi.file_wrapper where available)
+            # and answers Range / If-Modified-Since / If-None-Match requests
+            return send_file(file_path, mimetype=mimetype, conditional=True, etag=True)
         except Exception as e:
             logger.error(f"Error serving notebook file {file_path}: {e}")
             return Response(
@@ -7,8 +7,8 @@ import logging
 import os
 import signal
 import sys
-import time
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Optional, Set, Tuple
 from threading import Thread
 
 from apscheduler.schedulers.blocking import BlockingScheduler
@@ -18,12 +18,46 @@ from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
 from apscheduler.schedulers.base import BaseScheduler
 from flask import Flask
 
+try:
+    from cron_descriptor import get_description as _get_description, CasingTypeEnum as _CasingTypeEnum
+    _CASING = _CasingTypeEnum.Sentence
+except ImportError:
+    # Optional: without cron-descriptor schedules get a simple description
+    _get_description = None
+
+try:
+    from waitress import serve as _waitress_serve
+except ImportError:
+    # Optional: without waitress the HTTP endpoints use Flask's built-in server
+    _waitress_serve = None
+
 from .config import ConfigLoader
 from .jobs import JobExecutor
 from .database import DatabaseManager
 from .notebooks_file_manager import NotebooksFileManager
 
 
+@lru_cache(maxsize=256)
+def _describe_cron(cron_expr: str) -> str:
+    """Return the human-readable description of a cron expression."""
+    return _get_description(cron_expr, casing_type=_CASING)
+
+
+def _diff_jobs(
+    old_jobs: Dict[str, Dict[str, Any]],
+    new_jobs: Dict[str, Dict[str, Any]]
+) -> Tuple[Set[str], Set[str], Set[str]]:
+    """Compare two job configuration maps keyed by job id.
+    
+    Returns:
+        Tuple of (added, removed, changed) job id sets
+    """
+    old_ids = old_jobs.keys()
+    new_ids = new_jobs.keys()
+    changed = {job_id for job_id in old_ids & new_ids if old_jobs[job_id] != new_jobs[job_id]}
+    return new_ids - old_ids, old_ids - new_ids, changed
+
+
 class SchedulerService:
     """Main Victoria Metrics Jobs service that manages job execution."""
     
@@ -42,6 +76,8 @@ class SchedulerService:
         self.http_app: Optional[Flask] = None
         self.http_thread: Optional[Thread] = None
         self.notebooks_config: Optional[Dict[str, Any]] = None
+        # Scheduled job configurations by job id, for diffing on reload
+        self._job_configs: Dict[str, Dict[str, Any]] = {}
         self.logger = logging.getLogger(__name__)
         self.running = False
         
@@ -68,7 +104,7 @@ class SchedulerService:
             # Initialize database manager if database config is present
             if 'database' in config:
                 try:
-                    self.database_manager = DatabaseManager(config['database'])
+                    self.database_manager = DatabaseManager(config['database'], persistent_lock_connection=True)
                     self.database_manager.connect()
                     
                     # Test database connection and advisory locks
@@ -82,7 +118,7 @@ class SchedulerService:
                     self.logger.error(f"Failed to initialize database manager: {e}")
                     raise
             else:
-                self.logger.warning("No database configuration found - jobs will run without advisory locking")
+                self.logger.warning("No database configuration found - jobs can only run with allow_unlocked_jobs: true")
             
             # Initialize notebooks manager and HTTP server if notebooks config is present
             if 'metrics' in config:
@@ -95,7 +131,8 @@ class SchedulerService:
                         self.notebooks_manager = NotebooksFileManager(
                             notebooks_dir=notebooks_output_dir,
                             archive_dir=metrics_config.get('notebooks_archive_directory'),
-                            enable_archive=metrics_config.get('enable_archive', True)
+                            enable_archive=metrics_config.get('enable_archive', True),
+                            accel_redirect_prefix=metrics_config.get('notebooks_accel_redirect_prefix')
                         )
                         self.logger.info(f"Initialized notebooks manager with directory: {notebooks_output_dir}")
                         
@@ -119,7 +156,8 @@ class SchedulerService:
             # Initialize job executor with database manager and config path
             self.job_executor = JobExecutor(
                 self.database_manager,
-                self.config_path
+                self.config_path,
+                allow_unlocked=bool(config.get('allow_unlocked_jobs', False))
             )
             
             # Configure scheduler
@@ -187,6 +225,11 @@ class SchedulerService:
         
         self.http_app = Flask(__name__)
         
+        # Resolved once; the routes below reuse it on every request
+        notebooks_dir = config.get('notebooks_output_directory')
+        notebooks_path = Path(notebooks_dir).resolve() if notebooks_dir else None
+        notebooks_base = str(notebooks_path) if notebooks_path else None
+        
         @self.http_app.route('/health')
         def health():
             """Health check endpoint."""
@@ -197,31 +240,40 @@ class SchedulerService:
             """List available notebooks organized by date."""
             if not self.notebooks_manager:
                 return {'error': 'Notebooks manager not initialized'}, 503
-            notebooks_dir = config.get('notebooks_output_directory')
-            if not notebooks_dir:
+            if not notebooks_path:
                 return {'error': 'Notebooks output directory not configured'}, 404
-            return self.notebooks_manager.serve_notebook_directory_listing(Path(notebooks_dir))
+            return self.notebooks_manager.serve_notebook_directory_listing(notebooks_path)
         
         @self.http_app.route('/notebooks/<year>/<month>/<day>/<filename>')
         def notebooks_file(year, month, day, filename):
             """Serve a notebook file (.ipynb or .html)."""
             if not self.notebooks_manager:
                 return {'error': 'Notebooks manager not initialized'}, 503
-            notebooks_dir = config.get('notebooks_output_directory')
-            if not notebooks_dir:
+            if not notebooks_base:
                 return {'error': 'Notebooks output directory not configured'}, 404
-            return self.notebooks_manager.serve_notebook_file(Path(notebooks_dir), year, month, day, filename)
+            return self.notebooks_manager.serve_notebook_file(notebooks_base, year, month, day, filename)
         
         def run_server():
-            """Run Flask server (blocks)."""
+            """Run the HTTP server (blocks)."""
             try:
-                self.http_app.run(
-                    host=host,
-                    port=port,
-                    debug=False,
-                    use_reloader=False,
-                    threaded=True
-                )
+                if _waitress_serve is not None:
+                    # Production WSGI server with a worker thread pool; passes
+                    # send_file responses to the socket via wsgi.file_wrapper
+                    _waitress_serve(
+                        self.http_app,
+                        host=host,
+                        port=port,
+                        threads=config.get('http_threads', 8),
+                        _quiet=True
+                    )
+                else:
+                    self.http_app.run(
+                        host=host,
+                        port=port,
+                        debug=False,
+                        use_reloader=False,
+                        threaded=True
+                    )
             except Exception as e:
                 self.logger.error(f"HTTP server error: {e}")
         
@@ -232,13 +284,24 @@ class SchedulerService:
     
     def _add_jobs_from_config(self, config: Dict[str, Any]):
         """Add jobs to the scheduler based on configuration."""
-        jobs = config.get('jobs', {})
-        
-        if not jobs:
+        if not config.get('jobs'):
             self.logger.info("No jobs configured - scheduler will run with no scheduled jobs")
             return
         
-        jobs_added = 0
+        self._job_configs = {}
+        for job_id, job_config in self._enabled_jobs(config).items():
+            try:
+                self._schedule_job(job_config)
+                self._job_configs[job_id] = job_config
+            except Exception as e:
+                self.logger.error(f"Failed to add job {job_id}: {e}")
+        
+        if not self._job_configs:
+            self.logger.info("No enabled jobs found - scheduler will run with no scheduled jobs")
+    
+    def _enabled_jobs(self, config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Return the enabled, valid job configurations keyed by job id."""
+        jobs = config.get('jobs', {})
         
         # Handle both dict and list formats for jobs
         if isinstance(jobs, dict):
@@ -251,41 +314,44 @@ class SchedulerService:
                 jobs_list.append(job_config)
             jobs = jobs_list
         
+        enabled_jobs = {}
         for job_config in jobs:
-            try:
-                job_id = job_config.get('id')
-                script = job_config.get('script')
-                schedule = job_config.get('schedule')
-                enabled = job_config.get('enabled', True)
-                
-                if not enabled:
-                    self.logger.info(f"Skipping disabled job: {job_id}")
-                    continue
-                
-                if not all([job_id, script, schedule]):
-                    self.logger.warning(f"Invalid job configuration: {job_config}")
-                    continue
-                
-                # Add job to scheduler
-                self.scheduler.add_job(
-                    func=self.job_executor.execute_job,
-                    trigger=schedule.get('type', 'cron'),
-                    args=[job_config],
-                    id=job_id,
-                    name=job_config.get('name', job_id),
-                    **schedule.get('args', {})
-                )
-                
-                # Format schedule in human-readable form
-                schedule_str = self._format_schedule(schedule)
-                self.logger.info(f"Added job: {job_id} (script: {script}, schedule: {schedule_str})")
-                jobs_added += 1
-                
-            except Exception as e:
-                self.logger.error(f"Failed to add job {job_config.get('id', 'unknown')}: {e}")
+            job_id = job_config.get('id')
+            
+            if not job_config.get('enabled', True):
+                self.logger.info(f"Skipping disabled job: {job_id}")
+                continue
+            
+            if not all([job_id, job_config.get('script'), job_config.get('schedule')]):
+                self.logger.warning(f"Invalid job configuration: {job_config}")
+                continue
+            
+            if job_id in enabled_jobs:
+                # The scheduler rejects a second job with the same id; keep the first
+                self.logger.error(f"Failed to add job {job_id}: duplicate job id, keeping the first definition")
+                continue
+            
+            enabled_jobs[job_id] = job_config
         
-        if jobs_added == 0:
-            self.logger.info("No enabled jobs found - scheduler will run with no scheduled jobs")
+        return enabled_jobs
+    
+    def _schedule_job(self, job_config: Dict[str, Any]):
+        """Add one job to the scheduler."""
+        job_id = job_config['id']
+        schedule = job_config['schedule']
+        
+        self.scheduler.add_job(
+            func=self.job_executor.execute_job,
+            trigger=schedule.get('type', 'cron'),
+            args=[job_config],
+            id=job_id,
+            name=job_config.get('name', job_id),
+            **schedule.get('args', {})
+        )
+        
+        # Format schedule in human-readable form
+        schedule_str = self._format_schedule(schedule)
+        self.logger.info(f"Added job: {job_id} (script: {job_config['script']}, schedule: {schedule_str})")
     
     def _format_schedule(self, schedule: Dict[str, Any]) -> str:
         """Format schedule configuration in human-readable form.
@@ -300,9 +366,7 @@ class SchedulerService:
         args = schedule.get('args', {})
         
         if schedule_type == 'cron':
-            try:
-                from cron_descriptor import get_description, CasingTypeEnum
-                
+            if _get_description is not None:
                 # Convert APScheduler keyword args to cron expression: minute hour day month day_of_week
                 minute = str(args.get('minute', '*'))
                 hour = str(args.get('hour', '*'))
@@ -317,8 +381,8 @@ class SchedulerService:
                     day_of_week = str(day_of_week)
                 
                 cron_expr = f"{minute} {hour} {day} {month} {day_of_week}"
-                return get_description(cron_expr, casing_type=CasingTypeEnum.Sentence)
-            except ImportError:
+                return _describe_cron(cron_expr)
+            else:
                 # Fallback if cron-descriptor not available
                 hour = args.get('hour', '*')
                 minute = args.get('minute', '*')
@@ -351,8 +415,36 @@ class SchedulerService:
     
     
     def reload_config(self):
-        """Reload configuration and restart scheduler."""
+        """Reload configuration and apply job changes to the running scheduler.
+        
+        Only jobs whose configuration was added, removed or changed are
+        touched; the database connection and HTTP server stay up. Changes to
+        other settings (database, metrics, max_workers) need a restart.
+        """
+        if not self.scheduler or not self.running:
+            self.logger.info("Scheduler not running, starting it with the current configuration...")
+            self.start()
+            return
+        
         self.logger.info("Reloading configuration...")
-        self.stop()
-        time.sleep(1)  # Brief pause before restart
-        self.start()
+        config = self.config_loader.load(self.config_path)
+        new_jobs = self._enabled_jobs(config)
+        added, removed, changed = _diff_jobs(self._job_configs, new_jobs)
+        
+        for job_id in removed | changed:
+            try:
+                self.scheduler.remove_job(job_id)
+            except Exception as e:
+                self.logger.warning(f"Failed to remove job {job_id}: {e}")
+            self._job_configs.pop(job_id, None)
+        
+        for job_id in added | changed:
+            try:
+                self._schedule_job(new_jobs[job_id])
+                self._job_configs[job_id] = new_jobs[job_id]
+            except Exception as e:
+                self.logger.error(f"Failed to add job {job_id}: {e}")
+        
+        self.logger.info(
+            f"Configuration reloaded: {len(added)} added, {len(removed)} removed, {len(changed)} changed"
+        )